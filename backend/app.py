@@ -2,65 +2,173 @@
 from fastapi import FastAPI, Request, Response, HTTPException, Depends, Header, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from azure.core.exceptions import HttpResponseError
 from typing import List, Literal, Dict, Any, Optional, Union
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 import os
+import asyncio
 import hashlib
 from dotenv import load_dotenv
 import base64
 import json
-import requests
 from pydantic import BaseModel, Field
-from langchain_openai import AzureChatOpenAI
-from azure.communication.email import EmailClient
-from projects import search_projects, add_project
-from cosmosdb import CosmosDBManager
-from azure.identity import DefaultAzureCredential
+from projects import (search_projects_page_async, add_project, remove_project, query_embedding_cache,
+                      get_embedding_store, search_result_cache, invalidate_search_cache,
+                      init_async_clients, close_async_clients, close_sync_clients,
+                      SEARCH_BACKEND, get_local_index)
+from cosmosdb import AsyncCosmosDBManager
+from facets import FacetStore
+from jobs import JobManager
+from outbox import EmailOutbox
+from query_log import QueryLog
+from cache import ExtractionCache, resolve_cache_path
+from github_fetcher import GitHubReadmeFetcher
+from readme_preprocess import prepare_readme, merge_extractions
+from concurrent.futures import ThreadPoolExecutor
+from repository import AsyncCosmosRepository, query_metrics, set_current_endpoint, reset_current_endpoint
 import logging
+import threading
+import time
 import uvicorn
 
 load_dotenv()
 
-# Initialize EmailClient
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
 
+# Outbound clients (email, LLM, Search, Azure OpenAI, Cosmos) are built on first use or by
+# the lifespan warm-up, never at import time, so cold starts only pay for what they need.
 acs_conn_str = os.getenv("COMMUNICATION_SERVICES_CONNECTION_STRING")
-email_client = EmailClient.from_connection_string(acs_conn_str)
+_email_client = None
+_primary_llm = None
+_client_lock = threading.Lock()
 
 
-logging.basicConfig(level=logging.WARNING)
-logger = logging.getLogger(__name__)
+def get_email_client():
+    """Shared Azure Communication Services EmailClient, created on first use."""
+    global _email_client
+    if _email_client is None:
+        with _client_lock:
+            if _email_client is None:
+                from azure.communication.email import EmailClient
+                _email_client = EmailClient.from_connection_string(acs_conn_str)
+    return _email_client
 
-logger.info("Logging in via DefaultAzureCredential...")
-logger = logging.getLogger('azure.identity')
+COSMOS_DATABASE_ID = os.environ["COSMOS_DATABASE_ID"]
+COSMOS_CONTAINER_ID = os.environ["COSMOS_CONTAINER_ID"]
 
-try:
-    credential = DefaultAzureCredential(logging_enable=True)
-    logger.info("Successfully authenticated via DefaultAzureCredential")
-except:
-    raise Exception("Failed to authenticate via DefaultAzureCredential")        
+# Async Cosmos client; connected in the lifespan and shared by every request on this worker
+cosmos_db = AsyncCosmosDBManager(
+    cosmos_database_id=COSMOS_DATABASE_ID,
+    cosmos_container_id=COSMOS_CONTAINER_ID
+)
 
+# Named, partition-scoped queries with RU/latency metrics
+repository = AsyncCosmosRepository(cosmos_db)
 
-# Load environment variables from .env file
+# Materialized filter facets, maintained incrementally by the admin endpoints
+facet_store = FacetStore(repository)
 
+# Background pool for README fetch + LLM extraction; JOB_MAX_WORKERS caps concurrent LLM work
+job_manager = JobManager(
+    max_workers=int(os.getenv("JOB_MAX_WORKERS", "4")),
+    result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+)
+JOB_EVENTS_POLL_SECONDS = 0.5
 
+# LLM extraction results keyed on README hash, prompt version and deployment
+extraction_cache = ExtractionCache(
+    maxsize=int(os.getenv("EXTRACTION_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+    db_path=resolve_cache_path(os.getenv("EXTRACTION_CACHE_PATH", "readme_extractions.sqlite"))
+)
 
-COSMOS_DATABASE_ID = os.environ["COSMOS_DATABASE_ID"]
-COSMOS_CONTAINER_ID = os.environ["COSMOS_CONTAINER_ID"]
+# Review-request emails are queued in Cosmos with the pending review and sent in the background
+# (send_email_message is defined further down, so it is looked up at send time)
+email_outbox = EmailOutbox(repository, lambda message: send_email_message(message))
+
+# Sampled capture of search requests for replay and traffic analysis (see query_log.py)
+query_log = QueryLog()
+
+# Pooled async README fetcher (started in the lifespan) and the loop it runs on
+github_fetcher = GitHubReadmeFetcher()
+event_loop: Optional[asyncio.AbstractEventLoop] = None
 
-cosmos_db = None
+# With FAST_START=true the app serves as soon as it is imported and warms up in the
+# background; GET /api/ready reports when warm-up has finished. Otherwise startup waits
+# for warm-up, as before.
+FAST_START = os.getenv("FAST_START", "false").lower() == "true"
+# How long an API request that arrives during a fast start waits for warm-up before a 503
+WARMUP_WAIT_SECONDS = float(os.getenv("WARMUP_WAIT_SECONDS", "30"))
+warmup_state: Dict[str, Any] = {"ready": False, "fastStart": FAST_START, "startedAt": None,
+                                "finishedAt": None, "components": {}, "error": None}
+warmup_task: Optional[asyncio.Task] = None
 
-try:
-    logger.info("Initializing CosmosDB connection...")
-    cosmos_db = CosmosDBManager(
-        cosmos_database_id=COSMOS_DATABASE_ID,
-        cosmos_container_id=COSMOS_CONTAINER_ID
-    )
-    logger.info("CosmosDB connection initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize CosmosDB connection: {str(e)}")
-    raise Exception("Failed to initialize CosmosDB connection")
 
-app = FastAPI(title="Project Search API")
+async def _warm(component: str, step) -> None:
+    """Run one warm-up step (sync or async) and record its outcome and duration."""
+    start = time.perf_counter()
+    try:
+        result = step()
+        if asyncio.iscoroutine(result):
+            await result
+        warmup_state["components"][component] = {"status": "ready"}
+    except Exception as e:
+        warmup_state["components"][component] = {"status": "failed", "error": str(e)}
+        raise
+    finally:
+        warmup_state["components"][component]["ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def warm_up() -> None:
+    """Connect to Cosmos and build the outbound clients before (or, in fast-start mode, while) serving."""
+    warmup_state["startedAt"] = time.time()
+    try:
+        logger.info("Initializing CosmosDB connection...")
+        await _warm("cosmos", cosmos_db.initialize)
+        email_outbox.start()
+        # Shared async clients for the search path, reused by every request on this worker
+        await _warm("search", init_async_clients)
+        if SEARCH_BACKEND == "local":
+            await _warm("local_index", lambda: asyncio.to_thread(get_local_index))
+        # Used from worker threads; built off the event loop since they pull in langchain/ACS
+        await _warm("llm", lambda: asyncio.to_thread(get_primary_llm))
+        await _warm("email", lambda: asyncio.to_thread(get_email_client))
+        warmup_state["ready"] = True
+    except Exception as e:
+        logger.error(f"Warm-up failed: {str(e)}")
+        warmup_state["error"] = str(e)
+        raise
+    finally:
+        warmup_state["finishedAt"] = time.time()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global event_loop, warmup_task
+    event_loop = asyncio.get_running_loop()
+    github_fetcher.start()
+    warmup_task = asyncio.create_task(warm_up())
+    if not FAST_START:
+        try:
+            await warmup_task
+        except Exception as e:
+            raise Exception(f"Failed to initialize the backend: {str(e)}")
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        job_manager.shutdown()
+        await email_outbox.stop()
+        await github_fetcher.aclose()
+        await close_async_clients()
+        close_sync_clients()
+        query_log.close()
+        await cosmos_db.close()
+
+app = FastAPI(title="Project Search API", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -77,16 +185,24 @@ AOAI_ENDPOINT = os.environ["AOAI_ENDPOINT"]
 AOAI_DEPLOYMENT = os.environ["AOAI_DEPLOYMENT"]
 
 
-primary_llm = AzureChatOpenAI(
-    azure_deployment=AOAI_DEPLOYMENT,
-    api_version="2024-08-01-preview",
-    temperature=0,
-    max_tokens=None,
-    timeout=None,
-    max_retries=2,
-    api_key=AOAI_KEY,
-    azure_endpoint=AOAI_ENDPOINT
-)
+def get_primary_llm():
+    """Shared AzureChatOpenAI client; langchain is imported on first use rather than at startup."""
+    global _primary_llm
+    if _primary_llm is None:
+        with _client_lock:
+            if _primary_llm is None:
+                from langchain_openai import AzureChatOpenAI
+                _primary_llm = AzureChatOpenAI(
+                    azure_deployment=AOAI_DEPLOYMENT,
+                    api_version="2024-08-01-preview",
+                    temperature=0,
+                    max_tokens=None,
+                    timeout=None,
+                    max_retries=2,
+                    api_key=AOAI_KEY,
+                    azure_endpoint=AOAI_ENDPOINT
+                )
+    return _primary_llm
 
 class ExtractionResponse(BaseModel):
     """Schema for parsing project details"""
@@ -105,6 +221,14 @@ class ExtractionResponse(BaseModel):
 
 class ProjectSubmission(BaseModel):
     githubUrl: str
+    # Return a job id immediately instead of waiting for the extraction
+    background: Optional[bool] = False
+    # Re-run the LLM extraction even if this README was extracted before
+    forceRefresh: Optional[bool] = False
+
+class BulkProjectSubmission(BaseModel):
+    githubUrls: List[str]
+    forceRefresh: Optional[bool] = False
 
 class ProjectReview(BaseModel):
     projectName: str
@@ -124,6 +248,9 @@ class FilterOptions(BaseModel):
     query: Optional[str] = ""
     filters: Optional[Dict[str, Any]] = {}
     sort: Optional[str] = ""
+    pageSize: Optional[int] = None
+    cursor: Optional[str] = None
+    includeTotalCount: Optional[bool] = False
 
 # ----------------------------
 # Helper Functions
@@ -136,38 +263,20 @@ def generate_document_id(github_url: str) -> str:
 
 
 def fetch_readme(github_url: str) -> str:
-    """Fetch the README.md content from a public GitHub repository."""
-    try:
-        # Extract owner and repo name from the GitHub URL
-        parts = github_url.rstrip('/').split('/')
-        owner, repo = parts[-2], parts[-1]
-
-        # Construct the raw README URL
-        raw_url = f'https://raw.githubusercontent.com/{owner}/{repo}/main/README.md'
-
-        # Try fetching the README from the 'main' branch
-        response = requests.get(raw_url)
-        if response.status_code != 200:
-            # If not found, try the 'master' branch
-            raw_url = f'https://raw.githubusercontent.com/{owner}/{repo}/master/README.md'
-            response = requests.get(raw_url)
-
-        if response.status_code == 200:
-            readme_content = response.text
-            return readme_content
-        else:
-            print("README.md not found in the repository.")
-            return ""
+    """
+    Fetch the README content from a public GitHub repository.
 
-    except Exception as e:
-        print(f"Error fetching README.md: {e}")
-        return ""
+    Called from job threads; the request itself runs on the app's event loop so that it
+    shares the fetcher's pooled client and cache.
+    """
+    future = asyncio.run_coroutine_threadsafe(github_fetcher.fetch_readme(github_url), event_loop)
+    return future.result()
 
-def process_readme(readme_content: str) -> ExtractionResponse:
-    """Process the README content using LLM to extract project information."""
-    try:
-        # Prepare messages for the LLM
-        review_prompt = """Your job is to review a codebase and provide a report on it.
+# Part of the extraction cache key; bump when the review prompt, ExtractionResponse or the
+# README preprocessing changes
+EXTRACTION_PROMPT_VERSION = "2"
+
+REVIEW_PROMPT = """Your job is to review a codebase and provide a report on it.
 
 - Project Name
 - Project Description
@@ -182,22 +291,63 @@ def process_readme(readme_content: str) -> ExtractionResponse:
 - Industries: e.g. professional services, media & entertainment, construction, etc. (can be more than one. If not sure, leave blank. If you think it could apply to all or most industries, output 'all')
 """
 
-        messages = [
-            {"role": "system", "content": review_prompt},
-            {"role": "user", "content": readme_content}
-        ]
+# Single-value fields decided by majority across README chunks
+EXTRACTION_VOTE_FIELDS = ('project_type', 'code_complexity')
+
+# Shared across submissions, so it caps concurrent chunk extractions for the whole worker
+chunk_executor = ThreadPoolExecutor(max_workers=int(os.getenv("README_CHUNK_CONCURRENCY", "4")),
+                                    thread_name_prefix="readme-chunk")
+
+
+def extract_readme_chunk(readme_content: str, part: int = 1, parts: int = 1) -> ExtractionResponse:
+    """Run the structured-output extraction on one (part of a) README."""
+    system_prompt = REVIEW_PROMPT
+    if parts > 1:
+        system_prompt += (f"\nYou are given part {part} of {parts} of the README. Report only what this part "
+                          "supports; leave lists empty when it says nothing about them.\n")
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": readme_content}
+    ]
 
-        report_llm = primary_llm.with_structured_output(ExtractionResponse)
+    report_llm = get_primary_llm().with_structured_output(ExtractionResponse)
 
-        report = report_llm.invoke(messages)
+    return report_llm.invoke(messages)
 
-        return report
+
+def process_readme(readme_content: str) -> ExtractionResponse:
+    """
+    Process the README content using LLM to extract project information.
+
+    The README is cleaned and, when it exceeds README_TOKEN_BUDGET, split into chunks that
+    are extracted in parallel and merged (see readme_preprocess.py).
+    """
+    try:
+        chunks = prepare_readme(readme_content)
+        if len(chunks) == 1:
+            return extract_readme_chunk(chunks[0])
+
+        print(f"Extracting README in {len(chunks)} chunks")
+        partials = list(chunk_executor.map(extract_readme_chunk, chunks, range(1, len(chunks) + 1),
+                                           [len(chunks)] * len(chunks)))
+        merged = merge_extractions([partial.model_dump() for partial in partials],
+                                   vote_fields=EXTRACTION_VOTE_FIELDS)
+        return ExtractionResponse(**merged)
 
     except Exception as e:
         print(f"Error processing README.md: {e}")
         return None
 
 
+def get_request_identity(x_ms_client_principal: Optional[str]) -> str:
+    """User identity from the x-ms-client-principal header, or 'anonymous'."""
+    if x_ms_client_principal:
+        decoded = base64.b64decode(x_ms_client_principal).decode('utf-8')
+        client_principal = json.loads(decoded)
+        return get_user_identity(client_principal)
+    return 'anonymous'
+
+
 def get_user_identity(client_principal):
     claims = client_principal.get('claims', [])
     # Try to find the email claim
@@ -212,26 +362,25 @@ def get_user_identity(client_principal):
     return 'anonymous'
 
 
-def send_email(data: dict) -> bool:
-    """Constructs and sends an email containing the project information via Azure Communication Services."""
-    try:
-        # Extract data from the payload
-        project_name = data.get('projectName', 'N/A')
-        project_description = data.get('projectDescription', 'No description provided')
-        github_url = data.get('githubUrl', 'N/A')
-        owner = data.get('owner', 'anonymous')
-        programming_languages = ', '.join(data.get('programmingLanguages', []))
-        frameworks = ', '.join(data.get('frameworks', []))
-        azure_services = ', '.join(data.get('azureServices', []))
-        design_patterns = ', '.join(data.get('designPatterns', []))
-        project_type = data.get('projectType', 'N/A')
-        code_complexity = data.get('codeComplexity', 'N/A')
-        business_value = data.get('businessValue', 'N/A')
-        target_audience = data.get('targetAudience', 'N/A')
-
-        # Draft email content
-        email_subject = f"Review Request for Project: {project_name}"
-        email_plain_text = f"""
+def build_review_email(data: dict) -> Dict[str, Any]:
+    """Constructs the review request email containing the project information."""
+    # Extract data from the payload
+    project_name = data.get('projectName', 'N/A')
+    project_description = data.get('projectDescription', 'No description provided')
+    github_url = data.get('githubUrl', 'N/A')
+    owner = data.get('owner', 'anonymous')
+    programming_languages = ', '.join(data.get('programmingLanguages', []))
+    frameworks = ', '.join(data.get('frameworks', []))
+    azure_services = ', '.join(data.get('azureServices', []))
+    design_patterns = ', '.join(data.get('designPatterns', []))
+    project_type = data.get('projectType', 'N/A')
+    code_complexity = data.get('codeComplexity', 'N/A')
+    business_value = data.get('businessValue', 'N/A')
+    target_audience = data.get('targetAudience', 'N/A')
+
+    # Draft email content
+    email_subject = f"Review Request for Project: {project_name}"
+    email_plain_text = f"""
 Hello,
 
 A new project has been submitted for review. Please find the details below:
@@ -252,8 +401,8 @@ A new project has been submitted for review. Please find the details below:
 Thank you,
 Automated System
 """
-    
-        email_html = f"""
+
+    email_html = f"""
 <html>
     <head>
         <style>
@@ -325,47 +474,70 @@ Automated System
 </html>
 """
 
-        # Fetch recipient email from environment variable
-        recipient_email = os.getenv("REVIEWER_EMAIL_GROUP", "dangiannone@microsoft.com")
-
-        # Create EmailMessage
-        message = {
-            "senderAddress": "DoNotReply@5fec6054-f6e1-4926-9c37-029ca719c8ae.azurecomm.net",
-            "recipients": {
-                "to": [{"address": recipient_email}]
-            },
-            "content": {
-                "subject": email_subject,
-                "plainText": email_plain_text.strip(),
-                "html": email_html.strip()
-            }
+    # Fetch recipient email from environment variable
+    recipient_email = os.getenv("REVIEWER_EMAIL_GROUP", "dangiannone@microsoft.com")
+
+    # Create EmailMessage
+    message = {
+        "senderAddress": "DoNotReply@5fec6054-f6e1-4926-9c37-029ca719c8ae.azurecomm.net",
+        "recipients": {
+            "to": [{"address": recipient_email}]
+        },
+        "content": {
+            "subject": email_subject,
+            "plainText": email_plain_text.strip(),
+            "html": email_html.strip()
         }
+    }
 
-        # Send email
-        poller = email_client.begin_send(message)
-        result = poller.result()
-        print(f"Email sent: {result}")
-        return True
+    return message
+
+
+def send_email_message(message: Dict[str, Any]) -> None:
+    """Sends an email via Azure Communication Services, waiting for the send to complete. Raises on failure."""
+    poller = get_email_client().begin_send(message)
+    result = poller.result()
+    print(f"Email sent: {result}")
 
-    except Exception as e:
-        print(f"Error sending email: {str(e)}")
-        return False
 
 
 # ----------------------------
 # API Routes
 # ----------------------------
 
+@app.middleware("http")
+async def attribute_cosmos_metrics(request: Request, call_next):
+    # Attribute Cosmos request charges made while handling this request to its endpoint
+    token = set_current_endpoint(f"{request.method} {request.url.path}")
+    try:
+        return await call_next(request)
+    finally:
+        reset_current_endpoint(token)
+
+@app.middleware("http")
+async def wait_for_warmup(request: Request, call_next):
+    # During a fast start, API calls that arrive before warm-up has finished wait for it
+    path = request.url.path
+    if warmup_task is not None and not warmup_state["ready"] and path.startswith("/api/") and path != "/api/ready":
+        try:
+            await asyncio.wait_for(asyncio.shield(warmup_task), timeout=WARMUP_WAIT_SECONDS)
+        except Exception:
+            return JSONResponse(status_code=503, content={"detail": "Service is warming up"},
+                                headers={"Retry-After": "5"})
+    return await call_next(request)
+
+@app.get("/api/ready")
+async def ready():
+    """Readiness probe: 200 once warm-up has finished, 503 (with per-component progress) until then."""
+    return JSONResponse(status_code=200 if warmup_state["ready"] else 503, content=warmup_state)
+
 # Mount static files for frontend
 app.mount("/static", StaticFiles(directory="dist/assets"), name="static")
 
 @app.get("/api/admin/get_pending_reviews")
 async def get_pending_reviews():
     try:
-        query = "SELECT * FROM c WHERE c.review_status = 'pending' AND c.partitionKey = 'project'"
-        parameters = []
-        pending_reviews = cosmos_db.query_items(query, parameters)
-        return pending_reviews
+        return await repository.get_pending_reviews()
     except Exception as e:
         print(f"Error fetching pending reviews: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -374,64 +546,9 @@ async def get_pending_reviews():
 async def get_filter_options():
     try:
         logger.info("fetching_filter_options")
-        
-        # Get approved tags and service mapping
-        approved_tags_query = "SELECT * FROM c WHERE c.id = 'approved_tags' AND c.partitionKey = 'metadata'"
-        approved_tags_results = list(cosmos_db.query_items(approved_tags_query))
-        approved_tags = approved_tags_results[0] if approved_tags_results else {}
-        
-        # Query approved projects
-        projects_query = "SELECT * FROM c WHERE c.review_status = 'approved'"
-        projects = cosmos_db.query_items(projects_query)
-
-        # Initialize sets for collecting distinct values
-        prog_langs = set()
-        frameworks = set()
-        azure_services = set()
-        design_patterns = set()
-        industries = set()
-        project_types = set()
-        code_complexities = set()
-        customers = set()  # New set for customers
-
-        # Collect distinct values from projects and cross-check with approved tags
-        for p in projects:
-            for pl in p.get('programmingLanguages', []):
-                if pl in approved_tags.get('programming_languages', []):
-                    prog_langs.add(pl)
-            for fw in p.get('frameworks', []):
-                if fw in approved_tags.get('frameworks', []):
-                    frameworks.add(fw)
-            for az in p.get('azureServices', []):
-                if az in approved_tags.get('azure_services', []):
-                    azure_services.add(az)
-            for dp in p.get('designPatterns', []):
-                if dp in approved_tags.get('design_patterns', []):
-                    design_patterns.add(dp)
-            for ind in p.get('industries', []):
-                if ind in approved_tags.get('industries', []):
-                    industries.add(ind)
-            if 'projectType' in p and p['projectType']:
-                project_types.add(p['projectType'])
-            if 'codeComplexity' in p and p['codeComplexity']:
-                code_complexities.add(p['codeComplexity'])
-            # Add customers without approval check
-            for customer in p.get('customers', []):
-                customers.add(customer)
-
-        data = {
-            "programmingLanguages": sorted(prog_langs),
-            "frameworks": sorted(frameworks),
-            "azureServices": sorted(azure_services),
-            "azureServiceCategories": approved_tags.get('azure_service_mapping', {}),
-            "designPatterns": sorted(design_patterns),
-            "industries": sorted(industries),
-            "projectTypes": sorted(project_types),
-            "codeComplexities": ["Beginner", "Intermediate", "Advanced"],
-            "customers": sorted(customers)  # Add customers to response
-        }
 
-        return data
+        # Single point read of the facet document (built on first use if it does not exist yet)
+        return await facet_store.get_filter_options()
 
     except Exception as e:
         print(f"Error in get_filter_options: {e}")
@@ -445,14 +562,20 @@ async def get_filter_options():
 @app.post("/api/admin/approve_project")
 async def approve_project(project: Dict[str, Any]):
     try:
+        previous = await repository.get_project(project['id'])
         project['review_status'] = 'approved'
         project['partitionKey'] = 'project'
+        # First approval time, used by the "recent" sort; kept when an approved project is re-approved
+        project['approved_at'] = (project.get('approved_at') or (previous or {}).get('approved_at')
+                                  or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'))
         
         # Update the item in Cosmos
-        cosmos_db.upsert_item(project)
+        await repository.upsert_project(project)
+        await facet_store.apply_project_change(previous, project)
 
-        # Add the project to the search index
-        result = add_project(project)
+        # Add the project to the search index (blocking embedding and upload calls, so off the event loop)
+        result = await asyncio.to_thread(add_project, project)
+        invalidate_search_cache()
         if result.get("success"):
             return {"message": "Project approved and added to index.", "project": result["project"]}
         else:
@@ -465,12 +588,32 @@ async def approve_project(project: Dict[str, Any]):
 async def reject_project(project: Dict[str, Any]):
     try:
         # Remove from Cosmos DB
-        cosmos_db.delete_item(item_id=project['id'], partition_key='project')
+        previous = await repository.get_project(project['id'])
+        await repository.delete_project(project['id'])
+        await facet_store.apply_project_change(previous, None)
+
+        # Remove the search document too, in case the project had been approved before
+        github_url = (previous or project).get('githubUrl')
+        await asyncio.to_thread(remove_project, generate_document_id(github_url) if github_url else project['id'])
+        invalidate_search_cache()
         return {"message": "Project rejected and removed from pending reviews."}
     except Exception as e:
         print(f"Error in reject_project: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/admin/rebuild_facets")
+async def rebuild_facets():
+    try:
+        facets = await facet_store.rebuild()
+        if not facets:
+            raise HTTPException(status_code=500, detail="Failed to rebuild filter facets.")
+        return {"message": "Filter facets rebuilt.", "projectCount": facets.get("project_count", 0)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in rebuild_facets: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/api/check_admin")
 async def check_admin(x_ms_client_principal: Optional[str] = Header(None)):
     try:
@@ -490,15 +633,46 @@ async def check_admin(x_ms_client_principal: Optional[str] = Header(None)):
         print(f"Error checking admin status: {str(e)}")
         return {"isAdmin": False, "error": str(e)}
 
+@app.get("/api/admin/cache_stats")
+async def cache_stats():
+    return {
+        "query_embeddings": query_embedding_cache.stats(),
+        "document_embeddings": get_embedding_store().stats() if get_embedding_store() else None,
+        "search_results": search_result_cache.stats(),
+        "readme_extractions": extraction_cache.stats(),
+        "query_log": query_log.stats()
+    }
+
+@app.get("/api/admin/query_metrics")
+async def get_query_metrics(reset: bool = False):
+    """Cosmos request charge (RU) and latency per named operation and per endpoint."""
+    metrics = query_metrics.snapshot()
+    if reset:
+        query_metrics.reset()
+    return metrics
+
+@app.get("/api/admin/outbox")
+async def get_outbox_status():
+    """Review-request email outbox: queue counts, failed emails and dispatcher counters."""
+    try:
+        return await email_outbox.stats()
+    except Exception as e:
+        print(f"Error fetching outbox status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/admin/outbox/{email_id}/retry")
+async def retry_outbox_email(email_id: str):
+    record = await email_outbox.retry(email_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Failed email not found")
+    return {"message": "Email requeued.", "emailId": email_id}
+
 @app.get("/api/admin/get_approved_tags")
 async def get_approved_tags():
     try:
-        query = "SELECT * FROM c WHERE c.id = 'approved_tags' AND c.partitionKey = 'metadata'"
-        results = cosmos_db.query_items(query)
-        tags = list(results)
-        
-        if tags:
-            tag_data = tags[0]
+        tag_data = await repository.get_approved_tags()
+
+        if tag_data:
             return {
                 "id": "approved_tags",
                 "partitionKey": "metadata",
@@ -550,7 +724,9 @@ async def update_approved_tags(tags: Dict[str, Any]):
         print(json.dumps(updated_tags, indent=2))
 
         # Upsert into Cosmos DB
-        cosmos_db.upsert_item(updated_tags)
+        await repository.upsert_approved_tags(updated_tags)
+        await facet_store.set_approved_tags(updated_tags)
+        invalidate_search_cache()
         return {"message": "Approved tags updated successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -558,120 +734,333 @@ async def update_approved_tags(tags: Dict[str, Any]):
 
 @app.post("/api/search_projects")
 async def search(filter_options: FilterOptions):
-    try:
-        query = filter_options.query or ""
-        filters = filter_options.filters or {}
-        sort = filter_options.sort or ""
+    start = time.perf_counter()
+    timings: Dict[str, Any] = {}
+    query = filter_options.query or ""
+    filters = filter_options.filters or {}
+    sort = filter_options.sort or ""
+
+    def log_query(results: List[Dict[str, Any]], total_count: Optional[int] = None, status: str = "ok") -> None:
+        stage_ms = {stage: value for stage, value in timings.items() if stage.endswith("_ms")}
+        stage_ms["total_ms"] = (time.perf_counter() - start) * 1000
+        query_log.record(query, filters, sort, filter_options.pageSize, filter_options.cursor,
+                         [result["id"] for result in results], stage_ms,
+                         cache=timings.get("cache"), total_count=total_count, status=status)
 
+    try:
         logger.info(f"Search started - Query: {query}, Filters: {filters}, Sort: {sort}")
 
         print(f"Received search query: {query}")
         print(f"Filters: {filters}")
         print(f"Sort: {sort}")
 
-        results = search_projects(query, filters, sort)
+        page = await search_projects_page_async(
+            query, filters, sort,
+            page_size=filter_options.pageSize,
+            cursor=filter_options.cursor,
+            include_total_count=bool(filter_options.includeTotalCount),
+            timings=timings
+        )
+        results = page["results"]
         print(f"Found {len(results)} results")
         logger.info(f"Search completed - Found {len(results)} results for query: {query}")
+        log_query(results, page["totalCount"])
 
         return {
             "results": results,
+            "nextCursor": page["nextCursor"],
+            "totalCount": page["totalCount"],
             "message": f"Found {len(results)} matching projects"
         }
 
+    except ValueError as e:
+        # Unsupported sort mode, or a malformed or mismatched pagination cursor
+        log_query([], status="invalid")
+        raise HTTPException(status_code=400, detail=str(e))
+    except HttpResponseError as e:
+        # The search service rejected the query, e.g. because the index predates a field the
+        # query uses (run create-index.py); fail loudly instead of returning no results
+        logger.error(f"Search rejected by the search service - Error: {str(e)}")
+        log_query([], status="error")
+        raise HTTPException(status_code=500, detail=f"The search service rejected the query: {e.message}")
     except Exception as e:
         logger.error(f"Search failed - Error: {str(e)}")
+        log_query([], status="error")
         return {
             "results": [],
             "error": "An error occurred while searching projects"
         }
 
 
+def extract_project(github_url: str, user_identity: str, force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Fetch a repository's README and extract the project details from it. Runs as a job.
+
+    An unchanged README is served from the extraction cache without an LLM call unless
+    force_refresh is set.
+    """
+    readme_content = fetch_readme(github_url)
+
+    if not readme_content:
+        raise HTTPException(status_code=404, detail="Failed to fetch README.md from the repository")
+
+    cache_key = extraction_cache.key(readme_content, EXTRACTION_PROMPT_VERSION, AOAI_DEPLOYMENT)
+    cached = None if force_refresh else extraction_cache.get(cache_key)
+    if cached is not None:
+        print(f"Using cached extraction for {github_url}")
+        return {**cached, 'owner': user_identity}
+
+    report = process_readme(readme_content)
+
+    if report:
+        print(report.model_dump_json(indent=2))
+        report_dict = report.model_dump()
+        extraction_cache.set(cache_key, report_dict)
+        return {**report_dict, 'owner': user_identity}
+    else:
+        raise HTTPException(status_code=500, detail="Failed to extract project information")
+
+
 @app.post("/api/submit_repo")
 async def submit_repo(submission: ProjectSubmission, x_ms_client_principal: Optional[str] = Header(None)):
+    """
+    Extract project details from a GitHub repository's README.
+
+    The work always runs on the job pool, so it never blocks the event loop and counts
+    against the JOB_MAX_WORKERS cap. With background=true the response is a job id
+    (HTTP 202) to poll at /api/jobs/{jobId}; otherwise the request waits for the result.
+    """
     try:
         github_url = submission.githubUrl
 
         if not github_url.strip():
             raise HTTPException(status_code=400, detail="GitHub URL is required")
 
-        readme_content = fetch_readme(github_url)
-
-        if not readme_content:
-            raise HTTPException(status_code=404, detail="Failed to fetch README.md from the repository")
-
-        report = process_readme(readme_content)
-        print(report.model_dump_json(indent=2))
+        user_identity = get_request_identity(x_ms_client_principal)
 
-        if report:
-            # Capture user identity
-            if x_ms_client_principal:
-                decoded = base64.b64decode(x_ms_client_principal).decode('utf-8')
-                client_principal = json.loads(decoded)
-                user_identity = get_user_identity(client_principal)
-            else:
-                user_identity = 'anonymous'
+        job = job_manager.submit("submit_repo", extract_project, github_url, user_identity,
+                                 bool(submission.forceRefresh))
+        if submission.background:
+            return JSONResponse(status_code=202, content={
+                "jobId": job.id,
+                "status": job.status,
+                "statusUrl": f"/api/jobs/{job.id}"
+            })
 
-            report_dict = report.model_dump()
-            report_dict['owner'] = user_identity
-
-            return report_dict
-        else:
-            raise HTTPException(status_code=500, detail="Failed to extract project information")
+        return await asyncio.wrap_future(job.future)
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"/submit_repo endpoint error: {str(e)}")
         raise HTTPException(status_code=500, detail="An error occurred while processing the repository")
 
 
+BULK_SUBMIT_CONCURRENCY = int(os.getenv("BULK_SUBMIT_CONCURRENCY", "4"))
+BULK_SUBMIT_MAX_URLS = int(os.getenv("BULK_SUBMIT_MAX_URLS", "100"))
+
+
+@app.post("/api/submit_repos")
+async def submit_repos(submission: BulkProjectSubmission, format: Literal['ndjson', 'sse'] = 'ndjson',
+                       x_ms_client_principal: Optional[str] = Header(None)):
+    """
+    Extract project details for many GitHub repositories in one request.
+
+    URLs are de-duplicated by document id, then fetched and extracted on the job pool with
+    at most BULK_SUBMIT_CONCURRENCY in flight for this request. One result per URL is
+    streamed as soon as it finishes (NDJSON lines, or SSE 'result' events with format=sse),
+    followed by a final summary ('done').
+    """
+    urls = [url.strip() for url in submission.githubUrls if url and url.strip()]
+    if not urls:
+        raise HTTPException(status_code=400, detail="At least one GitHub URL is required")
+    if len(urls) > BULK_SUBMIT_MAX_URLS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_SUBMIT_MAX_URLS} GitHub URLs per request")
+
+    user_identity = get_request_identity(x_ms_client_principal)
+    force_refresh = bool(submission.forceRefresh)
+
+    unique: Dict[str, str] = {}
+    duplicates = []
+    for url in urls:
+        document_id = generate_document_id(url)
+        if document_id in unique:
+            duplicates.append({"githubUrl": url, "id": document_id, "status": "duplicate",
+                               "duplicateOf": unique[document_id]})
+        else:
+            unique[document_id] = url
+
+    semaphore = asyncio.Semaphore(max(1, BULK_SUBMIT_CONCURRENCY))
+
+    async def submit_one(document_id: str, url: str) -> Dict[str, Any]:
+        async with semaphore:
+            job = job_manager.submit("submit_repo", extract_project, url, user_identity, force_refresh)
+            try:
+                result = await asyncio.wrap_future(job.future)
+                return {"githubUrl": url, "id": document_id, "status": "succeeded", "result": result}
+            except Exception as e:
+                return {"githubUrl": url, "id": document_id, "status": "failed", "error": job.error or str(e)}
+
+    def encode(event: str, payload: Dict[str, Any]) -> str:
+        if format == "sse":
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps(payload) + "\n"
+
+    async def results():
+        tasks = [asyncio.ensure_future(submit_one(document_id, url)) for document_id, url in unique.items()]
+        counts = {"succeeded": 0, "failed": 0, "duplicate": len(duplicates)}
+        try:
+            for duplicate in duplicates:
+                yield encode("result", duplicate)
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                counts[item["status"]] += 1
+                yield encode("result", item)
+            yield encode("done", {"done": True, "total": len(urls), **counts})
+        finally:
+            # Stop queued work if the client goes away
+            for task in tasks:
+                task.cancel()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(results(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events: one 'status' event per status change, ending when the job finishes."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_status = None
+        while True:
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.to_dict())}\n\n"
+            if job.finished:
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
 @app.post("/api/send_for_review")
 async def send_for_review(data: ProjectReview):
     data_dict = data.model_dump()
-    success = send_email(data_dict)
-    if success:
-        try:
-            data_dict['id'] = generate_document_id(data_dict.get('githubUrl', ''))
-            data_dict['partitionKey'] = 'project'
-            data_dict['review_status'] = 'pending'
-            # Upsert into Cosmos DB
-            cosmos_db.upsert_item(data_dict)
-            return {"message": "Review request sent successfully."}
-        except Exception as e:
-            print(f"Error adding pending review: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-    else:
-        raise HTTPException(status_code=500, detail="Failed to send review request.")
+    try:
+        message = build_review_email(data_dict)
+        data_dict['id'] = generate_document_id(data_dict.get('githubUrl', ''))
+        data_dict['partitionKey'] = 'project'
+        data_dict['review_status'] = 'pending'
+        # Pending review and its email are written together; the email is sent in the background
+        record = await email_outbox.save_with_email(data_dict, message)
+        return {"message": "Review request sent successfully.", "emailId": record["id"]}
+    except Exception as e:
+        print(f"Error adding pending review: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+LIST_PROJECTS_PAGE_SIZE = int(os.getenv("LIST_PROJECTS_PAGE_SIZE", "200"))
+
+
+def format_project_card(p: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a projected project to match the format expected by the frontend."""
+    return {
+        "id": p.get("id", ""),
+        "projectName": p.get("projectName", ""),
+        "projectDescription": p.get("projectDescription", ""),
+        "githubUrl": p.get("githubUrl", ""),
+        "owner": p.get("owner", "anonymous"),
+        "programmingLanguages": p.get("programmingLanguages", []),
+        "frameworks": p.get("frameworks", []),
+        "azureServices": p.get("azureServices", []),
+        "designPatterns": p.get("designPatterns", []),
+        "projectType": p.get("projectType", ""),
+        "codeComplexity": p.get("codeComplexity", ""),
+        "industries": p.get("industries", []),
+        "customers": p.get("customers", []),
+        "businessValue": p.get("businessValue", ""),
+        "targetAudience": p.get("targetAudience", "")
+    }
+
+
+async def stream_project_cards(pages, first_page: Optional[List[Dict[str, Any]]], output_format: str):
+    """
+    Stream every approved project card, one Cosmos page at a time.
+
+    'ndjson' writes one project per line; 'json' writes the same {"results": [...]} body
+    as the non-streamed endpoint, built incrementally. The first page is fetched by the
+    caller, before the response starts, so that failure can still become a 5xx.
+    """
+    count = 0
+    if output_format == "json":
+        yield '{"results": ['
+    page = first_page
+    try:
+        while page is not None:
+            for p in page:
+                card = json.dumps(format_project_card(p))
+                if output_format == "ndjson":
+                    yield card + "\n"
+                else:
+                    yield ("," if count else "") + card
+                count += 1
+            page = await anext(pages, None)
+    except Exception as e:
+        # Headers are already sent; end the body with an error marker so the client can
+        # tell a truncated list from a complete one
+        logger.error(f"Error streaming projects after {count} projects: {str(e)}")
+        error = json.dumps({"error": "An error occurred while listing projects"})
+        yield error + "\n" if output_format == "ndjson" else "], " + error[1:]
+        return
+    if output_format == "json":
+        yield "]}"
+    logger.info(f"List projects streamed {count} projects")
+
 
 @app.get("/api/list_projects")
-async def list_projects():
+async def list_projects(pageSize: Optional[int] = None, continuationToken: Optional[str] = None,
+                        format: Literal['json', 'ndjson'] = 'json'):
+    """
+    List approved projects.
+
+    With pageSize (or a continuationToken) a single page is returned together with the
+    continuationToken for the next page. Otherwise the whole catalog is streamed, as JSON
+    by default or as NDJSON with format=ndjson.
+    """
     try:
-        # Query all approved projects from Cosmos DB
-        query = "SELECT * FROM c WHERE c.review_status = 'approved' AND c.partitionKey = 'project'"
-        projects = cosmos_db.query_items(query)
-        
-        # Format the results to match the format expected by the frontend
-        formatted_projects = []
-        for p in projects:
-            project = {
-                "id": p.get("id", ""),
-                "projectName": p.get("projectName", ""),
-                "projectDescription": p.get("projectDescription", ""),
-                "githubUrl": p.get("githubUrl", ""),
-                "owner": p.get("owner", "anonymous"),
-                "programmingLanguages": p.get("programmingLanguages", []),
-                "frameworks": p.get("frameworks", []),
-                "azureServices": p.get("azureServices", []),
-                "designPatterns": p.get("designPatterns", []),
-                "projectType": p.get("projectType", ""),
-                "codeComplexity": p.get("codeComplexity", ""),
-                "industries": p.get("industries", []),
-                "customers": p.get("customers", []),
-                "businessValue": p.get("businessValue", ""),
-                "targetAudience": p.get("targetAudience", "")
-            }
-            formatted_projects.append(project)
-        
-        logger.info(f"List projects returned {len(formatted_projects)} projects")
-        return {"results": formatted_projects}
+        if pageSize or continuationToken:
+            items, next_token = await repository.query_page(
+                'approved_project_cards',
+                max_item_count=max(1, min(pageSize or LIST_PROJECTS_PAGE_SIZE, 1000)),
+                continuation_token=continuationToken,
+                review_status='approved'
+            )
+            formatted_projects = [format_project_card(p) for p in items]
+            logger.info(f"List projects returned {len(formatted_projects)} projects")
+            return {"results": formatted_projects, "continuationToken": next_token}
+
+        pages = repository.iter_pages('approved_project_cards', max_item_count=LIST_PROJECTS_PAGE_SIZE,
+                                      review_status='approved')
+        try:
+            first_page = await anext(pages, None)
+        except Exception as e:
+            logger.error(f"Error listing projects: {str(e)}")
+            raise HTTPException(status_code=500, detail="An error occurred while listing projects")
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+        return StreamingResponse(stream_project_cards(pages, first_page, format), media_type=media_type)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing projects: {str(e)}")
         return {"results": [], "error": "An error occurred while listing projects"}
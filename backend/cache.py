@@ -0,0 +1,263 @@
+"""
+### cache.py ###
+
+In-process caches used on the search hot path.
+
+TTLCache is a small thread-safe LRU with per-entry expiry and hit/miss counters.
+EmbeddingCache layers it in front of the embedding deployment, keyed on the
+normalized text and model name, with an optional EmbeddingStore (SQLite) tier so
+popular query embeddings survive restarts. SearchResultCache memoizes whole search responses
+and is invalidated by bumping a catalog generation counter. ExtractionCache keeps LLM
+README extractions, keyed on the README content hash, prompt version and deployment.
+resolve_cache_path places every cache file setting under one CACHE_DIR.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from embedding_store import EmbeddingStore
+
+# Directory that relative cache file settings (EMBEDDING_STORE_PATH, EMBEDDING_CACHE_PATH,
+# EXTRACTION_CACHE_PATH, QUERY_LOG_PATH) are resolved against. Defaults to backend/.cache,
+# which is /app/.cache in the container, whatever the working directory.
+CACHE_DIR = os.getenv("CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def resolve_cache_path(path: Optional[str]) -> Optional[str]:
+    """Absolute path for a cache file setting; relative paths go under CACHE_DIR, empty means disabled (None)."""
+    if not path:
+        return None
+    return os.path.join(CACHE_DIR, path)
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after ttl_seconds (None disables expiry)."""
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Collapse whitespace and case so trivially different queries share a cache entry."""
+    return " ".join((text or "").split()).lower()
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for embedding vectors.
+
+    The memory tier is a TTLCache keyed on (model, normalized text). When db_path is set,
+    vectors are also written to an EmbeddingStore and read back on a memory miss, so a
+    restarted worker does not have to re-embed its popular queries.
+    """
+
+    def __init__(self, maxsize: int = 2048, ttl_seconds: Optional[float] = 24 * 3600,
+                 db_path: Optional[str] = None):
+        self.memory = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.disk_hits = 0
+        self.store: Optional[EmbeddingStore] = EmbeddingStore(db_path) if db_path else None
+
+    @staticmethod
+    def _key(text: str, model: str) -> tuple:
+        return (model, normalize_text(text))
+
+    def get(self, text: str, model: str) -> Optional[List[float]]:
+        key = self._key(text, model)
+        vector = self.memory.get(key)
+        if vector is not None or self.store is None:
+            return vector
+        vector = self.store.get(model, key[1], max_age_seconds=self.ttl_seconds)
+        if vector is not None:
+            self.disk_hits += 1
+            self.memory.set(key, vector)
+        return vector
+
+    def set(self, text: str, model: str, vector: List[float]) -> None:
+        key = self._key(text, model)
+        self.memory.set(key, vector)
+        if self.store is not None:
+            self.store.put(model, key[1], vector)
+
+    def get_or_compute(self, text: str, model: str, compute: Callable[[str, str], List[float]]) -> List[float]:
+        vector = self.get(text, model)
+        if vector is None:
+            vector = compute(text, model)
+            self.set(text, model, vector)
+        return vector
+
+    def clear(self) -> None:
+        """Drop the memory tier only; the SQLite file may be shared, so it is never wiped here."""
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["db_path"] = self.db_path
+        return stats
+
+
+class SearchResultCache:
+    """
+    Cache of formatted search results keyed on (catalog generation, query, filters, sort).
+
+    Any change to the catalog calls invalidate(), which bumps the generation so entries
+    built against the old catalog can never be served again, and drops them eagerly.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl_seconds: Optional[float] = 300):
+        self.entries = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self.generation = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def canonical_filters(filters: Optional[Dict[str, Any]]) -> str:
+        """Drop empty filter values and serialize with sorted keys so equivalent filters share a key."""
+        active = {key: value for key, value in (filters or {}).items() if value}
+        return json.dumps(active, sort_keys=True, separators=(",", ":"))
+
+    def key(self, query: Optional[str], filters: Optional[Dict[str, Any]], sort: Optional[str],
+            *extra: Hashable) -> tuple:
+        return (self.generation, normalize_text(query) or "*", self.canonical_filters(filters),
+                sort or "") + extra
+
+    def get(self, key: tuple) -> Optional[Any]:
+        return self.entries.get(key)
+
+    def set(self, key: tuple, value: Any) -> None:
+        # Results computed while an invalidation happened belong to a stale generation
+        if key[0] == self.generation:
+            self.entries.set(key, value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.entries.stats()
+        stats["generation"] = self.generation
+        stats["invalidations"] = self.invalidations
+        return stats
+
+
+class ExtractionCache:
+    """
+    Cache of README extraction results (JSON-serializable dicts) with TTL.
+
+    Entries are keyed on (deployment, prompt version, sha256 of the README), so a changed
+    README, prompt or model never reuses an old result. The memory tier is a TTLCache;
+    when db_path is set, results are also kept in a SQLite file and survive restarts.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 db_path: Optional[str] = None):
+        self.memory = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.disk_hits = 0
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(readme: str, prompt_version: str, deployment: str) -> str:
+        digest = hashlib.sha256(readme.encode("utf-8")).hexdigest()
+        return f"{deployment}:{prompt_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is not None or self._conn is None:
+            return value
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM extractions WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (self.ttl_seconds and row[1] + self.ttl_seconds < time.time()):
+            return None
+        value = json.loads(row[0])
+        self.disk_hits += 1
+        self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.memory.set(key, value)
+        if self._conn is None:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extractions (key, value, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["db_path"] = self.db_path
+        return stats
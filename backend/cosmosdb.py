@@ -5,18 +5,36 @@ This module handles interactions with Azure Cosmos DB, including database and co
 and CRUD operations on documents. It uses DefaultAzureCredential for authentication.
 Logging is configured to show only custom messages.
 
+CosmosDBManager wraps the synchronous client and is used by scripts. AsyncCosmosDBManager
+exposes the same API on azure.cosmos.aio for the FastAPI app: one client (and so one HTTP
+connection pool) per worker, opened and closed in the app lifespan, so Cosmos round trips
+do not block the event loop.
+
+Point reads return None only when the item does not exist, and queries raise on Cosmos
+errors, so callers can tell "not found" or "no results" from "Cosmos failed". Writes
+return None (or False) when they fail.
+
 Requirements:
     azure-cosmos==4.5.1
     azure-identity==1.12.0
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator, Tuple
 from dotenv import load_dotenv
 from azure.cosmos import CosmosClient, exceptions, PartitionKey
+from azure.cosmos.aio import CosmosClient as AsyncCosmosClient
+from azure.core import MatchConditions
 from azure.cosmos.container import ContainerProxy
 from azure.cosmos.database import DatabaseProxy
 from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+
+def describe_batch_error(error: exceptions.CosmosBatchOperationError, operations: List[Tuple]) -> str:
+    """Log line for a rolled-back transactional batch, naming the operation that failed."""
+    index = error.error_index
+    operation = operations[index][0] if index is not None and 0 <= index < len(operations) else "unknown"
+    return f"Transactional batch rolled back: operation {index} ({operation}) failed: {error.message}"
 
 class CosmosDBManager:
     def __init__(self, cosmos_database_id=None, cosmos_container_id=None):
@@ -31,6 +49,8 @@ class CosmosDBManager:
         self.cosmos_database_id = cosmos_database_id or os.environ.get("COSMOS_DATABASE_ID")
         self.cosmos_container_id = cosmos_container_id or os.environ.get("COSMOS_CONTAINER_ID")
         self.tenant_id = os.environ.get("TENANT_ID", 'your-tenant-id')
+        # Set to "false" in production, where the database and container are provisioned ahead of time
+        self.create_if_missing = os.environ.get("COSMOS_CREATE_IF_MISSING", "true").lower() == "true"
 
         if not all([self.cosmos_database_id, self.cosmos_container_id]):
             raise ValueError("Cosmos DB configuration is incomplete")
@@ -49,6 +69,11 @@ class CosmosDBManager:
             raise
 
     def _initialize_database_and_container(self) -> None:
+        if not self.create_if_missing:
+            # Proxies only; no round trip until the first real operation
+            self.database = self.client.get_database_client(self.cosmos_database_id)
+            self.container = self.database.get_container_client(self.cosmos_container_id)
+            return
         try:
             self.database = self._create_or_get_database()
             self.container = self._create_or_get_container()
@@ -67,9 +92,12 @@ class CosmosDBManager:
 
     def _create_or_get_container(self) -> ContainerProxy:
         try:
+            # default_ttl=-1 turns TTL on without expiring anything by default; items opt in with a
+            # "ttl" field (sent outbox emails)
             container = self.database.create_container(
                 id=self.cosmos_container_id,
-                partition_key=PartitionKey(path='/partitionKey')
+                partition_key=PartitionKey(path='/partitionKey'),
+                default_ttl=-1
             )
             print(f'Container with id \'{self.cosmos_container_id}\' created')
         except exceptions.CosmosResourceExistsError:
@@ -101,33 +129,254 @@ class CosmosDBManager:
             print(f"An error occurred during update: {e.message}")
             return None
 
-    def upsert_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def upsert_item(self, item: Dict[str, Any], **kwargs) -> Dict[str, Any]:
         try:
-            upserted_item = self.container.upsert_item(body=item)
+            upserted_item = self.container.upsert_item(body=item, **kwargs)
             print(f"Item upserted with id: {upserted_item['id']}")
             return upserted_item
         except exceptions.CosmosHttpResponseError as e:
             print(f"An error occurred during upsert: {e.message}")
             return None
 
+    def read_item(self, item_id: str, partition_key: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Point read. None only if the item does not exist; any other Cosmos error is raised."""
+        try:
+            return self.container.read_item(item=item_id, partition_key=partition_key, **kwargs)
+        except exceptions.CosmosResourceNotFoundError:
+            return None
+
+    def replace_item_if_match(self, item: Dict[str, Any], etag: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Replace an item only if it still has the given etag. Returns None if it was changed concurrently."""
+        try:
+            return self.container.replace_item(item=item['id'], body=item, etag=etag,
+                                               match_condition=MatchConditions.IfNotModified, **kwargs)
+        except exceptions.CosmosAccessConditionFailedError:
+            print(f"Item with id {item['id']} was modified concurrently.")
+            return None
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during conditional replace: {e.message}")
+            return None
+
     def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
-                    partition_key: Optional[str] = None) -> List[Dict[str, Any]]:
-        try:
-            items = list(self.container.query_items(
-                query=query,
-                parameters=parameters,
-                partition_key=partition_key,
-                enable_cross_partition_query=(partition_key is None)
-            ))
-            print(f"Query returned {len(items)} items")
-            return items
+                    partition_key: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Run a query to completion. Cosmos errors are raised, so a failure is never mistaken for no results."""
+        items = list(self.container.query_items(
+            query=query,
+            parameters=parameters,
+            partition_key=partition_key,
+            enable_cross_partition_query=(partition_key is None),
+            **kwargs
+        ))
+        print(f"Query returned {len(items)} items")
+        return items
+
+    def query_page(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                   partition_key: Optional[str] = None, max_item_count: int = 100,
+                   continuation_token: Optional[str] = None, **kwargs) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of query results and the continuation token for the next page (None when done).
+        Cosmos errors are raised rather than returned as an empty last page.
+        """
+        pager = self.container.query_items(
+            query=query,
+            parameters=parameters,
+            partition_key=partition_key,
+            enable_cross_partition_query=(partition_key is None),
+            max_item_count=max_item_count,
+            **kwargs
+        ).by_page(continuation_token)
+        items = list(next(pager, []))
+        return items, pager.continuation_token
+
+    def iter_query_pages(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                         partition_key: Optional[str] = None,
+                         max_item_count: int = 100, **kwargs) -> Iterator[List[Dict[str, Any]]]:
+        """Yield query results page by page without materializing the whole result set."""
+        pages = self.container.query_items(
+            query=query,
+            parameters=parameters,
+            partition_key=partition_key,
+            enable_cross_partition_query=(partition_key is None),
+            max_item_count=max_item_count,
+            **kwargs
+        ).by_page()
+        for page in pages:
+            yield list(page)
+
+    def execute_item_batch(self, operations: List[Tuple], partition_key: str,
+                           **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """Run operations, e.g. ("upsert", (item,)), as one transaction within a partition. None if it failed."""
+        try:
+            return list(self.container.execute_item_batch(operations, partition_key=partition_key, **kwargs))
+        except exceptions.CosmosBatchOperationError as e:
+            # Raised when an operation fails and the batch is rolled back; not a CosmosHttpResponseError
+            print(describe_batch_error(e, operations))
+            return None
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during transactional batch: {e.message}")
+            return None
+
+    def delete_item(self, item_id: str, partition_key: str, **kwargs) -> bool:
+        try:
+            self.container.delete_item(item=item_id, partition_key=partition_key, **kwargs)
+            print(f"Item deleted with id: {item_id}")
+            return True
+        except exceptions.CosmosResourceNotFoundError:
+            print(f"Item with id {item_id} not found.")
+            return False
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during deletion: {e.message}")
+            return False
+
+class AsyncCosmosDBManager:
+    """
+    Async counterpart of CosmosDBManager built on azure.cosmos.aio.
+
+    Construction does no I/O; call `await initialize()` before use (e.g. in the FastAPI
+    lifespan) and `await close()` on shutdown to release the shared connection pool. With
+    COSMOS_CREATE_IF_MISSING=false, initialize only builds proxies for an existing container.
+    """
+
+    def __init__(self, cosmos_database_id=None, cosmos_container_id=None):
+        load_dotenv()
+        self.cosmos_database_id = cosmos_database_id or os.environ.get("COSMOS_DATABASE_ID")
+        self.cosmos_container_id = cosmos_container_id or os.environ.get("COSMOS_CONTAINER_ID")
+        self.resource_endpoint = os.environ.get("COSMOS_HOST")
+        self.create_if_missing = os.environ.get("COSMOS_CREATE_IF_MISSING", "true").lower() == "true"
+
+        if not all([self.cosmos_database_id, self.cosmos_container_id]):
+            raise ValueError("Cosmos DB configuration is incomplete")
+        if not self.resource_endpoint:
+            raise ValueError("COSMOS_HOST environment variable is required")
+
+        self.credential = None
+        self.client = None
+        self.database = None
+        self.container = None
+
+    async def initialize(self) -> "AsyncCosmosDBManager":
+        if self.container is not None:
+            return self
+        try:
+            print("Using DefaultAzureCredential for async Cosmos DB authentication")
+            self.credential = AsyncDefaultAzureCredential()
+            self.client = AsyncCosmosClient(self.resource_endpoint, credential=self.credential)
+            if not self.create_if_missing:
+                # Proxies only; no round trip until the first real operation
+                self.database = self.client.get_database_client(self.cosmos_database_id)
+                self.container = self.database.get_container_client(self.cosmos_container_id)
+                return self
+            self.database = await self.client.create_database_if_not_exists(id=self.cosmos_database_id)
+            self.container = await self.database.create_container_if_not_exists(
+                id=self.cosmos_container_id,
+                partition_key=PartitionKey(path='/partitionKey'),
+                default_ttl=-1
+            )
+            print(f'Container with id \'{self.cosmos_container_id}\' is ready')
+            return self
         except exceptions.CosmosHttpResponseError as e:
-            print(f"An error occurred during query: {e.message}")
-            return []
+            print(f'An error occurred: {e.message}')
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+        if self.credential is not None:
+            await self.credential.close()
+        self.client = None
+        self.credential = None
+        self.database = None
+        self.container = None
+
+    @staticmethod
+    def _query_kwargs(parameters, partition_key, kwargs) -> Dict[str, Any]:
+        # Without a partition key the async client fans out across partitions on its own
+        if partition_key is not None:
+            kwargs["partition_key"] = partition_key
+        return {"parameters": parameters, **kwargs}
+
+    async def upsert_item(self, item: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        try:
+            upserted_item = await self.container.upsert_item(body=item, **kwargs)
+            print(f"Item upserted with id: {upserted_item['id']}")
+            return upserted_item
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during upsert: {e.message}")
+            return None
+
+    async def read_item(self, item_id: str, partition_key: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Point read. None only if the item does not exist; any other Cosmos error is raised."""
+        try:
+            return await self.container.read_item(item=item_id, partition_key=partition_key, **kwargs)
+        except exceptions.CosmosResourceNotFoundError:
+            return None
+
+    async def replace_item_if_match(self, item: Dict[str, Any], etag: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Replace an item only if it still has the given etag. Returns None if it was changed concurrently."""
+        try:
+            return await self.container.replace_item(item=item['id'], body=item, etag=etag,
+                                                     match_condition=MatchConditions.IfNotModified, **kwargs)
+        except exceptions.CosmosAccessConditionFailedError:
+            print(f"Item with id {item['id']} was modified concurrently.")
+            return None
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during conditional replace: {e.message}")
+            return None
+
+    async def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                          partition_key: Optional[str] = None, **kwargs) -> List[Dict[str, Any]]:
+        """Run a query to completion. Cosmos errors are raised, so a failure is never mistaken for no results."""
+        items = [item async for item in self.container.query_items(
+            query, **self._query_kwargs(parameters, partition_key, kwargs)
+        )]
+        print(f"Query returned {len(items)} items")
+        return items
+
+    async def query_page(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                         partition_key: Optional[str] = None, max_item_count: int = 100,
+                         continuation_token: Optional[str] = None,
+                         **kwargs) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of query results and the continuation token for the next page (None when done).
+        Cosmos errors are raised rather than returned as an empty last page.
+        """
+        pager = self.container.query_items(
+            query, max_item_count=max_item_count, **self._query_kwargs(parameters, partition_key, kwargs)
+        ).by_page(continuation_token)
+        try:
+            page = await pager.__anext__()
+        except StopAsyncIteration:
+            return [], None
+        items = [item async for item in page]
+        return items, pager.continuation_token
+
+    async def iter_query_pages(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                               partition_key: Optional[str] = None, max_item_count: int = 100,
+                               **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield query results page by page without materializing the whole result set."""
+        pages = self.container.query_items(
+            query, max_item_count=max_item_count, **self._query_kwargs(parameters, partition_key, kwargs)
+        ).by_page()
+        async for page in pages:
+            yield [item async for item in page]
+
+    async def execute_item_batch(self, operations: List[Tuple], partition_key: str,
+                                 **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """Run operations, e.g. ("upsert", (item,)), as one transaction within a partition. None if it failed."""
+        try:
+            return list(await self.container.execute_item_batch(operations, partition_key=partition_key, **kwargs))
+        except exceptions.CosmosBatchOperationError as e:
+            # Raised when an operation fails and the batch is rolled back; not a CosmosHttpResponseError
+            print(describe_batch_error(e, operations))
+            return None
+        except exceptions.CosmosHttpResponseError as e:
+            print(f"An error occurred during transactional batch: {e.message}")
+            return None
 
-    def delete_item(self, item_id: str, partition_key: str) -> bool:
+    async def delete_item(self, item_id: str, partition_key: str, **kwargs) -> bool:
         try:
-            self.container.delete_item(item=item_id, partition_key=partition_key)
+            await self.container.delete_item(item=item_id, partition_key=partition_key, **kwargs)
             print(f"Item deleted with id: {item_id}")
             return True
         except exceptions.CosmosResourceNotFoundError:
@@ -59,16 +59,8 @@ search_client = SearchClient(ai_search_endpoint, ai_search_index, AzureKeyCreden
 
 
 
-def create_index():
-    # Check if index exists, return if so
-    try:
-        search_index_client.get_index(ai_search_index)
-        print("Index already exists")
-        return
-    except:
-        pass
-
-    fields = [
+def build_fields():
+    return [
         SimpleField(name="id", type=SearchFieldDataType.String, key=True),
         SimpleField(name='owner', type=SearchFieldDataType.String, filterable=True),
         SearchableField(name='project_name', type=SearchFieldDataType.String),
@@ -84,6 +76,10 @@ def create_index():
         SearchableField(name="target_audience", type=SearchFieldDataType.String),
         SimpleField(name="industries", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
         SimpleField(name="customers", type=SearchFieldDataType.Collection(SearchFieldDataType.String), filterable=True),
+        # Sort keys used by FilterOptions.sort (see SORT_ORDER_BY in projects.py)
+        SimpleField(name="project_name_sort", type=SearchFieldDataType.String, sortable=True),
+        SimpleField(name="code_complexity_rank", type=SearchFieldDataType.Int32, filterable=True, sortable=True),
+        SimpleField(name="approved_at", type=SearchFieldDataType.DateTimeOffset, filterable=True, sortable=True),
         SearchField(
             name="description_vector",
             type=SearchFieldDataType.Collection(SearchFieldDataType.Single),
@@ -107,6 +103,20 @@ def create_index():
         ),
     ]
 
+
+def create_index():
+    # Check if index exists; if so, only add any fields that are missing from it
+    try:
+        existing_index = search_index_client.get_index(ai_search_index)
+    except:
+        existing_index = None
+
+    if existing_index is not None:
+        update_index_fields(existing_index)
+        return
+
+    fields = build_fields()
+
     vector_search = VectorSearch(
         algorithms=[
             HnswAlgorithmConfiguration(
@@ -126,5 +136,24 @@ def create_index():
 
     print("Index has been created")
 
+
+def update_index_fields(index):
+    """
+    Add fields defined in build_fields() that an existing index does not have yet.
+
+    Azure AI Search allows adding fields in place but not changing existing ones, so new
+    attributes (e.g. sortable) are introduced as new fields. Documents indexed before the
+    update have null values until they are re-indexed.
+    """
+    existing = {field.name for field in index.fields}
+    missing = [field for field in build_fields() if field.name not in existing]
+    if not missing:
+        print("Index already exists")
+        return
+
+    index.fields.extend(missing)
+    search_index_client.create_or_update_index(index)
+    print(f"Index already exists; added fields: {', '.join(field.name for field in missing)}")
+
 if __name__ == "__main__":
     create_index()
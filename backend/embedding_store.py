@@ -0,0 +1,109 @@
+"""
+### embedding_store.py ###
+
+Persistent embedding store keyed by (model, sha256 of text).
+
+Vectors are kept in a local SQLite file as float32 blobs (6 KB for a 1536-dimension
+vector), so text that has been embedded once is never sent to the embedding deployment
+again: re-approving a project, editing its tags or rebuilding the whole index only pays
+for text that actually changed. The store is safe to share between threads.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    SQLite-backed map from (model, sha256(text)) to an embedding vector.
+
+    Args:
+        db_path: SQLite file; parent directories are created as needed.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, created_at REAL NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.commit()
+
+    def get(self, model: str, text: str, max_age_seconds: Optional[float] = None) -> Optional[List[float]]:
+        return self.get_many(model, [text], max_age_seconds)[0]
+
+    def get_many(self, model: str, texts: List[str],
+                 max_age_seconds: Optional[float] = None) -> List[Optional[List[float]]]:
+        """Stored vectors for texts, in order; None where a text has no (fresh enough) vector."""
+        hashes = [text_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        oldest = time.time() - max_age_seconds if max_age_seconds else None
+        unique_hashes = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(unique_hashes), 500):
+                chunk = unique_hashes[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector, created_at FROM embeddings"
+                    f" WHERE model = ? AND text_hash IN ({', '.join('?' * len(chunk))})",
+                    [model, *chunk]
+                ).fetchall()
+                for digest, blob, created_at in rows:
+                    if oldest is None or created_at >= oldest:
+                        found[digest] = array("f", blob).tolist()
+            vectors = [found.get(digest) for digest in hashes]
+            hits = sum(vector is not None for vector in vectors)
+            self.hits += hits
+            self.misses += len(vectors) - hits
+        return vectors
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        self.put_many(model, [(text, vector)])
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, List[float]]]) -> None:
+        now = time.time()
+        rows = [(model, text_hash(text), array("f", vector).tobytes(), now) for text, vector in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "db_path": self.db_path,
+            "size": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
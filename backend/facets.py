@@ -0,0 +1,253 @@
+"""
+### facets.py ###
+
+Materialized filter facets for /api/get_filter_options.
+
+Instead of scanning every approved project on each page load, a single facet document in the
+'metadata' partition keeps a count per tag value. approve_project, reject_project and
+update_approved_tags apply incremental updates to it, and rebuild_facets() recomputes it from
+the catalog to repair drift:
+
+    python facets.py --rebuild
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+FACET_DOCUMENT_ID = "filter_facets"
+FACET_PARTITION_KEY = "metadata"
+
+# Project collection fields -> (facet key, approved_tags key used to screen values, or None)
+COLLECTION_FACETS = {
+    'programmingLanguages': ('programmingLanguages', 'programming_languages'),
+    'frameworks': ('frameworks', 'frameworks'),
+    'azureServices': ('azureServices', 'azure_services'),
+    'designPatterns': ('designPatterns', 'design_patterns'),
+    'industries': ('industries', 'industries'),
+    # Customers are listed without an approval check
+    'customers': ('customers', None)
+}
+
+# Single-value project fields -> facet key
+SINGLE_VALUE_FACETS = {
+    'projectType': 'projectTypes',
+    'codeComplexity': 'codeComplexities'
+}
+
+APPROVED_TAG_KEYS = ['programming_languages', 'frameworks', 'azure_services', 'design_patterns',
+                     'industries', 'project_types', 'azure_service_mapping']
+
+
+def empty_facet_document() -> Dict[str, Any]:
+    return {
+        "id": FACET_DOCUMENT_ID,
+        "partitionKey": FACET_PARTITION_KEY,
+        "counts": {},
+        "approved_tags": {},
+        "project_count": 0
+    }
+
+
+def project_facet_values(project: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Distinct facet values contributed by a project; nothing unless it is approved."""
+    if not project or project.get('review_status') != 'approved':
+        return {}
+    values = {}
+    for field, (facet_key, _) in COLLECTION_FACETS.items():
+        distinct = sorted({value for value in project.get(field) or [] if value})
+        if distinct:
+            values[facet_key] = distinct
+    for field, facet_key in SINGLE_VALUE_FACETS.items():
+        if project.get(field):
+            values[facet_key] = [project[field]]
+    return values
+
+
+def apply_project_change(facets: Dict[str, Any], before: Optional[Dict[str, Any]],
+                         after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Update facet counts for one project changing from `before` to `after`.
+
+    Either side may be None (new project / deleted project). Values reaching zero are removed.
+    """
+    counts = facets.setdefault("counts", {})
+    for delta, project in ((-1, before), (1, after)):
+        contributed = project_facet_values(project)
+        if contributed:
+            facets["project_count"] = facets.get("project_count", 0) + delta
+        for facet_key, values in contributed.items():
+            facet_counts = counts.setdefault(facet_key, {})
+            for value in values:
+                count = facet_counts.get(value, 0) + delta
+                if count > 0:
+                    facet_counts[value] = count
+                else:
+                    facet_counts.pop(value, None)
+    return facets
+
+
+def set_approved_tags(facets: Dict[str, Any], approved_tags: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the approved tag lists into the facet document so the endpoint needs a single read."""
+    facets["approved_tags"] = {key: approved_tags.get(key, {} if key == 'azure_service_mapping' else [])
+                               for key in APPROVED_TAG_KEYS}
+    return facets
+
+
+def build_facet_document(projects: List[Dict[str, Any]], approved_tags: Dict[str, Any]) -> Dict[str, Any]:
+    facets = empty_facet_document()
+    for project in projects:
+        apply_project_change(facets, None, project)
+    return set_approved_tags(facets, approved_tags or {})
+
+
+def filter_options_from_facets(facets: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the /api/get_filter_options response from a facet document."""
+    counts = facets.get("counts", {})
+    approved_tags = facets.get("approved_tags", {})
+    data = {}
+    facet_counts = {}
+
+    for facet_key, approved_key in COLLECTION_FACETS.values():
+        values = counts.get(facet_key, {})
+        if approved_key is not None:
+            approved = set(approved_tags.get(approved_key, []))
+            values = {value: count for value, count in values.items() if value in approved}
+        data[facet_key] = sorted(values)
+        facet_counts[facet_key] = values
+
+    project_types = counts.get('projectTypes', {})
+    data["projectTypes"] = sorted(project_types)
+    facet_counts["projectTypes"] = project_types
+    facet_counts["codeComplexities"] = counts.get('codeComplexities', {})
+
+    return {
+        "programmingLanguages": data["programmingLanguages"],
+        "frameworks": data["frameworks"],
+        "azureServices": data["azureServices"],
+        "azureServiceCategories": approved_tags.get('azure_service_mapping', {}),
+        "designPatterns": data["designPatterns"],
+        "industries": data["industries"],
+        "projectTypes": data["projectTypes"],
+        "codeComplexities": ["Beginner", "Intermediate", "Advanced"],
+        "customers": data["customers"],
+        "facetCounts": facet_counts
+    }
+
+
+class FacetStore:
+    """
+    Reads and updates the facet document through an AsyncCosmosRepository.
+
+    Updates are read-modify-write guarded by the document's etag, retried when another
+    writer got there first, so concurrent approvals cannot lose each other's counts.
+
+    The document is only rebuilt when it does not exist. If Cosmos fails (e.g. throttling),
+    reads serve the last document this store read, and nothing is written.
+    """
+
+    def __init__(self, repository, max_attempts: int = 5):
+        self.repository = repository
+        self.max_attempts = max_attempts
+        self._last_read: Optional[Dict[str, Any]] = None
+
+    async def read(self) -> Optional[Dict[str, Any]]:
+        """The facet document, or None if it does not exist. Cosmos errors are raised."""
+        facets = await self.repository.read_item(FACET_DOCUMENT_ID, FACET_PARTITION_KEY, name='read_filter_facets')
+        if facets is not None:
+            self._last_read = facets
+        return facets
+
+    async def update(self, mutate) -> bool:
+        """Apply mutate(facets) to the stored document. Returns False if no attempt succeeded."""
+        for _ in range(self.max_attempts):
+            try:
+                facets = await self.read()
+            except Exception as e:
+                print(f"Error reading filter facets: {e}; run a rebuild to repair them.")
+                return False
+            if facets is None:
+                # Nothing to update incrementally; build the document from the catalog instead
+                return await self.rebuild() is not None
+            etag = facets.get('_etag')
+            mutate(facets)
+            facets["updated_at"] = datetime.now(timezone.utc).isoformat()
+            if await self.repository.replace_item_if_match(strip_system_properties(facets), etag,
+                                                           name='replace_filter_facets') is not None:
+                return True
+        print("Failed to update filter facets after retries; run a rebuild to repair them.")
+        return False
+
+    async def apply_project_change(self, before: Optional[Dict[str, Any]],
+                                   after: Optional[Dict[str, Any]]) -> bool:
+        if not project_facet_values(before) and not project_facet_values(after):
+            return True
+        return await self.update(lambda facets: apply_project_change(facets, before, after))
+
+    async def set_approved_tags(self, approved_tags: Dict[str, Any]) -> bool:
+        return await self.update(lambda facets: set_approved_tags(facets, approved_tags))
+
+    async def rebuild(self) -> Optional[Dict[str, Any]]:
+        """
+        Recompute the facet document from all approved projects and the approved tags.
+
+        Raises if either cannot be read, so a failed query never replaces the stored
+        document with an empty one. Returns None if the final write failed.
+        """
+        projects = await self.repository.query('approved_project_facets', review_status='approved')
+        # None here means the approved tags document does not exist yet
+        approved_tags = await self.repository.get_approved_tags() or {}
+        facets = build_facet_document(projects, approved_tags)
+        facets["updated_at"] = datetime.now(timezone.utc).isoformat()
+        stored = await self.repository.upsert_item(facets, name='upsert_filter_facets')
+        if stored is not None:
+            self._last_read = stored
+        return stored
+
+    async def get_filter_options(self) -> Dict[str, Any]:
+        try:
+            facets = await self.read()
+        except Exception as e:
+            if self._last_read is None:
+                raise
+            print(f"Error reading filter facets, serving the last copy read: {e}")
+            return filter_options_from_facets(self._last_read)
+        if facets is None:
+            # First use: build the document from the catalog
+            facets = await self.rebuild() or empty_facet_document()
+        return filter_options_from_facets(facets)
+
+
+def strip_system_properties(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop Cosmos system properties (_rid, _etag, _ts, ...) before writing an item back."""
+    return {key: value for key, value in item.items() if not key.startswith('_')}
+
+
+async def _rebuild() -> None:
+    from cosmosdb import AsyncCosmosDBManager
+    from repository import AsyncCosmosRepository
+
+    cosmos_db = await AsyncCosmosDBManager().initialize()
+    try:
+        facets = await FacetStore(AsyncCosmosRepository(cosmos_db)).rebuild()
+        if facets:
+            print(f"Rebuilt filter facets from {facets.get('project_count', 0)} approved projects.")
+        else:
+            print("Failed to rebuild filter facets.")
+    except Exception as e:
+        print(f"Failed to rebuild filter facets: {e}")
+    finally:
+        await cosmos_db.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Maintain the materialized filter facet document.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the facet document from the catalog")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        asyncio.run(_rebuild())
+    else:
+        parser.print_help()
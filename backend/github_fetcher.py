@@ -0,0 +1,181 @@
+"""
+### github_fetcher.py ###
+
+Async README fetcher for public GitHub repositories.
+
+One pooled httpx.AsyncClient is shared by all submissions. Each branch/filename
+candidate (main/master x README.md/readme.md/...) is requested concurrently, and the
+successful one earliest in that order wins (main before master, README.md before the
+other names), independent of response timing; the rest are cancelled. Responses are cached
+with their ETag/Last-Modified validators, and the winning URL is remembered per repo, so
+a repeat submission of the same repo costs one conditional request that usually comes
+back 304 Not Modified.
+
+Set GITHUB_RAW_BASE_URL to point at a stub server (scripts/stub_github_server.py) for
+local testing.
+
+Requirements:
+    httpx
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from cache import TTLCache
+
+GITHUB_RAW_BASE_URL = os.getenv("GITHUB_RAW_BASE_URL", "https://raw.githubusercontent.com")
+GITHUB_TIMEOUT_SECONDS = float(os.getenv("GITHUB_TIMEOUT_SECONDS", "10"))
+GITHUB_README_MAX_BYTES = int(os.getenv("GITHUB_README_MAX_BYTES", str(512 * 1024)))
+GITHUB_MAX_CONNECTIONS = int(os.getenv("GITHUB_MAX_CONNECTIONS", "20"))
+
+README_BRANCHES = ["main", "master"]
+README_FILENAMES = ["README.md", "readme.md", "Readme.md", "README.rst", "README"]
+
+
+def parse_github_url(github_url: str) -> Tuple[str, str]:
+    """Return (owner, repo) from a GitHub repository URL."""
+    parts = github_url.strip().rstrip('/').split('/')
+    owner, repo = parts[-2], parts[-1]
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    return owner, repo
+
+
+class GitHubReadmeFetcher:
+    """
+    Pooled, caching README fetcher. Call `start()` before use and `await aclose()` on shutdown.
+
+    Args:
+        base_url: Raw content host.
+        timeout_seconds: Per-request timeout.
+        max_bytes: README bodies are truncated to this many bytes.
+        max_connections: Connection pool size.
+        cache_size: Number of README responses kept for revalidation.
+    """
+
+    def __init__(self, base_url: str = GITHUB_RAW_BASE_URL, timeout_seconds: float = GITHUB_TIMEOUT_SECONDS,
+                 max_bytes: int = GITHUB_README_MAX_BYTES, max_connections: int = GITHUB_MAX_CONNECTIONS,
+                 cache_size: int = 1024, branches: Optional[List[str]] = None,
+                 filenames: Optional[List[str]] = None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout_seconds = timeout_seconds
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.branches = branches or README_BRANCHES
+        self.filenames = filenames or README_FILENAMES
+        # url -> (etag, last_modified, text)
+        self.responses = TTLCache(maxsize=cache_size)
+        # (owner, repo) -> url of the README that was found last time
+        self.resolved = TTLCache(maxsize=cache_size)
+        self.client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.not_modified = 0
+
+    def start(self) -> "GitHubReadmeFetcher":
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout_seconds),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                follow_redirects=True
+            )
+        return self
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    def candidate_urls(self, owner: str, repo: str) -> List[str]:
+        return [f"{self.base_url}/{owner}/{repo}/{branch}/{filename}"
+                for branch in self.branches for filename in self.filenames]
+
+    async def _get(self, url: str) -> Optional[str]:
+        """Conditional GET of one candidate. Returns the README text, or None if it does not exist."""
+        headers = {}
+        cached = self.responses.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        self.requests += 1
+        async with self.client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                self.not_modified += 1
+                return cached[2]
+            if response.status_code != 200:
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= self.max_bytes:
+                    print(f"README at {url} exceeds {self.max_bytes} bytes; truncating.")
+                    del body[self.max_bytes:]
+                    break
+            text = body.decode(response.encoding or "utf-8", errors="replace")
+            self.responses.set(url, (response.headers.get("ETag"), response.headers.get("Last-Modified"), text))
+            return text
+
+    async def _probe(self, url: str) -> Tuple[str, Optional[str]]:
+        try:
+            return url, await self._get(url)
+        except httpx.HTTPError as e:
+            print(f"Error probing README candidate {url}: {e}")
+            return url, None
+
+    async def _first_success(self, urls: List[str]) -> Tuple[Optional[str], str]:
+        """
+        Request every url concurrently; return (url, text) of the highest-priority success.
+
+        urls are in priority order. Results are awaited in that order, so a candidate wins
+        only once every candidate before it has failed, whichever answers first. The
+        lower-priority requests still pending at that point are cancelled.
+        """
+        tasks = [asyncio.ensure_future(self._probe(url)) for url in urls]
+        try:
+            for task in tasks:
+                url, text = await task
+                if text:
+                    return url, text
+            return None, ""
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_readme(self, github_url: str) -> str:
+        """Fetch a repository's README. Returns "" when no README could be fetched."""
+        try:
+            owner, repo = parse_github_url(github_url)
+            self.start()
+
+            # Revalidate the README found last time before probing every candidate again
+            known_url = self.resolved.get((owner, repo))
+            if known_url:
+                url, text = await self._first_success([known_url])
+                if text:
+                    return text
+
+            url, text = await self._first_success(self.candidate_urls(owner, repo))
+            if text:
+                self.resolved.set((owner, repo), url)
+            else:
+                print("README not found in the repository.")
+            return text
+
+        except Exception as e:
+            print(f"Error fetching README: {e}")
+            return ""
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "cached_responses": len(self.responses),
+            "resolved_repos": len(self.resolved)
+        }
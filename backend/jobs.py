@@ -0,0 +1,119 @@
+"""
+### jobs.py ###
+
+In-process background jobs for slow request work (README fetch + LLM extraction).
+
+JobManager runs job functions on a bounded thread pool, so the number of extractions in
+flight is capped at max_workers no matter how many requests arrive; extra jobs wait in
+the queue. Each job gets an id whose status and result can be polled
+(GET /api/jobs/{id}) or streamed (GET /api/jobs/{id}/events). Finished jobs are kept for
+result_ttl_seconds.
+
+Jobs live in the memory of the worker that accepted them, so this assumes a single
+uvicorn worker (as the Dockerfile runs) or sticky routing.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at
+        }
+
+
+class JobManager:
+    """
+    Bounded background job runner with status tracking.
+
+    Args:
+        max_workers: Maximum number of jobs running at once.
+        result_ttl_seconds: How long finished jobs stay queryable.
+    """
+
+    def __init__(self, max_workers: int = 4, result_ttl_seconds: float = 3600):
+        self.max_workers = max_workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args, **kwargs) -> Job:
+        """Queue fn(*args, **kwargs) and return its Job right away."""
+        self._purge_expired()
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args, kwargs) -> Any:
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            job.result = fn(*args, **kwargs)
+            job.finished_at = time.time()
+            job.status = SUCCEEDED
+            return job.result
+        except Exception as e:
+            # HTTPException carries its message in .detail
+            job.error = str(getattr(e, "detail", None) or e)
+            job.finished_at = time.time()
+            job.status = FAILED
+            raise
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.result_ttl_seconds
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {"max_workers": self.max_workers, "jobs": counts}
+
+    def shutdown(self) -> None:
+        """Stop accepting work and drop queued jobs; running jobs finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,272 @@
+"""
+### local_index.py ###
+
+In-process replica of the Azure AI Search project index.
+
+The catalog is small (a few thousand projects), so the whole index fits comfortably in
+memory: each vector field is held as one contiguous, L2-normalized float32 NumPy matrix
+and cosine top-k is a single matrix product. Keyword scoring uses BM25 over the searchable
+text fields, and the two sides are combined with reciprocal rank fusion like the service's
+hybrid query. Filters are evaluated from the same conditions that build_filter_string
+renders to OData, so both backends return the same result set for a given filter.
+
+Requirements:
+    numpy
+"""
+
+import json
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ranking import reciprocal_rank_fusion, sort_by_order_clauses
+
+VECTOR_FIELDS = ("description_vector", "business_value_vector", "target_audience_vector")
+TEXT_FIELDS = ("project_name", "project_description", "business_value", "target_audience")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_PATTERN.findall((text or "").lower())
+
+
+class BM25Scorer:
+    """Okapi BM25 over a fixed list of documents, each given as a token list."""
+
+    def __init__(self, documents: Sequence[List[str]], k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_frequencies = [Counter(tokens) for tokens in documents]
+        self.doc_lengths = np.array([len(tokens) for tokens in documents], dtype=np.float32)
+        self.avg_doc_length = float(self.doc_lengths.mean()) if len(documents) else 0.0
+        document_frequency: Counter = Counter()
+        for frequencies in self.term_frequencies:
+            document_frequency.update(frequencies.keys())
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.term_frequencies), dtype=np.float32)
+        if not self.avg_doc_length:
+            return scores
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / self.avg_doc_length)
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            tf = np.array([frequencies.get(term, 0) for frequencies in self.term_frequencies],
+                          dtype=np.float32)
+            scores += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+class LocalSearchIndex:
+    """
+    Memory-resident copy of the search index supporting hybrid search with filters.
+
+    Documents use the same snake_case schema as the Azure AI Search index (see create-index.py).
+    Writes mark the index dirty; matrices and the BM25 model are rebuilt on the next query.
+    """
+
+    def __init__(self, dimensions: int = 1536):
+        self.dimensions = dimensions
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._dirty = True
+        self._ids: List[str] = []
+        self._docs: List[Dict[str, Any]] = []
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._bm25: Optional[BM25Scorer] = None
+
+    # ----------------------------
+    # Loading and maintenance
+    # ----------------------------
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def load(self, documents: Iterable[Dict[str, Any]]) -> "LocalSearchIndex":
+        with self._lock:
+            self._documents = {doc["id"]: dict(doc) for doc in documents}
+            self._dirty = True
+        return self
+
+    def upsert(self, document: Dict[str, Any]) -> None:
+        with self._lock:
+            self._documents[document["id"]] = dict(document)
+            self._dirty = True
+
+    def delete(self, document_id: str) -> None:
+        with self._lock:
+            if self._documents.pop(document_id, None) is not None:
+                self._dirty = True
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        return self._documents.get(document_id)
+
+    @classmethod
+    def from_search_client(cls, search_client, dimensions: int = 1536) -> "LocalSearchIndex":
+        """Pull every document, vectors included, from an Azure AI Search index."""
+        results = search_client.search(search_text="*", select=["*"], top=100000)
+        return cls(dimensions=dimensions).load(
+            {key: value for key, value in result.items() if not key.startswith("@")}
+            for result in results
+        )
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the documents (vectors included) to a JSON snapshot for offline use."""
+        with self._lock:
+            documents = list(self._documents.values())
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"dimensions": self.dimensions, "documents": documents}, f)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "LocalSearchIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return cls(dimensions=snapshot.get("dimensions", 1536)).load(snapshot["documents"])
+
+    def _rebuild(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            docs = list(self._documents.values())
+            matrices = {}
+            for field in VECTOR_FIELDS:
+                matrix = np.zeros((len(docs), self.dimensions), dtype=np.float32)
+                for row, doc in enumerate(docs):
+                    vector = doc.get(field)
+                    if vector:
+                        matrix[row] = np.asarray(vector, dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                matrices[field] = np.ascontiguousarray(matrix / norms)
+            self._bm25 = BM25Scorer([
+                tokenize(" ".join(str(doc.get(field) or "") for field in TEXT_FIELDS))
+                for doc in docs
+            ])
+            self._docs = docs
+            self._ids = [doc["id"] for doc in docs]
+            self._matrices = matrices
+            self._dirty = False
+
+    # ----------------------------
+    # Querying
+    # ----------------------------
+
+    def filter_mask(self, conditions: Optional[Sequence[Tuple[str, str, Any]]]) -> np.ndarray:
+        """Boolean mask of documents satisfying every (operator, field, value) condition."""
+        self._rebuild()
+        mask = np.ones(len(self._docs), dtype=bool)
+        for operator, field, value in conditions or []:
+            if operator == "any":
+                matches = [value in (doc.get(field) or []) for doc in self._docs]
+            else:
+                matches = [doc.get(field) == value for doc in self._docs]
+            mask &= np.array(matches, dtype=bool)
+        return mask
+
+    def cosine_top_k(self, field: str, query_vectors: np.ndarray, k: int,
+                     mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Batched cosine similarity top-k against one vector field.
+
+        Args:
+            field: Vector field name.
+            query_vectors: (m, d) array of query vectors, or a single (d,) vector.
+            k: Number of neighbours per query.
+            mask: Optional boolean mask restricting candidates.
+
+        Returns:
+            List[List[Tuple[int, float]]]: For each query, (row, similarity) pairs best first.
+        """
+        self._rebuild()
+        queries = np.atleast_2d(np.asarray(query_vectors, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        similarities = (queries / norms) @ self._matrices[field].T
+        if mask is not None:
+            similarities[:, ~mask] = -np.inf
+        candidates = int(mask.sum()) if mask is not None else similarities.shape[1]
+        k = min(k, candidates)
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        results = []
+        for row, indices in enumerate(top):
+            ordered = indices[np.argsort(-similarities[row, indices], kind="stable")]
+            results.append([(int(i), float(similarities[row, i])) for i in ordered])
+        return results
+
+    def keyword_ranking(self, search_text: str, mask: np.ndarray) -> List[Tuple[int, float]]:
+        """(row, BM25 score) pairs matching the keyword query, best first. '*' matches every row."""
+        self._rebuild()
+        if not search_text or search_text.strip() == "*":
+            return [(int(i), 1.0) for i in np.flatnonzero(mask)]
+        scores = self._bm25.scores(search_text)
+        candidates = np.flatnonzero(mask & (scores > 0))
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ordered]
+
+    def search(self, search_text: Optional[str], vector_queries: Sequence[Any] = (),
+               conditions: Optional[Sequence[Tuple[str, str, Any]]] = None,
+               select: Optional[Sequence[str]] = None, order_by: Optional[Sequence[str]] = None,
+               top: int = 8, skip: int = 0,
+               include_total_count: bool = False) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Hybrid search mirroring SearchClient.search.
+
+        vector_queries are VectorizedQuery-like objects exposing vector, fields and
+        k_nearest_neighbors. A search_text of None means a pure vector query. When more
+        than one ranking is produced they are fused with RRF; a single ranking keeps its
+        raw scores (BM25 or cosine similarity). order_by clauses ("field asc|desc") reorder
+        the matched documents before paging, as $orderby does.
+
+        Returns:
+            Tuple: The page of results and, when include_total_count is set, the number of
+            documents in the fused ranking (None otherwise).
+        """
+        with self._lock:
+            self._rebuild()
+            mask = self.filter_mask(conditions)
+            scored_lists = []
+            if search_text is not None:
+                scored_lists.append(self.keyword_ranking(search_text, mask))
+            for vector_query in vector_queries:
+                scored_lists.append(self.cosine_top_k(vector_query.fields, vector_query.vector,
+                                                      vector_query.k_nearest_neighbors, mask)[0])
+            if len(scored_lists) == 1:
+                fused = scored_lists[0]
+            else:
+                fused = reciprocal_rank_fusion([[row for row, _ in scored] for scored in scored_lists])
+            total_count = len(fused) if include_total_count else None
+            matches = [{**self._docs[row], "@search.score": score} for row, score in fused]
+            if order_by:
+                # Sort on the full documents: the sort fields need not be selected
+                matches = sort_by_order_clauses(matches, order_by)
+            page = matches[skip:skip + top]
+            if select:
+                page = [{**{key: doc.get(key) for key in select}, "@search.score": doc["@search.score"]}
+                        for doc in page]
+            return page, total_count
+
+
+if __name__ == "__main__":
+    import argparse
+    from projects import get_search_client
+
+    parser = argparse.ArgumentParser(description="Snapshot the Azure AI Search index for the local search backend.")
+    parser.add_argument("output", help="Path of the JSON snapshot to write (use as LOCAL_INDEX_SNAPSHOT)")
+    args = parser.parse_args()
+
+    index = LocalSearchIndex.from_search_client(get_search_client())
+    index.save_snapshot(args.output)
+    print(f"Wrote {len(index)} documents to {args.output}")
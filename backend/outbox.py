@@ -0,0 +1,270 @@
+"""
+### outbox.py ###
+
+Transactional outbox for the review-request emails sent by /api/send_for_review.
+
+The pending project and an outbox record holding the email are written to Cosmos in one
+transactional batch (both live in the project partition), so a review is never stored
+without its email or the other way round, and the request returns as soon as Cosmos has
+acknowledged the write. EmailOutbox's dispatcher, started in the app lifespan, sends
+the queued emails in the background:
+
+    - due records are fetched in batches of batch_size and sent concurrently
+    - each record is claimed with an etag-guarded replace that pushes its next attempt
+      out by lease_seconds, so two workers never send the same record at once, and a
+      worker that dies mid-send only delays the email until the lease runs out
+    - failed sends are retried with exponential backoff and jitter; after max_attempts
+      the record is marked failed and left for an admin (see retry)
+    - records are keyed on a hash of the message, so submitting the same review again
+      while its email is still pending queues a single email; once it has been sent
+      (or has failed), a resubmission queues it again
+    - sent records carry a Cosmos ttl (sent_ttl_seconds) so they do not pile up in the
+      project partition; the container needs TTL enabled (default_ttl -1) for it to apply
+
+Delivery is at-least-once: a send that succeeds just before its worker dies is repeated
+once the lease expires.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from facets import strip_system_properties
+from repository import PROJECT_PARTITION
+
+OUTBOX_TYPE = 'email_outbox'
+PENDING = 'pending'
+SENT = 'sent'
+FAILED = 'failed'
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "10"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "30"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "6"))
+OUTBOX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_BACKOFF_SECONDS", "30"))
+OUTBOX_MAX_BACKOFF_SECONDS = float(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "300"))
+# How long sent records are kept before Cosmos expires them; 0 keeps them forever
+OUTBOX_SENT_TTL_SECONDS = int(os.getenv("OUTBOX_SENT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def message_key(message: Dict[str, Any]) -> str:
+    """Stable hash of an email message, used as its outbox id and dedupe key."""
+    return hashlib.sha256(json.dumps(message, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+
+def build_outbox_record(message: Dict[str, Any]) -> Dict[str, Any]:
+    key = message_key(message)
+    now = _now_iso()
+    return {
+        "id": f"email-{key}",
+        "partitionKey": PROJECT_PARTITION,
+        "type": OUTBOX_TYPE,
+        "dedupe_key": key,
+        "status": PENDING,
+        "subject": message.get("content", {}).get("subject"),
+        "message": message,
+        "attempts": 0,
+        "next_attempt_at": time.time(),
+        "last_error": None,
+        "created_at": now,
+        "updated_at": now,
+        "sent_at": None
+    }
+
+
+def backoff_seconds(attempts: int, base: float = OUTBOX_BACKOFF_SECONDS,
+                    maximum: float = OUTBOX_MAX_BACKOFF_SECONDS) -> float:
+    """Exponential backoff after the given number of attempts, with jitter so retries spread out."""
+    delay = min(maximum, base * (2 ** max(attempts - 1, 0)))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class EmailOutbox:
+    """
+    Cosmos-backed email outbox and its background dispatcher.
+
+    Args:
+        repository: AsyncCosmosRepository the records are stored through.
+        send_message: Blocking function that sends one email message; it runs in a worker
+            thread and signals failure by raising.
+        batch_size: Records fetched and sent per dispatch round.
+        poll_seconds: Idle time between rounds when nothing wakes the dispatcher.
+        max_attempts: Sends tried before a record is marked failed.
+        lease_seconds: How long a claimed record is hidden from other dispatchers.
+        sent_ttl_seconds: Cosmos ttl set on sent records (0 keeps them).
+    """
+
+    def __init__(self, repository, send_message: Callable[[Dict[str, Any]], Any],
+                 batch_size: int = OUTBOX_BATCH_SIZE, poll_seconds: float = OUTBOX_POLL_SECONDS,
+                 max_attempts: int = OUTBOX_MAX_ATTEMPTS, lease_seconds: float = OUTBOX_LEASE_SECONDS,
+                 sent_ttl_seconds: int = OUTBOX_SENT_TTL_SECONDS):
+        self.repository = repository
+        self.send_message = send_message
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.sent_ttl_seconds = sent_ttl_seconds
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.last_dispatch_at: Optional[str] = None
+
+    # ----------------------------
+    # Enqueue
+    # ----------------------------
+
+    async def save_with_email(self, project: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a project together with an email to send about it.
+
+        Returns:
+            dict: The outbox record. When the same message is still pending, that record is
+            returned and only the project is written. A sent or failed record with the
+            same message is replaced by a new pending one, so a resubmission notifies again.
+
+        Raises:
+            RuntimeError: If the write failed; nothing was stored.
+        """
+        record = build_outbox_record(message)
+        existing = await self.repository.read_item(record["id"], PROJECT_PARTITION, name='read_outbox_message')
+        if existing and existing.get("status") == PENDING:
+            self.deduplicated += 1
+            if await self.repository.upsert_project(project) is None:
+                raise RuntimeError("Failed to store the project.")
+            return existing
+
+        if await self.repository.save_project_with_outbox(project, [record]) is None:
+            raise RuntimeError("Failed to store the project and its email.")
+        self.wake()
+        return record
+
+    def wake(self) -> None:
+        """Start a dispatch round now instead of at the next poll."""
+        self._wake.set()
+
+    # ----------------------------
+    # Dispatch
+    # ----------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                fetched = await self.dispatch_once()
+            except Exception as e:
+                print(f"Error dispatching outbox: {e}")
+                fetched = 0
+            # A full batch means more may be due; go again without waiting
+            if fetched >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def dispatch_once(self) -> int:
+        """Claim and send one batch of due records. Returns how many were due."""
+        now = time.time()
+        records, _ = await self.repository.query_page('due_outbox_messages', max_item_count=self.batch_size,
+                                                      type=OUTBOX_TYPE, status=PENDING, now=now)
+        self.last_dispatch_at = _now_iso()
+        claimed = await asyncio.gather(*(self._claim(record, now) for record in records))
+        await asyncio.gather(*(self._deliver(record) for record in claimed if record))
+        return len(records)
+
+    async def _claim(self, record: Dict[str, Any], now: float) -> Optional[Dict[str, Any]]:
+        """Take a lease on a record; None if another dispatcher claimed it first."""
+        etag = record.get('_etag')
+        record = strip_system_properties(record)
+        record["attempts"] = record.get("attempts", 0) + 1
+        record["next_attempt_at"] = now + self.lease_seconds
+        record["updated_at"] = _now_iso()
+        return await self.repository.replace_item_if_match(record, etag, name='claim_outbox_message')
+
+    async def _deliver(self, record: Dict[str, Any]) -> None:
+        record = strip_system_properties(record)
+        try:
+            await asyncio.to_thread(self.send_message, record["message"])
+            record.update(status=SENT, sent_at=_now_iso(), last_error=None)
+            if self.sent_ttl_seconds > 0:
+                record["ttl"] = self.sent_ttl_seconds
+            self.sent += 1
+        except Exception as e:
+            print(f"Error sending outbox email {record['id']} (attempt {record['attempts']}): {e}")
+            record["last_error"] = str(e)
+            if record["attempts"] >= self.max_attempts:
+                record["status"] = FAILED
+                self.failed += 1
+            else:
+                record["next_attempt_at"] = time.time() + backoff_seconds(record["attempts"])
+                self.retried += 1
+        record["updated_at"] = _now_iso()
+        # The lease makes this worker the record's only writer until it expires
+        await self.repository.upsert_item(record, name='complete_outbox_message')
+
+    # ----------------------------
+    # Admin
+    # ----------------------------
+
+    async def retry(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """Requeue a failed record with a fresh attempt budget. None if there is no such failed record."""
+        record = await self.repository.read_item(record_id, PROJECT_PARTITION, name='read_outbox_message')
+        if not record or record.get("type") != OUTBOX_TYPE or record.get("status") != FAILED:
+            return None
+        record = strip_system_properties(record)
+        record.update(status=PENDING, attempts=0, next_attempt_at=time.time(), updated_at=_now_iso())
+        updated = await self.repository.upsert_item(record, name='retry_outbox_message')
+        self.wake()
+        return updated
+
+    async def stats(self) -> Dict[str, Any]:
+        counts = {}
+        for status in (PENDING, SENT, FAILED):
+            result = await self.repository.query('outbox_status_count', type=OUTBOX_TYPE, status=status)
+            counts[status] = result[0] if result else 0
+        oldest = await self.repository.query('oldest_outbox_message', type=OUTBOX_TYPE, status=PENDING)
+        oldest_pending_age = None
+        if oldest and oldest[0]:
+            oldest_pending_age = round(
+                (datetime.now(timezone.utc) - datetime.fromisoformat(oldest[0])).total_seconds(), 1)
+        return {
+            "queue": counts,
+            "oldest_pending_age_seconds": oldest_pending_age,
+            "failed_messages": await self.repository.query('failed_outbox_messages',
+                                                           type=OUTBOX_TYPE, status=FAILED),
+            "dispatcher": {
+                "running": self._task is not None and not self._task.done(),
+                "batch_size": self.batch_size,
+                "sent": self.sent,
+                "retried": self.retried,
+                "failed": self.failed,
+                "deduplicated": self.deduplicated,
+                "last_dispatch_at": self.last_dispatch_at
+            }
+        }
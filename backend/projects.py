@@ -1,13 +1,23 @@
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
-from typing import List, Dict
+from azure.core.exceptions import HttpResponseError
+from typing import List, Dict, Tuple, Optional, Any
 import os
 import hashlib
-from openai import AzureOpenAI
+from openai import AzureOpenAI, AsyncAzureOpenAI
 import json
+import base64
+import threading
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 # Azure Cognitive Search configuration
 from dotenv import load_dotenv
+from cache import EmbeddingCache, SearchResultCache, normalize_text, resolve_cache_path
+from embedding_store import EmbeddingStore
+from ranking import reciprocal_rank_fusion, weighted_score_fusion, sort_by_order_clauses
 
 
 # Load environment variables from .env file
@@ -18,12 +28,35 @@ AI_SEARCH_KEY = os.getenv("AZURE_SEARCH_KEY")
 AI_SEARCH_INDEX = os.getenv("AZURE_SEARCH_INDEX")
 
 
-
-search_client = SearchClient(
-    endpoint=AI_SEARCH_ENDPOINT,
-    index_name=AI_SEARCH_INDEX,
-    credential=AzureKeyCredential(AI_SEARCH_KEY)
-)
+# Outbound clients are created on first use (or by the app's warm-up), not at import time
+_search_client = None
+_aoai_client = None
+_client_lock = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Shared synchronous Search client, created on first use."""
+    global _search_client
+    if _search_client is None:
+        with _client_lock:
+            if _search_client is None:
+                _search_client = SearchClient(
+                    endpoint=AI_SEARCH_ENDPOINT,
+                    index_name=AI_SEARCH_INDEX,
+                    credential=AzureKeyCredential(AI_SEARCH_KEY)
+                )
+    return _search_client
+
+# Search backend: "azure" queries the AI Search service, "local" serves queries from an
+# in-process replica of the index (see local_index.py)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "azure").lower()
+LOCAL_INDEX_SNAPSHOT = os.getenv("LOCAL_INDEX_SNAPSHOT")
+
+# Retrieval mode: "hybrid" sends one hybrid query over description_vector and lets the service
+# fuse it; "multi_vector" sends a keyword query plus one vector query per vector field
+# concurrently and fuses the rankings locally ("rrf" or "weighted" score fusion).
+SEARCH_RETRIEVAL_MODE = os.getenv("SEARCH_RETRIEVAL_MODE", "hybrid").lower()
+SEARCH_FUSION_METHOD = os.getenv("SEARCH_FUSION_METHOD", "rrf").lower()
 
 # Azure OpenAI configuration
 AOAI_KEY = os.getenv("AOAI_KEY")
@@ -32,131 +65,797 @@ AOAI_DEPLOYMENT = os.getenv("AOAI_DEPLOYMENT")
 
 
 
-aoai_client = AzureOpenAI(
-    azure_endpoint=AOAI_ENDPOINT,
-    api_key=AOAI_KEY,
-    api_version="2023-05-15"
+def get_aoai_client() -> AzureOpenAI:
+    """Shared synchronous Azure OpenAI client, created on first use."""
+    global _aoai_client
+    if _aoai_client is None:
+        with _client_lock:
+            if _aoai_client is None:
+                _aoai_client = AzureOpenAI(
+                    azure_endpoint=AOAI_ENDPOINT,
+                    api_key=AOAI_KEY,
+                    api_version="2023-05-15"
+                )
+    return _aoai_client
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+
+# Query embedding cache: memory LRU with TTL, optionally backed by a SQLite file
+query_embedding_cache = EmbeddingCache(
+    maxsize=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+    ttl_seconds=float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(24 * 3600))),
+    db_path=resolve_cache_path(os.getenv("EMBEDDING_CACHE_PATH"))
 )
 
-def generate_embeddings(text, model="text-embedding-ada-002"):  # model = "deployment_name"
-    return aoai_client.embeddings.create(input=[text], model=model).data[0].embedding
+# Search result cache, invalidated whenever the catalog changes (see invalidate_search_cache)
+search_result_cache = SearchResultCache(
+    maxsize=int(os.getenv("SEARCH_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+)
 
+def invalidate_search_cache() -> None:
+    """Drop all cached search results. Call after any change to approved projects or tags."""
+    search_result_cache.invalidate()
 
-def build_filter_string(filters: Dict) -> str:
+def generate_embeddings(text, model=EMBEDDING_MODEL):  # model = "deployment_name"
+    return get_aoai_client().embeddings.create(input=[text], model=model).data[0].embedding
+
+
+# Inputs per embeddings request; the API accepts a list and returns one vector per input
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+
+# Persistent store of document text embeddings keyed by (model, sha256(text)); set the
+# path to an empty string to disable it. Relative paths are resolved against CACHE_DIR, so
+# the app and the scripts share one store whatever directory they are run from.
+EMBEDDING_STORE_PATH = resolve_cache_path(os.getenv("EMBEDDING_STORE_PATH", "document_embeddings.sqlite"))
+_embedding_store: Optional[EmbeddingStore] = None
+
+
+def get_embedding_store() -> Optional[EmbeddingStore]:
+    """Shared document embedding store, opened on first use; None if it is disabled."""
+    global _embedding_store
+    if _embedding_store is None and EMBEDDING_STORE_PATH:
+        with _client_lock:
+            if _embedding_store is None:
+                _embedding_store = EmbeddingStore(EMBEDDING_STORE_PATH)
+    return _embedding_store
+
+
+def generate_embeddings_batch(texts: List[str], model: str = EMBEDDING_MODEL,
+                              batch_size: int = EMBEDDING_BATCH_SIZE) -> List[Optional[List[float]]]:
     """
-    Build a filter string for Azure Cognitive Search from a dictionary of filters.
-    For array fields, ensures ALL selected values must be present in the results.
-    
+    Embed many texts with one request per batch_size distinct inputs.
+
+    Empty (or whitespace-only) texts are not sent and get None; identical texts are
+    embedded once and share the vector. Texts already in the embedding store are served
+    from it, and new vectors are added to it, so unchanged text is never re-embedded.
+
+    Returns:
+        List[Optional[List[float]]]: One vector (or None) per input text, in input order.
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text and text.strip()))
+    embedded = {}
+    embedding_store = get_embedding_store()
+    if embedding_store is not None and unique_texts:
+        stored = embedding_store.get_many(model, unique_texts)
+        embedded = {text: vector for text, vector in zip(unique_texts, stored) if vector is not None}
+        unique_texts = [text for text in unique_texts if text not in embedded]
+    for start in range(0, len(unique_texts), batch_size):
+        batch = unique_texts[start:start + batch_size]
+        response = get_aoai_client().embeddings.create(input=batch, model=model)
+        computed = [(batch[item.index], item.embedding) for item in response.data]
+        embedded.update(computed)
+        if embedding_store is not None:
+            embedding_store.put_many(model, computed)
+    return [embedded.get(text) for text in texts]
+
+
+def get_query_embedding(query: str, model: str = EMBEDDING_MODEL) -> List[float]:
+    """Return the embedding for a search query, served from the query embedding cache when possible."""
+    return query_embedding_cache.get_or_compute(query, model, generate_embeddings)
+
+
+# Mapping of filter keys to Azure Search field names
+FILTER_FIELD_MAPPING = {
+    'programmingLanguages': 'programming_languages',
+    'frameworks': 'frameworks',
+    'azureServices': 'azure_services',
+    'designPatterns': 'design_patterns',
+    'industries': 'industries',
+    'projectTypes': 'project_type',
+    'codeComplexities': 'code_complexity',
+    'customers': 'customers'
+}
+
+# Filterable fields that hold a single value rather than a collection
+SINGLE_VALUE_FILTER_FIELDS = ['project_type', 'code_complexity']
+
+
+def build_filter_conditions(filters: Dict) -> List[Tuple[str, str, str]]:
+    """
+    Translate a dictionary of filters into a list of (operator, field, value) conditions.
+
+    The operator is 'eq' for single-value equality or 'any' for "collection contains value".
+    All conditions must hold. This is the single source of filter semantics for both the
+    OData filter string and the local search backend.
+
     Args:
         filters (Dict): Dictionary of filter key-value pairs
-    
+
     Returns:
-        str: Complete filter string for Azure Search
+        List[Tuple[str, str, str]]: Conditions combined with AND
     """
-    filter_conditions = []
-    
-    # Mapping of filter keys to Azure Search field names
-    field_mapping = {
-        'programmingLanguages': 'programming_languages',
-        'frameworks': 'frameworks',
-        'azureServices': 'azure_services',
-        'designPatterns': 'design_patterns',
-        'industries': 'industries',
-        'projectTypes': 'project_type',
-        'codeComplexities': 'code_complexity',
-        'customers': 'customers'
-    }
-    
-    for filter_key, values in filters.items():
+    conditions = []
+
+    for filter_key, values in (filters or {}).items():
         # Skip empty arrays or None values
         if not values:
             continue
-            
-        field_name = field_mapping.get(filter_key)
+
+        field_name = FILTER_FIELD_MAPPING.get(filter_key)
         if not field_name:
             continue
-            
+
         if isinstance(values, list):
-            if field_name in ['project_type', 'code_complexity']:
+            if field_name in SINGLE_VALUE_FILTER_FIELDS:
                 # For non-array fields, use simple equality
-                if values:
-                    filter_conditions.append(f"{field_name} eq '{values[0]}'")
+                conditions.append(('eq', field_name, values[0]))
             else:
                 # For array fields, create separate any() condition for each value
                 # This ensures ALL values must be present
                 for value in values:
-                    filter_conditions.append(f"{field_name}/any(item: item eq '{value}')")
+                    conditions.append(('any', field_name, value))
         else:
             # Handle non-array values
-            filter_conditions.append(f"{field_name} eq '{values}'")
+            conditions.append(('eq', field_name, values))
+
+    return conditions
+
+
+def build_filter_string(filters: Dict) -> str:
+    """
+    Build a filter string for Azure Cognitive Search from a dictionary of filters.
+    For array fields, ensures ALL selected values must be present in the results.
+    
+    Args:
+        filters (Dict): Dictionary of filter key-value pairs
+    
+    Returns:
+        str: Complete filter string for Azure Search
+    """
+    filter_conditions = []
+
+    for operator, field_name, value in build_filter_conditions(filters):
+        if operator == 'any':
+            filter_conditions.append(f"{field_name}/any(item: item eq '{value}')")
+        else:
+            filter_conditions.append(f"{field_name} eq '{value}'")
     
     # Combine all conditions with AND operator
     return " and ".join(filter_conditions) if filter_conditions else None
 
-def search_projects(query: str, filters: Dict, sort: str) -> List[Dict]:
+SEARCH_SELECT_FIELDS = ["id", "project_name", "project_description", "github_url", "owner",
+                        "programming_languages", "frameworks", "azure_services",
+                        "design_patterns", "project_type", "code_complexity", "industries", "customers",
+                        "business_value", "target_audience"]
+
+# Sortable rank for code_complexity, whose labels do not sort alphabetically
+CODE_COMPLEXITY_RANK = {'Beginner': 1, 'Intermediate': 2, 'Advanced': 3}
+
+# Sort modes accepted in FilterOptions.sort, as $orderby clauses on the sortable index fields.
+# Relevance (the default) leaves ordering to the search engine's scores.
+SORT_ORDER_BY = {
+    'relevance': None,
+    'name': ['project_name_sort asc'],
+    'complexity': ['code_complexity_rank asc', 'project_name_sort asc'],
+    'complexity_desc': ['code_complexity_rank desc', 'project_name_sort asc'],
+    'recent': ['approved_at desc', 'project_name_sort asc']
+}
+
+
+def resolve_sort(sort: Optional[str]) -> Optional[List[str]]:
+    """
+    Translate a sort mode into $orderby clauses.
+
+    Raises:
+        ValueError: If the sort mode is not one of SORT_ORDER_BY.
+    """
+    mode = (sort or 'relevance').strip().lower()
+    if mode not in SORT_ORDER_BY:
+        raise ValueError(f"Unsupported sort mode: {sort}")
+    return SORT_ORDER_BY[mode]
+
+
+def select_fields(order_by: Optional[List[str]] = None) -> List[str]:
+    """
+    $select for a query: SEARCH_SELECT_FIELDS, plus the sort fields when results are sorted
+    locally (multi-vector fusion). Sort fields are not selected otherwise, so relevance
+    queries keep working against an index created before the sort fields were added.
+    """
+    sort_fields = [clause.split()[0] for clause in order_by or []]
+    return SEARCH_SELECT_FIELDS + [field for field in sort_fields if field not in SEARCH_SELECT_FIELDS]
+
+
+SEARCH_VECTOR_FIELDS = ["description_vector", "business_value_vector", "target_audience_vector"]
+
+DEFAULT_FUSION_WEIGHTS = {
+    "keyword": 1.0,
+    "description_vector": 1.0,
+    "business_value_vector": 0.5,
+    "target_audience_vector": 0.5
+}
+
+
+def parse_fusion_weights(value: str) -> Dict[str, float]:
+    """Parse "keyword=1,description_vector=1,..." into a weight per retriever, over the defaults."""
+    weights = dict(DEFAULT_FUSION_WEIGHTS)
+    for pair in (value or "").split(","):
+        if "=" in pair:
+            name, weight = pair.split("=", 1)
+            weights[name.strip()] = float(weight)
+    return weights
+
+
+SEARCH_FUSION_WEIGHTS = parse_fusion_weights(os.getenv("SEARCH_FUSION_WEIGHTS", ""))
+
+
+# ----------------------------
+# Pagination
+# ----------------------------
+
+DEFAULT_PAGE_SIZE = 8
+MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "50"))
+# Deepest result position a cursor may reach
+MAX_SEARCH_OFFSET = int(os.getenv("SEARCH_MAX_OFFSET", "1000"))
+# Vector k (and per-retriever depth in multi-vector mode) as a multiple of the page size.
+# It is fixed for every page of a search so the fused ranking, and therefore the page
+# boundaries, do not shift as the user pages deeper.
+SEARCH_DEPTH_PAGES = int(os.getenv("SEARCH_DEPTH_PAGES", "5"))
+
+
+def query_fingerprint(query: str, filters: Dict, sort: str) -> str:
+    """Short hash identifying a (query, filters, sort) combination, used to bind cursors to it."""
+    canonical = json.dumps([normalize_text(query) or "*", SearchResultCache.canonical_filters(filters), sort or ""])
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(offset: int, page_size: int, fingerprint: str) -> str:
+    payload = json.dumps({"o": offset, "n": page_size, "f": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def clamp_page_size(page_size: Optional[int]) -> int:
+    return max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def decode_cursor(cursor: Optional[str], page_size: Optional[int], fingerprint: str) -> Tuple[int, int]:
+    """
+    Return the (offset, page size) for a request.
+
+    Without a cursor this is the first page at the requested size. A cursor carries the page
+    size it was issued with so that later pages stay aligned with the first one.
+
+    Raises:
+        ValueError: If the cursor is malformed, out of range or was issued for a different search.
+    """
+    if not cursor:
+        return 0, clamp_page_size(page_size)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["o"])
+        cursor_page_size = int(payload["n"])
+        issued_for = payload["f"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if issued_for != fingerprint:
+        raise ValueError("Cursor does not belong to this search")
+    if offset < 0 or offset > MAX_SEARCH_OFFSET:
+        raise ValueError("Cursor is out of range")
+    return offset, clamp_page_size(cursor_page_size)
+
+
+def retrieval_depth(page_size: int) -> int:
+    """Vector k / per-retriever depth for every page of a search with this page size."""
+    return min(page_size * SEARCH_DEPTH_PAGES, MAX_SEARCH_OFFSET + page_size)
+
+
+def build_page(results: List[Dict], total_count: Optional[int], offset: int, page_size: int,
+               fingerprint: str) -> Dict[str, Any]:
+    """Assemble a page of formatted results with the cursor for the next page, if any."""
+    next_offset = offset + page_size
+    has_more = len(results) == page_size and next_offset <= MAX_SEARCH_OFFSET
+    if total_count is not None:
+        has_more = has_more and next_offset < total_count
+    return {
+        "results": [format_search_result(result) for result in results],
+        "nextCursor": encode_cursor(next_offset, page_size, fingerprint) if has_more else None,
+        "totalCount": total_count
+    }
+
+
+def build_search_request(query: str, query_vector: List[float], filters: Dict, offset: int = 0,
+                         page_size: int = DEFAULT_PAGE_SIZE, include_total_count: bool = False,
+                         order_by: Optional[List[str]] = None) -> Dict:
+    """
+    Build the keyword arguments for a hybrid search call.
+
+    Shared by the sync and async search paths so both issue exactly the same query.
+    k for the vector query scales with the page size (see retrieval_depth).
+    """
+    # Create vector query
+    vector_query = VectorizedQuery(
+        vector=query_vector,
+        k_nearest_neighbors=retrieval_depth(page_size),
+        fields="description_vector"
+    )
+
+    return {
+        "search_text": query,
+        "vector_queries": [vector_query],
+        "filter": build_filter_string(filters),  # Add the dynamic filter string here
+        "select": SEARCH_SELECT_FIELDS,
+        "order_by": order_by,
+        "top": page_size,
+        "skip": offset,
+        "include_total_count": include_total_count
+    }
+
+
+def format_search_result(result: Dict) -> Dict:
+    """Convert a search document (snake_case) into the camelCase project shape used by the frontend."""
+    return {
+        "id": result["id"],
+        "projectName": result.get("project_name", ""),
+        "projectDescription": result.get("project_description", ""),
+        "githubUrl": result.get("github_url", ""),
+        "owner": result.get("owner", ""),
+        "programmingLanguages": result.get("programming_languages", []),
+        "frameworks": result.get("frameworks", []),
+        "azureServices": result.get("azure_services", []),
+        "designPatterns": result.get("design_patterns", []),
+        "projectType": result.get("project_type", ""),
+        "codeComplexity": result.get("code_complexity", ""),
+        "industries": result.get("industries", []),
+        "customers": result.get("customers", []),
+        "businessValue": result.get("business_value", ""),
+        "targetAudience": result.get("target_audience", "")
+    }
+
+
+_local_index = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index():
+    """
+    Return the in-process search index, loading it on first use.
+
+    Loads from LOCAL_INDEX_SNAPSHOT when that file exists (no service needed), otherwise
+    pulls every document from the AI Search index.
+    """
+    global _local_index
+    if _local_index is None:
+        with _local_index_lock:
+            if _local_index is None:
+                # numpy is only required when the local backend is enabled
+                from local_index import LocalSearchIndex
+                if LOCAL_INDEX_SNAPSHOT and os.path.exists(LOCAL_INDEX_SNAPSHOT):
+                    print(f"Loading local search index from {LOCAL_INDEX_SNAPSHOT}...")
+                    _local_index = LocalSearchIndex.load_snapshot(LOCAL_INDEX_SNAPSHOT)
+                else:
+                    print("Loading local search index from Azure AI Search...")
+                    _local_index = LocalSearchIndex.from_search_client(get_search_client())
+                print(f"Local search index loaded with {len(_local_index)} documents.")
+    return _local_index
+
+
+def search_local(request: Dict, filters: Dict) -> Tuple[List[Dict], Optional[int]]:
+    """Run a search request built for the service against the in-process index."""
+    return get_local_index().search(
+        search_text=request.get("search_text"),
+        vector_queries=request.get("vector_queries", []),
+        conditions=build_filter_conditions(filters),
+        select=request["select"],
+        order_by=request.get("order_by"),
+        top=request["top"],
+        skip=request.get("skip", 0),
+        include_total_count=request.get("include_total_count", False)
+    )
+
+
+# ----------------------------
+# Multi-vector retrieval
+# ----------------------------
+
+# Shared pool for issuing the per-retriever queries of the sync path concurrently
+_retrieval_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SEARCH_RETRIEVAL_WORKERS", "8")),
+    thread_name_prefix="search-retrieval"
+)
+
+
+def build_retrieval_requests(query: str, query_vector: List[float], filters: Dict,
+                             depth: int = DEFAULT_PAGE_SIZE,
+                             order_by: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Build one request per retriever for multi-vector mode: a keyword query plus a pure vector
+    query for each vector field, all reusing the same query embedding and filter.
+
+    Each retriever returns its best `depth` results; pages are cut from the fused list of
+    these candidates. The keyword retriever is skipped for the match-all query ("*"), where
+    it carries no signal.
+    """
+    filter_string = build_filter_string(filters)
+    select = select_fields(order_by)
+    top = depth
+    requests = {}
+    if query != "*":
+        requests["keyword"] = {
+            "search_text": query,
+            "filter": filter_string,
+            "select": select,
+            "top": top
+        }
+    for field in SEARCH_VECTOR_FIELDS:
+        requests[field] = {
+            "search_text": None,
+            "vector_queries": [VectorizedQuery(vector=query_vector, k_nearest_neighbors=top, fields=field)],
+            "filter": filter_string,
+            "select": select,
+            "top": top
+        }
+    return requests
+
+
+def fuse_retrievals(retrievals: Dict[str, List[Dict]]) -> List[Dict]:
+    """Fuse per-retriever result lists into one ranking using SEARCH_FUSION_METHOD and weights."""
+    documents = {}
+    scored_lists = []
+    weights = []
+    for name, results in retrievals.items():
+        scored = []
+        for result in results:
+            documents.setdefault(result["id"], result)
+            scored.append((result["id"], result.get("@search.score") or 0.0))
+        scored_lists.append(scored)
+        weights.append(SEARCH_FUSION_WEIGHTS.get(name, 1.0))
+
+    if SEARCH_FUSION_METHOD == "weighted":
+        fused = weighted_score_fusion(scored_lists, weights)
+    else:
+        fused = reciprocal_rank_fusion([[item_id for item_id, _ in scored] for scored in scored_lists], weights)
+
+    return [documents[item_id] for item_id, _ in fused]
+
+
+def run_search_request(request: Dict, filters: Dict) -> Tuple[List[Dict], Optional[int]]:
+    """Execute one search request; returns the results and the total count when it was requested."""
+    if SEARCH_BACKEND == "local":
+        return search_local(request, filters)
+    results = get_search_client().search(**request)
+    documents = list(results)
+    return documents, results.get_count() if request.get("include_total_count") else None
+
+
+def search_multi_vector(query: str, query_vector: List[float], filters: Dict, offset: int,
+                        page_size: int, include_total_count: bool,
+                        order_by: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Issue the keyword and per-field vector queries concurrently and fuse them locally.
+
+    A sort mode reorders the fused candidate set. The total count, when requested, is the
+    size of that set, which is exactly the number of results reachable by paging.
+    """
+    requests = build_retrieval_requests(query, query_vector, filters, depth=retrieval_depth(page_size),
+                                        order_by=order_by)
+    futures = {
+        name: _retrieval_executor.submit(run_search_request, request, filters)
+        for name, request in requests.items()
+    }
+    fused = sort_by_order_clauses(fuse_retrievals({name: future.result()[0] for name, future in futures.items()}),
+                                  order_by)
+    return fused[offset:offset + page_size], len(fused) if include_total_count else None
+
+
+def search_projects_page(query: str, filters: Dict, sort: str, page_size: int = DEFAULT_PAGE_SIZE,
+                         cursor: Optional[str] = None, include_total_count: bool = False) -> Dict[str, Any]:
+    """
+    Return one page of search results.
+
+    Args:
+        query (str): Free-text query; empty means match all.
+        filters (Dict): Filter key-value pairs (see build_filter_string).
+        sort (str): Sort mode, one of SORT_ORDER_BY ('' means relevance).
+        page_size (int): Results per page, clamped to MAX_PAGE_SIZE. Ignored when a cursor
+            is given; the cursor keeps the page size of the first page.
+        cursor (str): Opaque cursor from a previous page's nextCursor; None for the first page.
+        include_total_count (bool): Also compute the total number of matches (costs extra work).
+
+    Returns:
+        Dict: {"results": [...], "nextCursor": str or None, "totalCount": int or None}
+
+    Raises:
+        ValueError: If the sort mode is unknown, or the cursor is invalid or was issued for a
+            different search.
+        HttpResponseError: If the search service rejected the query.
+    """
+    order_by = resolve_sort(sort)
+    fingerprint = query_fingerprint(query, filters, sort)
+    offset, page_size = decode_cursor(cursor, page_size, fingerprint)
     try:
+        cache_key = search_result_cache.key(query, filters, sort, offset, page_size, include_total_count)
+        cached = search_result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Generate embeddings for the search query
         if query == "" or query is None:
             query = "*"
 
-        query_vector = generate_embeddings(query)
-        
-        # Create vector query
-        vector_query = VectorizedQuery(
-            vector=query_vector,
-            k_nearest_neighbors=3,
-            fields="description_vector"
+        query_vector = get_query_embedding(query)
+
+        if SEARCH_RETRIEVAL_MODE == "multi_vector":
+            results, total_count = search_multi_vector(query, query_vector, filters, offset, page_size,
+                                                       include_total_count, order_by)
+        else:
+            request = build_search_request(query, query_vector, filters, offset, page_size, include_total_count,
+                                           order_by)
+            results, total_count = run_search_request(request, filters)
+
+        # Convert results to list of dictionaries
+        page = build_page(results, total_count, offset, page_size, fingerprint)
+        search_result_cache.set(cache_key, page)
+        return page
+
+    except HttpResponseError:
+        # The search service rejected the query (e.g. a field the index does not have yet);
+        # raise rather than report "no results"
+        raise
+    except Exception as e:
+        print(f"Search error: {str(e)}")
+        return {"results": [], "nextCursor": None, "totalCount": None}
+
+
+def search_projects(query: str, filters: Dict, sort: str) -> List[Dict]:
+    """Return the first page of results for a search."""
+    return search_projects_page(query, filters, sort)["results"]
+
+
+# ----------------------------
+# Async search path
+# ----------------------------
+# The async clients are shared across requests. They are created by init_async_clients()
+# from the FastAPI lifespan and closed by close_async_clients() on shutdown.
+
+async_search_client = None
+async_aoai_client = None
+
+
+def init_async_clients() -> None:
+    """Create the shared aio Search and Azure OpenAI clients used by search_projects_async."""
+    global async_search_client, async_aoai_client
+    if async_search_client is None:
+        async_search_client = AsyncSearchClient(
+            endpoint=AI_SEARCH_ENDPOINT,
+            index_name=AI_SEARCH_INDEX,
+            credential=AzureKeyCredential(AI_SEARCH_KEY)
         )
-        
-        # Build the filter string
-        filter_string = build_filter_string(filters)
-        
-        # Use the filter string in the search
-        results = search_client.search(
-            search_text=query,
-            vector_queries=[vector_query],
-            filter=filter_string,  # Add the dynamic filter string here
-            select=["id", "project_name", "project_description", "github_url", "owner",
-                    "programming_languages", "frameworks", "azure_services",
-                    "design_patterns", "project_type", "code_complexity", "industries", "customers",
-                    "business_value", "target_audience"],
-            top=8
+    if async_aoai_client is None:
+        async_aoai_client = AsyncAzureOpenAI(
+            azure_endpoint=AOAI_ENDPOINT,
+            api_key=AOAI_KEY,
+            api_version="2023-05-15"
         )
 
-        # Convert results to list of dictionaries
-        projects = []
-        for result in results:
-            project = {
-                "id": result["id"],
-                "projectName": result.get("project_name", ""),  # Convert snake_case to camelCase for frontend
-                "projectDescription": result.get("project_description", ""),
-                "githubUrl": result.get("github_url", ""),  # Convert snake_case to camelCase for frontend
-                "owner": result.get("owner", ""),
-                "programmingLanguages": result.get("programming_languages", []),
-                "frameworks": result.get("frameworks", []),
-                "azureServices": result.get("azure_services", []),
-                "designPatterns": result.get("design_patterns", []),
-                "projectType": result.get("project_type", ""),
-                "codeComplexity": result.get("code_complexity", ""),
-                "industries": result.get("industries", []),
-                "customers": result.get("customers", []),
-                "businessValue": result.get("business_value", ""),
-                "targetAudience": result.get("target_audience", "")
-            }
-            projects.append(project)
-
-        return projects
 
+async def close_async_clients() -> None:
+    """Close the shared async clients and release their connection pools."""
+    global async_search_client, async_aoai_client
+    if async_search_client is not None:
+        await async_search_client.close()
+        async_search_client = None
+    if async_aoai_client is not None:
+        await async_aoai_client.close()
+        async_aoai_client = None
+
+
+def close_sync_clients() -> None:
+    """Close the shared synchronous clients and the embedding store, if they were ever created."""
+    global _search_client, _aoai_client, _embedding_store
+    if _search_client is not None:
+        _search_client.close()
+        _search_client = None
+    if _aoai_client is not None:
+        _aoai_client.close()
+        _aoai_client = None
+    if _embedding_store is not None:
+        _embedding_store.close()
+        _embedding_store = None
+
+
+async def generate_embeddings_async(text, model=EMBEDDING_MODEL):
+    response = await async_aoai_client.embeddings.create(input=[text], model=model)
+    return response.data[0].embedding
+
+
+async def get_query_embedding_async(query: str, model: str = EMBEDDING_MODEL) -> List[float]:
+    """Async counterpart of get_query_embedding; only awaits the network call on a cache miss."""
+    query_vector = query_embedding_cache.get(query, model)
+    if query_vector is None:
+        query_vector = await generate_embeddings_async(query, model)
+        query_embedding_cache.set(query, model, query_vector)
+    return query_vector
+
+
+async def run_search_request_async(request: Dict, filters: Dict) -> Tuple[List[Dict], Optional[int]]:
+    if SEARCH_BACKEND == "local":
+        return search_local(request, filters)
+    results = await async_search_client.search(**request)
+    documents = [result async for result in results]
+    return documents, await results.get_count() if request.get("include_total_count") else None
+
+
+async def search_multi_vector_async(query: str, query_vector: List[float], filters: Dict, offset: int,
+                                    page_size: int, include_total_count: bool,
+                                    order_by: Optional[List[str]] = None) -> Tuple[List[Dict], Optional[int]]:
+    """Async counterpart of search_multi_vector; the retriever queries overlap on the event loop."""
+    requests = build_retrieval_requests(query, query_vector, filters, depth=retrieval_depth(page_size),
+                                        order_by=order_by)
+    responses = await asyncio.gather(*(run_search_request_async(request, filters) for request in requests.values()))
+    fused = sort_by_order_clauses(fuse_retrievals({name: response[0] for name, response in zip(requests.keys(), responses)}),
+                                  order_by)
+    return fused[offset:offset + page_size], len(fused) if include_total_count else None
+
+
+async def search_projects_page_async(query: str, filters: Dict, sort: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                     cursor: Optional[str] = None, include_total_count: bool = False,
+                                     timings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Non-blocking version of search_projects_page.
+
+    Uses the shared aio clients so the embedding and search round trips yield to the
+    event loop, letting concurrent searches overlap inside a single worker. If a timings
+    dict is passed, it is filled with "cache" ("hit" or "miss") and the embedding_ms and
+    search_ms stage latencies.
+    """
+    timings = timings if timings is not None else {}
+    order_by = resolve_sort(sort)
+    fingerprint = query_fingerprint(query, filters, sort)
+    offset, page_size = decode_cursor(cursor, page_size, fingerprint)
+    try:
+        cache_key = search_result_cache.key(query, filters, sort, offset, page_size, include_total_count)
+        cached = search_result_cache.get(cache_key)
+        if cached is not None:
+            timings["cache"] = "hit"
+            return cached
+        timings["cache"] = "miss"
+
+        if async_search_client is None or async_aoai_client is None:
+            init_async_clients()
+
+        if query == "" or query is None:
+            query = "*"
+
+        stage_start = time.perf_counter()
+        query_vector = await get_query_embedding_async(query)
+        timings["embedding_ms"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        if SEARCH_RETRIEVAL_MODE == "multi_vector":
+            results, total_count = await search_multi_vector_async(query, query_vector, filters, offset,
+                                                                   page_size, include_total_count, order_by)
+        else:
+            request = build_search_request(query, query_vector, filters, offset, page_size, include_total_count,
+                                           order_by)
+            results, total_count = await run_search_request_async(request, filters)
+        timings["search_ms"] = (time.perf_counter() - stage_start) * 1000
+
+        page = build_page(results, total_count, offset, page_size, fingerprint)
+        search_result_cache.set(cache_key, page)
+        return page
+
+    except HttpResponseError:
+        # The search service rejected the query (e.g. a field the index does not have yet);
+        # raise rather than report "no results"
+        raise
     except Exception as e:
         print(f"Search error: {str(e)}")
-        return []
-    
+        return {"results": [], "nextCursor": None, "totalCount": None}
+
+
+async def search_projects_async(query: str, filters: Dict, sort: str) -> List[Dict]:
+    """Return the first page of results for a search without blocking the event loop."""
+    return (await search_projects_page_async(query, filters, sort))["results"]
+
+
 def generate_document_id(github_url: str) -> str:
     """Generate a unique, deterministic ID for a document."""
     unique_string = f"{github_url}"  # Use the GitHub URL for uniqueness
     return hashlib.md5(unique_string.encode()).hexdigest()
 
 
+# Search vector field -> search document text field it embeds
+EMBEDDING_SOURCE_FIELDS = {
+    "description_vector": "project_description",
+    "business_value_vector": "business_value",
+    "target_audience_vector": "target_audience"
+}
+
+
+def build_search_document(data: Dict) -> Dict:
+    """
+    Map a Cosmos project (camelCase) to a search index document, without vectors.
+
+    Args:
+        data (Dict): Project data, including 'owner'.
+
+    Returns:
+        Dict: Search document.
+    """
+    document = {
+        "id": generate_document_id(data.get('githubUrl', '')),
+        "project_name": data.get('projectName', ''),
+        "project_description": data.get('projectDescription', ''),
+        "github_url": data.get('githubUrl', ''),
+        "owner": data.get('owner', 'anonymous'),  # Extract owner from data
+        "code_complexity": data.get('codeComplexity', 'Intermediate'),
+        "programming_languages": data.get('programmingLanguages', []),
+        "frameworks": data.get('frameworks', []),
+        "azure_services": data.get('azureServices', []),
+        "design_patterns": data.get('designPatterns', []),
+        "project_type": data.get('projectType', ''),
+        "business_value": data.get('businessValue', ''),
+        "target_audience": data.get('targetAudience', ''),
+        "industries": data.get('industries', []),
+        "customers": data.get('customers', []),
+        "approved_at": data.get('approved_at')
+    }
+    # Sort keys: case-insensitive name and a numeric complexity rank
+    document["project_name_sort"] = document["project_name"].strip().lower()
+    document["code_complexity_rank"] = CODE_COMPLEXITY_RANK.get(document["code_complexity"])
+    return document
+
+
+# Non-vector search document fields that are not embedded; changes to these alone can be
+# applied with a merge action, without re-embedding
+SEARCH_METADATA_FIELDS = ["project_name", "github_url", "owner", "code_complexity", "programming_languages",
+                          "frameworks", "azure_services", "design_patterns", "project_type", "industries",
+                          "customers", "approved_at", "project_name_sort", "code_complexity_rank"]
+
+
+def _fingerprint(values: Dict) -> str:
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def document_fingerprints(document: Dict) -> Tuple[str, str]:
+    """
+    Fingerprint a search document for change detection.
+
+    Returns:
+        Tuple[str, str]: (content, metadata) fingerprints. The content fingerprint covers
+        the embedded text fields, the metadata fingerprint everything else except vectors.
+    """
+    content = {field: document.get(field) or "" for field in EMBEDDING_SOURCE_FIELDS.values()}
+    metadata = {field: document.get(field) for field in SEARCH_METADATA_FIELDS}
+    return _fingerprint(content), _fingerprint(metadata)
+
+
+def embed_search_documents(documents: List[Dict], model: str = EMBEDDING_MODEL) -> List[Dict]:
+    """
+    Fill in the vector fields of search documents using batched embedding requests.
+
+    A single document costs one embeddings request for all of its fields. A field with no
+    text gets a null vector.
+    """
+    texts = [document[text_field] for document in documents for text_field in EMBEDDING_SOURCE_FIELDS.values()]
+    vectors = iter(generate_embeddings_batch(texts, model))
+    for document in documents:
+        for vector_field in EMBEDDING_SOURCE_FIELDS:
+            document[vector_field] = next(vectors)
+    return documents
+
+
 def add_project(data: Dict) -> Dict:
     """
     Add a new project to Azure Cognitive Search.
@@ -169,41 +868,22 @@ def add_project(data: Dict) -> Dict:
     """
     try:
         # Create the new project document
-        new_project = {
-            "id": generate_document_id(data.get('githubUrl', '')),
-            "project_name": data.get('projectName', ''),
-            "project_description": data.get('projectDescription', ''),
-            "github_url": data.get('githubUrl', ''),
-            "owner": data.get('owner', 'anonymous'),  # Extract owner from data
-            "code_complexity": data.get('codeComplexity', 'Intermediate'),
-            "programming_languages": data.get('programmingLanguages', []),
-            "frameworks": data.get('frameworks', []),
-            "azure_services": data.get('azureServices', []),
-            "design_patterns": data.get('designPatterns', []),
-            "project_type": data.get('projectType', ''),
-            "business_value": data.get('businessValue', ''),
-            "target_audience": data.get('targetAudience', ''),
-            "industries": data.get('industries', []),
-            "customers": data.get('customers', [])
-        }
+        new_project = build_search_document(data)
 
         print(json.dumps(new_project, indent=2))
 
-        description_embeddings = generate_embeddings(new_project["project_description"])
-        business_value_embeddings = generate_embeddings(new_project["business_value"])
-        target_audience_embeddings = generate_embeddings(new_project["target_audience"])
-
-        new_project["description_vector"] = description_embeddings
-        new_project["business_value_vector"] = business_value_embeddings
-        new_project["target_audience_vector"] = target_audience_embeddings
-
-        
+        # One embeddings request for all three vector fields
+        embed_search_documents([new_project])
 
         # Index the new project in Azure Cognitive Search
         print("Uploading document...")
-        search_client.upload_documents(documents=[new_project])
+        get_search_client().upload_documents(documents=[new_project])
         print("Document uploaded successfully.")
 
+        # Keep the in-process replica in step with the service
+        if _local_index is not None:
+            _local_index.upsert(new_project)
+
         return {"success": True, "project": new_project}
 
     except Exception as e:
@@ -212,6 +892,30 @@ def add_project(data: Dict) -> Dict:
 
 
 
+def remove_project(document_id: str) -> Dict:
+    """
+    Remove a project from Azure Cognitive Search.
+
+    Args:
+        document_id (str): Search document id (see generate_document_id).
+
+    Returns:
+        Dict: Result of the operation.
+    """
+    try:
+        get_search_client().delete_documents(documents=[{"id": document_id}])
+        print(f"Removed document {document_id} from the search index.")
+
+        if _local_index is not None:
+            _local_index.delete(document_id)
+
+        return {"success": True}
+
+    except Exception as e:
+        print(f"Error removing project: {e}")
+        return {"success": False, "error": str(e)}
+
+
 if __name__ == '__main__':
 
     new_project = {
@@ -242,13 +946,7 @@ if __name__ == '__main__':
     }
 
 
-    description_embeddings = generate_embeddings(new_project["project_description"])
-    business_value_embeddings = generate_embeddings(new_project["business_value"])
-    target_audience_embeddings = generate_embeddings(new_project["target_audience"])
-
-    new_project["description_vector"] = description_embeddings
-    new_project["business_value_vector"] = business_value_embeddings
-    new_project["target_audience_vector"] = target_audience_embeddings
+    embed_search_documents([new_project])
 
 
     #write new_project to output file
@@ -257,5 +955,5 @@ if __name__ == '__main__':
 
 
     print("Uploading document...")
-    search_client.upload_documents(documents=[new_project])
+    get_search_client().upload_documents(documents=[new_project])
     print("Document uploaded successfully.")
@@ -0,0 +1,147 @@
+"""
+### query_log.py ###
+
+Sampled, structured capture of /api/search_projects requests.
+
+Each sampled search is written as one JSON line: time, query, filters, sort, page size
+and cursor, the returned result ids, whether the result cache answered, and the latency
+of each stage (query embedding, search, total). Lines go through a QueueHandler, so the
+request only enqueues the record and a background thread does the file I/O. The file is
+rotated by size (QUERY_LOG_MAX_BYTES, keeping QUERY_LOG_BACKUP_COUNT old files).
+Capture is off unless QUERY_LOG_PATH is set, and then records QUERY_LOG_SAMPLE_RATE
+(default 10%) of searches.
+
+The log is the input of benchmarks/replay_queries.py (replay real traffic against any
+backend) and scripts/query_log_report.py (top queries and filter combinations, for
+sizing caches).
+"""
+
+import glob
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+from cache import resolve_cache_path
+
+# Capture is opt-in: nothing is written unless QUERY_LOG_PATH is set (relative to CACHE_DIR)
+QUERY_LOG_PATH = resolve_cache_path(os.getenv("QUERY_LOG_PATH", ""))
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "0.1"))
+QUERY_LOG_MAX_BYTES = int(os.getenv("QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+QUERY_LOG_BACKUP_COUNT = int(os.getenv("QUERY_LOG_BACKUP_COUNT", "5"))
+
+
+class QueryLog:
+    """
+    Sampled JSON-lines log of search requests with size-based rotation.
+
+    Args:
+        path: Log file; rotated files get .1, .2, ... suffixes.
+        sample_rate: Fraction of searches recorded (0 disables capture).
+        max_bytes: Size at which the file is rotated.
+        backup_count: Rotated files kept.
+    """
+
+    def __init__(self, path: Optional[str] = QUERY_LOG_PATH, sample_rate: float = QUERY_LOG_SAMPLE_RATE,
+                 max_bytes: int = QUERY_LOG_MAX_BYTES, backup_count: int = QUERY_LOG_BACKUP_COUNT):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.recorded = 0
+        self.skipped = 0
+        self._queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        self._logger = logging.getLogger(f"query_log.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path) and self.sample_rate > 0
+
+    def _start(self) -> None:
+        """Open the file and start the writer thread on first use."""
+        with self._lock:
+            if self._listener is not None:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding="utf-8")
+            file_handler.setFormatter(logging.Formatter("%(message)s"))
+            self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+            self._listener.start()
+            self._logger.addHandler(logging.handlers.QueueHandler(self._queue))
+
+    def record(self, query: str, filters: Dict[str, Any], sort: str, page_size: Optional[int],
+               cursor: Optional[str], result_ids: List[str], timings_ms: Dict[str, float],
+               cache: Optional[str] = None, total_count: Optional[int] = None, status: str = "ok") -> bool:
+        """Record one search if it is sampled. Returns whether it was recorded."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            self.skipped += 1
+            return False
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "query": query,
+            "filters": filters or {},
+            "sort": sort or "",
+            "pageSize": page_size,
+            "cursor": cursor,
+            "resultIds": result_ids,
+            "totalCount": total_count,
+            "cache": cache,
+            "status": status,
+            "timingsMs": {stage: round(ms, 2) for stage, ms in timings_ms.items()}
+        }
+        try:
+            if self._listener is None:
+                self._start()
+            self._logger.info(json.dumps(entry, separators=(",", ":")))
+        except Exception as e:
+            # Capture is best effort; it must never fail the search it describes
+            print(f"Error writing query log: {e}")
+            return False
+        self.recorded += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path or None, "sample_rate": self.sample_rate,
+                "recorded": self.recorded, "skipped": self.skipped}
+
+    def close(self) -> None:
+        """Flush queued lines and stop the writer thread."""
+        with self._lock:
+            if self._listener is not None:
+                self._listener.stop()
+                for handler in self._listener.handlers:
+                    handler.close()
+                self._listener = None
+                self._logger.handlers.clear()
+
+
+def log_files(path: str) -> List[str]:
+    """The log and its rotated files, oldest first (path.N ... path.1, path)."""
+    rotated = [name for name in glob.glob(f"{glob.escape(path)}.*") if name.rsplit(".", 1)[-1].isdigit()]
+    rotated.sort(key=lambda name: int(name.rsplit(".", 1)[-1]), reverse=True)
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def read_query_log(paths: List[str]) -> Iterator[Dict[str, Any]]:
+    """Yield entries from the given logs (each expanded to include its rotated files), oldest first."""
+    for path in paths:
+        for file_path in log_files(path):
+            with open(file_path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        print(f"Skipping malformed query log line in {file_path}")
@@ -0,0 +1,83 @@
+"""
+### ranking.py ###
+
+Rank fusion helpers shared by the search backends.
+"""
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+# Same constant Azure AI Search uses for hybrid reciprocal rank fusion
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(ranked_lists: Sequence[Sequence[Hashable]],
+                           weights: Optional[Sequence[float]] = None,
+                           k: int = RRF_K) -> List[tuple]:
+    """
+    Fuse several ranked lists of ids with (weighted) reciprocal rank fusion.
+
+    Args:
+        ranked_lists: Lists of ids, best first.
+        weights: Optional weight per list (defaults to 1.0 for every list).
+        k: RRF smoothing constant.
+
+    Returns:
+        List[tuple]: (id, fused score) pairs, best first. Ties keep first-seen order.
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    scores: Dict[Hashable, float] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        for rank, item_id in enumerate(ranked, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def weighted_score_fusion(scored_lists: Sequence[Sequence[tuple]],
+                          weights: Optional[Sequence[float]] = None) -> List[tuple]:
+    """
+    Fuse several scored lists with a weighted sum of min-max normalized scores.
+
+    Scores from different retrievers (BM25, cosine) are not on the same scale, so each list
+    is rescaled to [0, 1] before weighting. A list whose scores are all equal contributes 1.0.
+
+    Args:
+        scored_lists: Lists of (id, score) pairs.
+        weights: Optional weight per list (defaults to 1.0 for every list).
+
+    Returns:
+        List[tuple]: (id, fused score) pairs, best first. Ties keep first-seen order.
+    """
+    weights = weights or [1.0] * len(scored_lists)
+    scores: Dict[Hashable, float] = {}
+    for scored, weight in zip(scored_lists, weights):
+        if not scored:
+            continue
+        values = [score for _, score in scored]
+        low, high = min(values), max(values)
+        for item_id, score in scored:
+            normalized = (score - low) / (high - low) if high > low else 1.0
+            scores[item_id] = scores.get(item_id, 0.0) + weight * normalized
+    return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+
+
+def sort_by_order_clauses(documents: Sequence[Dict[str, Any]], order_by: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+    """
+    Sort documents by OData-style "field asc|desc" clauses, like the service's $orderby.
+
+    The input order (relevance) is the final tie-breaker. Missing values sort first when
+    ascending and last when descending, matching Azure AI Search's null ordering.
+    """
+    ordered = list(documents)
+    for clause in reversed(order_by or []):
+        parts = clause.split()
+        field = parts[0]
+        descending = len(parts) > 1 and parts[1].lower() == "desc"
+        if field == "search.score()":
+            # Documents already arrive in relevance order and sorting is stable
+            continue
+        ordered.sort(key=lambda doc: _null_first_key(doc.get(field)), reverse=descending)
+    return ordered
+
+
+def _null_first_key(value: Any) -> tuple:
+    return (0, 0) if value is None else (1, value)
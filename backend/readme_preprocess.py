@@ -0,0 +1,168 @@
+"""
+### readme_preprocess.py ###
+
+README preprocessing for the LLM extraction in app.process_readme.
+
+clean_readme strips what carries no project information (badges, images, HTML tags and
+comments, long runs of blank lines). The cleaned text is measured with tiktoken; a
+README within README_TOKEN_BUDGET is extracted in one call, a larger one is split on
+section and paragraph boundaries into chunks of at most that many tokens. At most
+README_MAX_CHUNKS chunks are kept, so the tokens sent per submission are bounded no
+matter how large the README is. The partial extractions are combined by
+merge_extractions, which is deterministic: the same chunks always give the same result.
+
+Requirements:
+    tiktoken
+"""
+
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import tiktoken
+
+README_TOKEN_BUDGET = int(os.getenv("README_TOKEN_BUDGET", "6000"))
+README_MAX_CHUNKS = int(os.getenv("README_MAX_CHUNKS", "6"))
+README_TOKEN_ENCODING = os.getenv("README_TOKEN_ENCODING", "cl100k_base")
+
+# [![alt](image)](link) badges, then plain ![alt](image) images
+_LINKED_IMAGE = re.compile(r"\[!\[[^\]]*\]\([^)]*\)\]\([^)]*\)")
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+# Reference-style image definitions and uses: ![alt][ref] / [ref]: https://...svg
+_REFERENCE_IMAGE = re.compile(r"!\[[^\]]*\]\[[^\]]*\]")
+_IMAGE_DEFINITION = re.compile(r"^\s*\[[^\]]+\]:\s*\S+\.(?:svg|png|jpe?g|gif)\S*\s*$", re.MULTILINE | re.IGNORECASE)
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_HTML_TAG = re.compile(r"</?[a-zA-Z][^>]*>")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SECTION_BREAK = re.compile(r"\n(?=#{1,6} )")
+
+_encoding = None
+
+
+def _get_encoding():
+    """Load the tiktoken encoding on first use; None if it cannot be loaded (e.g. offline)."""
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding(README_TOKEN_ENCODING)
+        except Exception as e:
+            print(f"Could not load tiktoken encoding {README_TOKEN_ENCODING}; estimating tokens: {e}")
+            _encoding = False
+    return _encoding or None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding is None:
+        # Roughly four characters per token for English text
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def clean_readme(text: str) -> str:
+    """Strip badges, images, HTML tags/comments and extra blank lines from a Markdown README."""
+    text = _HTML_COMMENT.sub("", text)
+    text = _LINKED_IMAGE.sub("", text)
+    text = _IMAGE.sub("", text)
+    text = _REFERENCE_IMAGE.sub("", text)
+    text = _IMAGE_DEFINITION.sub("", text)
+    text = _HTML_TAG.sub("", text)
+    lines = [line.rstrip() for line in text.splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """Split a single block that exceeds max_tokens into token-sized slices."""
+    encoding = _get_encoding()
+    if encoding is None:
+        size = max_tokens * 4
+        return [text[start:start + size] for start in range(0, len(text), size)]
+    tokens = encoding.encode(text, disallowed_special=())
+    return [encoding.decode(tokens[start:start + max_tokens]) for start in range(0, len(tokens), max_tokens)]
+
+
+def split_into_chunks(text: str, max_tokens: int = README_TOKEN_BUDGET) -> List[str]:
+    """
+    Pack the README into chunks of at most max_tokens tokens.
+
+    Sections (Markdown headings) and then paragraphs are kept whole where they fit, so
+    chunks break on natural boundaries.
+    """
+    blocks = []
+    for section in _SECTION_BREAK.split(text):
+        if count_tokens(section) <= max_tokens:
+            blocks.append(section)
+            continue
+        for paragraph in section.split("\n\n"):
+            if count_tokens(paragraph) <= max_tokens:
+                blocks.append(paragraph)
+            else:
+                blocks.extend(_split_oversized(paragraph, max_tokens))
+
+    chunks, current, current_tokens = [], [], 0
+    for block in blocks:
+        block_tokens = count_tokens(block)
+        if current and current_tokens + block_tokens > max_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def prepare_readme(text: str, max_tokens: int = README_TOKEN_BUDGET,
+                   max_chunks: int = README_MAX_CHUNKS) -> List[str]:
+    """
+    Clean a README and return the chunks to extract (a single chunk when it fits the budget).
+
+    Chunks beyond max_chunks are dropped; the opening of a README (name, description,
+    features) carries most of what the extraction needs.
+    """
+    cleaned = clean_readme(text)
+    if count_tokens(cleaned) <= max_tokens:
+        return [cleaned]
+    chunks = split_into_chunks(cleaned, max_tokens)
+    if len(chunks) > max_chunks:
+        print(f"README split into {len(chunks)} chunks; extracting the first {max_chunks}.")
+        chunks = chunks[:max_chunks]
+    return chunks
+
+
+def _majority(values: List[Any]) -> Optional[Any]:
+    """Most common non-empty value; ties go to the value seen first."""
+    values = [value for value in values if value]
+    if not values:
+        return None
+    counts = Counter(values)
+    return max(values, key=lambda value: (counts[value], -values.index(value)))
+
+
+def merge_extractions(partials: List[Dict[str, Any]], vote_fields: tuple = ()) -> Dict[str, Any]:
+    """
+    Deterministically merge per-chunk extraction results, given in chunk order.
+
+    - list fields: union in first-seen order, de-duplicated case-insensitively
+    - vote_fields: the most common value across chunks (ties go to the earliest chunk)
+    - other fields: the first non-empty value, so the README's opening wins
+    """
+    merged: Dict[str, Any] = {}
+    fields = list(dict.fromkeys(field for partial in partials for field in partial))
+    for field in fields:
+        values = [partial.get(field) for partial in partials]
+        if any(isinstance(value, list) for value in values):
+            seen, union = set(), []
+            for value in values:
+                for item in value or []:
+                    key = item.strip().lower() if isinstance(item, str) else item
+                    if key not in seen:
+                        seen.add(key)
+                        union.append(item)
+            merged[field] = union
+        elif field in vote_fields:
+            merged[field] = _majority(values)
+        else:
+            merged[field] = next((value for value in values if value), values[0])
+    return merged
@@ -0,0 +1,325 @@
+"""
+### repository.py ###
+
+Typed query layer over CosmosDBManager (CosmosRepository) and AsyncCosmosDBManager
+(AsyncCosmosRepository).
+
+Every query the application runs is declared once in NAMED_QUERIES as parameterized SQL
+together with the partition it targets, so no call site builds SQL with f-strings and no
+query fans out across partitions by accident. Id lookups use point reads, the cheapest
+operation Cosmos offers.
+
+Each operation records its request charge (RU) and latency in QueryMetrics, grouped by
+operation name and by the API endpoint that issued it (see set_current_endpoint), so RU
+spend can be attributed per endpoint at /api/admin/query_metrics.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class NamedQuery(NamedTuple):
+    sql: str
+    partition_key: str
+
+
+PROJECT_PARTITION = 'project'
+METADATA_PARTITION = 'metadata'
+
+NAMED_QUERIES: Dict[str, NamedQuery] = {
+    'pending_reviews': NamedQuery(
+        "SELECT * FROM c WHERE c.review_status = @review_status",
+        PROJECT_PARTITION
+    ),
+    # Card fields only; avoids pulling whole documents (including any stored embedding vectors)
+    'approved_project_cards': NamedQuery(
+        "SELECT c.id, c.projectName, c.projectDescription, c.githubUrl, c.owner, c.programmingLanguages, "
+        "c.frameworks, c.azureServices, c.designPatterns, c.projectType, c.codeComplexity, c.industries, "
+        "c.customers, c.businessValue, c.targetAudience "
+        "FROM c WHERE c.review_status = @review_status",
+        PROJECT_PARTITION
+    ),
+    # Fields needed to compute filter facets
+    'approved_project_facets': NamedQuery(
+        "SELECT c.review_status, c.programmingLanguages, c.frameworks, c.azureServices, c.designPatterns, "
+        "c.industries, c.customers, c.projectType, c.codeComplexity "
+        "FROM c WHERE c.review_status = @review_status",
+        PROJECT_PARTITION
+    ),
+    # Whole documents, for reindexing the search index from the catalog
+    'approved_projects': NamedQuery(
+        "SELECT * FROM c WHERE c.review_status = @review_status",
+        PROJECT_PARTITION
+    ),
+    'approved_project_ids': NamedQuery(
+        "SELECT VALUE c.id FROM c WHERE c.review_status = @review_status",
+        PROJECT_PARTITION
+    ),
+    # Outbox records share the project partition so they can be written in one transactional batch
+    'due_outbox_messages': NamedQuery(
+        "SELECT * FROM c WHERE c.type = @type AND c.status = @status AND c.next_attempt_at <= @now "
+        "ORDER BY c.next_attempt_at",
+        PROJECT_PARTITION
+    ),
+    'outbox_status_count': NamedQuery(
+        "SELECT VALUE COUNT(1) FROM c WHERE c.type = @type AND c.status = @status",
+        PROJECT_PARTITION
+    ),
+    'oldest_outbox_message': NamedQuery(
+        "SELECT VALUE MIN(c.created_at) FROM c WHERE c.type = @type AND c.status = @status",
+        PROJECT_PARTITION
+    ),
+    'failed_outbox_messages': NamedQuery(
+        "SELECT c.id, c.subject, c.attempts, c.last_error, c.updated_at "
+        "FROM c WHERE c.type = @type AND c.status = @status",
+        PROJECT_PARTITION
+    ),
+}
+
+# API endpoint on whose behalf Cosmos calls are made; set per request by the app middleware
+_current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="background")
+
+
+def set_current_endpoint(endpoint: str):
+    """Attribute subsequent Cosmos calls in this context to an endpoint. Returns a reset token."""
+    return _current_endpoint.set(endpoint)
+
+
+def reset_current_endpoint(token) -> None:
+    _current_endpoint.reset(token)
+
+
+class QueryMetrics:
+    """Thread-safe accumulator of request charge and latency per operation and per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, float]] = {}
+        self._endpoints: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _accumulate(bucket: Dict[str, float], request_charge: float, latency_ms: float, items: int) -> None:
+        bucket["calls"] = bucket.get("calls", 0) + 1
+        bucket["request_charge"] = bucket.get("request_charge", 0.0) + request_charge
+        bucket["latency_ms"] = bucket.get("latency_ms", 0.0) + latency_ms
+        bucket["max_latency_ms"] = max(bucket.get("max_latency_ms", 0.0), latency_ms)
+        bucket["items"] = bucket.get("items", 0) + items
+
+    def record(self, operation: str, request_charge: float, latency_ms: float, items: int = 0) -> None:
+        endpoint = _current_endpoint.get()
+        with self._lock:
+            self._accumulate(self._operations.setdefault(operation, {}), request_charge, latency_ms, items)
+            self._accumulate(self._endpoints.setdefault(endpoint, {}), request_charge, latency_ms, items)
+
+    @staticmethod
+    def _summarize(buckets: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name, bucket in buckets.items():
+            calls = bucket["calls"]
+            summary[name] = {
+                "calls": calls,
+                "items": bucket["items"],
+                "request_charge": round(bucket["request_charge"], 2),
+                "avg_request_charge": round(bucket["request_charge"] / calls, 2),
+                "avg_latency_ms": round(bucket["latency_ms"] / calls, 2),
+                "max_latency_ms": round(bucket["max_latency_ms"], 2)
+            }
+        return summary
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "operations": self._summarize(self._operations),
+                "endpoints": self._summarize(self._endpoints)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+            self._endpoints.clear()
+
+
+query_metrics = QueryMetrics()
+
+
+class _ChargeRecorder:
+    """Cosmos response_hook that sums x-ms-request-charge over every response of one operation."""
+
+    def __init__(self):
+        self.request_charge = 0.0
+
+    def __call__(self, headers, _result) -> None:
+        try:
+            self.request_charge += float((headers or {}).get('x-ms-request-charge', 0) or 0)
+        except (TypeError, ValueError):
+            pass
+
+
+class CosmosRepository:
+    """
+    Named, parameterized, partition-scoped access to the Cosmos container.
+
+    Args:
+        cosmos_db: CosmosDBManager (or any object with the same API).
+        metrics: Where request charge and latency are recorded.
+    """
+
+    def __init__(self, cosmos_db, metrics: QueryMetrics = query_metrics):
+        self.cosmos_db = cosmos_db
+        self.metrics = metrics
+
+    def _measure(self, operation: str, call: Callable[[_ChargeRecorder], Any],
+                 count_items: Callable[[Any], int] = lambda result: 0) -> Any:
+        recorder = _ChargeRecorder()
+        start = time.perf_counter()
+        result = call(recorder)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.metrics.record(operation, recorder.request_charge, latency_ms, count_items(result))
+        return result
+
+    @staticmethod
+    def _resolve(name: str, params: Dict[str, Any]) -> Tuple[NamedQuery, List[Dict[str, Any]]]:
+        named_query = NAMED_QUERIES[name]
+        parameters = [{"name": f"@{key}", "value": value} for key, value in params.items()]
+        return named_query, parameters
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+
+    def query(self, name: str, **params) -> List[Dict[str, Any]]:
+        named_query, parameters = self._resolve(name, params)
+        return self._measure(
+            name,
+            lambda hook: self.cosmos_db.query_items(named_query.sql, parameters,
+                                                    partition_key=named_query.partition_key,
+                                                    response_hook=hook),
+            len
+        )
+
+    def query_page(self, name: str, max_item_count: int = 100, continuation_token: Optional[str] = None,
+                   **params) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        named_query, parameters = self._resolve(name, params)
+        return self._measure(
+            name,
+            lambda hook: self.cosmos_db.query_page(named_query.sql, parameters,
+                                                   partition_key=named_query.partition_key,
+                                                   max_item_count=max_item_count,
+                                                   continuation_token=continuation_token,
+                                                   response_hook=hook),
+            lambda result: len(result[0])
+        )
+
+    def iter_pages(self, name: str, max_item_count: int = 100, **params) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages lazily; each page fetch is recorded as one call."""
+        named_query, parameters = self._resolve(name, params)
+        recorder = _ChargeRecorder()
+        pages = self.cosmos_db.iter_query_pages(named_query.sql, parameters,
+                                                partition_key=named_query.partition_key,
+                                                max_item_count=max_item_count,
+                                                response_hook=recorder)
+        while True:
+            charge_before = recorder.request_charge
+            start = time.perf_counter()
+            page = next(pages, None)
+            latency_ms = (time.perf_counter() - start) * 1000
+            if page is None:
+                return
+            self.metrics.record(name, recorder.request_charge - charge_before, latency_ms, len(page))
+            yield page
+
+    # ----------------------------
+    # Point operations
+    # ----------------------------
+
+    def read_item(self, item_id: str, partition_key: str, name: str = 'read_item') -> Optional[Dict[str, Any]]:
+        return self._measure(
+            name,
+            lambda hook: self.cosmos_db.read_item(item_id, partition_key, response_hook=hook),
+            lambda result: 1 if result else 0
+        )
+
+    def upsert_item(self, item: Dict[str, Any], name: str = 'upsert_item') -> Optional[Dict[str, Any]]:
+        return self._measure(name, lambda hook: self.cosmos_db.upsert_item(item, response_hook=hook))
+
+    def replace_item_if_match(self, item: Dict[str, Any], etag: str,
+                              name: str = 'replace_item_if_match') -> Optional[Dict[str, Any]]:
+        return self._measure(name, lambda hook: self.cosmos_db.replace_item_if_match(item, etag, response_hook=hook))
+
+    def delete_item(self, item_id: str, partition_key: str, name: str = 'delete_item') -> bool:
+        return self._measure(name, lambda hook: self.cosmos_db.delete_item(item_id, partition_key, response_hook=hook))
+
+    def execute_batch(self, operations: List[Tuple], partition_key: str,
+                      name: str = 'execute_batch') -> Optional[List[Dict[str, Any]]]:
+        """Run operations atomically within one partition; None if the batch failed."""
+        return self._measure(
+            name,
+            lambda hook: self.cosmos_db.execute_item_batch(operations, partition_key, response_hook=hook),
+            lambda result: len(result) if result else 0
+        )
+
+    # ----------------------------
+    # Catalog operations
+    # ----------------------------
+
+    def get_project(self, project_id: str) -> Optional[Dict[str, Any]]:
+        return self.read_item(project_id, PROJECT_PARTITION, name='read_project')
+
+    def upsert_project(self, project: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.upsert_item(project, name='upsert_project')
+
+    def delete_project(self, project_id: str) -> bool:
+        return self.delete_item(project_id, PROJECT_PARTITION, name='delete_project')
+
+    def get_pending_reviews(self) -> List[Dict[str, Any]]:
+        return self.query('pending_reviews', review_status='pending')
+
+    def save_project_with_outbox(self, project: Dict[str, Any],
+                                 messages: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+        """Upsert a project and its outbox records in one transaction; nothing is written if any fails."""
+        operations = [("upsert", (project,))] + [("upsert", (message,)) for message in messages]
+        return self.execute_batch(operations, PROJECT_PARTITION, name='save_project_with_outbox')
+
+    def get_approved_tags(self) -> Optional[Dict[str, Any]]:
+        return self.read_item('approved_tags', METADATA_PARTITION, name='read_approved_tags')
+
+    def upsert_approved_tags(self, tags: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.upsert_item(tags, name='upsert_approved_tags')
+
+
+class AsyncCosmosRepository(CosmosRepository):
+    """
+    CosmosRepository over AsyncCosmosDBManager; the same operations, awaited.
+
+    The catalog operations are inherited unchanged: they return the coroutine of the
+    underlying async operation, so `await repository.get_project(...)` works as expected.
+    """
+
+    async def _measure(self, operation: str, call: Callable[[_ChargeRecorder], Any],
+                       count_items: Callable[[Any], int] = lambda result: 0) -> Any:
+        recorder = _ChargeRecorder()
+        start = time.perf_counter()
+        result = await call(recorder)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.metrics.record(operation, recorder.request_charge, latency_ms, count_items(result))
+        return result
+
+    async def iter_pages(self, name: str, max_item_count: int = 100, **params) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages lazily; each page fetch is recorded as one call."""
+        named_query, parameters = self._resolve(name, params)
+        recorder = _ChargeRecorder()
+        pages = self.cosmos_db.iter_query_pages(named_query.sql, parameters,
+                                                partition_key=named_query.partition_key,
+                                                max_item_count=max_item_count,
+                                                response_hook=recorder)
+        while True:
+            charge_before = recorder.request_charge
+            start = time.perf_counter()
+            page = await anext(pages, None)
+            latency_ms = (time.perf_counter() - start) * 1000
+            if page is None:
+                return
+            self.metrics.record(name, recorder.request_charge - charge_before, latency_ms, len(page))
+            yield page
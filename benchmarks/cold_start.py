@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the backend: what a new replica pays before it serves traffic.
+
+Measured, each in fresh interpreters so nothing is already imported or cached:
+
+    - import time of the backend modules (app, projects, cosmosdb) and the heavy
+      dependencies (langchain, openai, Azure SDKs), plus the modules that dominate
+      `import app` according to `python -X importtime`
+    - per start-up run: time until the port accepts connections and until /api/ready
+      returns 200, time to first byte of the first (cold) and second (warm)
+      /api/search_projects and /api/get_filter_options, and resident memory after
+      start-up and after the first requests
+
+Azure OpenAI and AI Search are served by a local stand-in (fakes.FakeAzureServer) and
+Cosmos DB is replaced in memory (fakes.InMemoryCosmosDBManager), so the numbers measure
+the backend, not the network. Results are written as JSON for release-to-release
+comparison.
+
+    python benchmarks/cold_start.py --runs 5 --output cold_start.json
+    python benchmarks/cold_start.py --fast-start          # same, with FAST_START=true
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from fakes import FakeAzureServer, sample_projects, to_search_document
+from harness import (benchmark_env, make_workdir, request, rss_mb, wait_until, ready, start_backend,
+                     wait_for_backend, stop_backend, summarize, git_commit)
+
+IMPORT_MODULES = ["app", "projects", "cosmosdb", "langchain_openai", "openai", "azure.search.documents",
+                  "azure.cosmos", "azure.identity", "azure.communication.email", "fastapi"]
+SEARCH_BODY = {"query": "azure openai rag", "filters": {}, "sort": ""}
+
+
+# ----------------------------
+# Import time
+# ----------------------------
+
+def time_import(module: str, env: dict, cwd: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], env=env, cwd=cwd, capture_output=True,
+                            text=True, check=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def top_imports(module: str, env: dict, cwd: str, limit: int = 15):
+    """Direct imports of `module` ranked by cumulative import time, from `python -X importtime`."""
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=env, cwd=cwd,
+                            capture_output=True, text=True, check=True).stderr
+    entries = []
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            entries.append((int(match[2]), len(match[3]), match[4]))
+    root_depth = min(depth for _, depth, _ in entries)
+    # Direct children of the root import are one nesting level (two spaces) deeper; modules
+    # that were already imported by an earlier sibling do not appear again, so this
+    # attributes shared dependencies to whoever imported them first
+    children = [(cumulative, name) for cumulative, depth, name in entries if depth == root_depth + 2]
+    children.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": round(cumulative / 1000, 1)} for cumulative, name in children[:limit]]
+
+
+# ----------------------------
+# Start-up runs
+# ----------------------------
+
+def startup_run(env: dict, cwd: str, projects: int, timeout: float) -> dict:
+    started = time.perf_counter()
+    process = start_backend(env, cwd, projects)
+    port = process.port
+    try:
+        wait_for_backend(process, timeout)
+        result = {"time_to_listen_s": round(time.perf_counter() - started, 4)}
+
+        # First search straight away: in fast-start mode it includes waiting for warm-up
+        status, ttfb, body = request(port, "POST", "/api/search_projects", SEARCH_BODY)
+        result["first_search_ok"] = status == 200 and "error" not in body
+        result["first_search_ttfb_s"] = round(ttfb, 4)
+        result["time_to_first_search_s"] = round(time.perf_counter() - started, 4)
+
+        wait_until(lambda: ready(port), timeout, interval=0.05)
+        result["time_to_ready_s"] = round(time.perf_counter() - started, 4)
+        result["rss_after_startup_mb"] = rss_mb(process.pid)
+
+        status, ttfb, _ = request(port, "GET", "/api/get_filter_options")
+        result["first_filter_options_ok"] = status == 200
+        result["first_filter_options_ttfb_s"] = round(ttfb, 4)
+        result["warm_search_ttfb_s"] = round(request(port, "POST", "/api/search_projects",
+                                                     {**SEARCH_BODY, "query": "cosmos db"})[1], 4)
+        result["warm_filter_options_ttfb_s"] = round(request(port, "GET", "/api/get_filter_options")[1], 4)
+        result["rss_after_requests_mb"] = rss_mb(process.pid)
+        return result
+    finally:
+        stop_backend(process)
+
+
+def run_benchmark(runs: int, projects: int, fast_start: bool, timeout: float) -> dict:
+    fake_azure = FakeAzureServer([to_search_document(p) for p in sample_projects(projects)]).start()
+    env = benchmark_env(fake_azure.url, fast_start)
+    workdir = make_workdir()
+    try:
+        import_times = {}
+        for module in IMPORT_MODULES:
+            samples = [time_import(module, env, workdir) for _ in range(runs)]
+            import_times[module] = {"median_s": round(statistics.median(samples), 4),
+                                    "min_s": round(min(samples), 4)}
+            print(f"import {module}: {import_times[module]['median_s']:.3f}s")
+
+        startup_runs = []
+        for run in range(runs):
+            result = startup_run(env, workdir, projects, timeout)
+            print(f"run {run + 1}: ready in {result['time_to_ready_s']:.2f}s, "
+                  f"first search {result['first_search_ttfb_s'] * 1000:.0f}ms, "
+                  f"rss {result['rss_after_requests_mb']}MB")
+            startup_runs.append(result)
+
+        metrics = [key for key, value in startup_runs[0].items() if not isinstance(value, bool)]
+        return {
+            "benchmark": "cold_start",
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {"runs": runs, "projects": projects, "fast_start": fast_start},
+            "import_times": import_times,
+            "app_top_imports": top_imports("app", env, workdir),
+            "startup": {
+                "summary": {metric: summarize([run[metric] for run in startup_runs]) for metric in metrics},
+                "runs": startup_runs
+            }
+        }
+    finally:
+        fake_azure.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure backend import time, time to first response and memory.")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per measurement")
+    parser.add_argument("--projects", type=int, default=200, help="Size of the synthetic catalog")
+    parser.add_argument("--fast-start", action="store_true", help="Start the backend with FAST_START=true")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for a replica to come up")
+    parser.add_argument("--output", help="Write the JSON results to this file (default: stdout only)")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs, args.projects, args.fast_start, args.timeout)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"Results written to {args.output}")
+    else:
+        print(output)
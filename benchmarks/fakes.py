@@ -0,0 +1,489 @@
+"""
+### fakes.py ###
+
+Local stand-ins for the Azure services the backend talks to, so benchmarks run offline.
+
+    - FakeAzureServer: a local HTTP server speaking the parts of the Azure OpenAI
+      (embeddings, chat completions) and Azure AI Search (query, index) APIs that the
+      backend uses. Point AOAI_ENDPOINT and AZURE_SEARCH_ENDPOINT at its url; the real
+      SDKs are used unchanged.
+    - InMemoryCosmosDBManager: drop-in replacement for cosmosdb.AsyncCosmosDBManager that
+      keeps items in memory and evaluates the repository's named queries itself.
+    - sample_projects(n): a deterministic synthetic catalog of approved projects.
+
+Both stand-ins take a latency_ms mapping (per API, see AZURE_LATENCY_KEYS and
+COSMOS_LATENCY_KEYS) that is added to every matching call, so load tests can model the
+round trips of the real services.
+
+None of this imports the backend, so loading it does not skew import-time measurements.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+EMBEDDING_DIMENSIONS = 1536
+AZURE_LATENCY_KEYS = ("embeddings", "chat", "search", "index")
+COSMOS_LATENCY_KEYS = ("read", "query", "write")
+
+LANGUAGES = ["Python", "TypeScript", "C#", "Java", "Go"]
+FRAMEWORKS = ["FastAPI", "React", "LangChain", "Semantic Kernel", "Flask", ".NET"]
+AZURE_SERVICES = ["Azure OpenAI", "Azure AI Search", "Azure Cosmos DB", "Azure Functions",
+                  "Azure Container Apps", "Azure Communication Services"]
+DESIGN_PATTERNS = ["RAG", "Multi-agent", "Prompt flow", "Event-driven", "Function calling"]
+PROJECT_TYPES = ["Accelerator", "Demo", "Reference Architecture", "Tool"]
+COMPLEXITIES = ["Beginner", "Intermediate", "Advanced"]
+INDUSTRIES = ["Healthcare", "Finance", "Retail", "Manufacturing", "Public Sector"]
+
+# Cosmos project fields (camelCase) -> search document fields (snake_case)
+SEARCH_FIELD_NAMES = {
+    "projectName": "project_name", "projectDescription": "project_description", "githubUrl": "github_url",
+    "owner": "owner", "programmingLanguages": "programming_languages", "frameworks": "frameworks",
+    "azureServices": "azure_services", "designPatterns": "design_patterns", "projectType": "project_type",
+    "codeComplexity": "code_complexity", "industries": "industries", "customers": "customers",
+    "businessValue": "business_value", "targetAudience": "target_audience", "approved_at": "approved_at"
+}
+
+
+# Fields of the search index as create-index.py defines it, and of an index created before
+# the sort fields were added (to check that queries still work before the migration)
+INDEX_FIELDS = frozenset(["id", *SEARCH_FIELD_NAMES.values(), "project_name_sort", "code_complexity_rank",
+                          "description_vector", "business_value_vector", "target_audience_vector"])
+LEGACY_INDEX_FIELDS = INDEX_FIELDS - {"project_name_sort", "code_complexity_rank", "approved_at"}
+COMPLEXITY_RANK = {"Beginner": 1, "Intermediate": 2, "Advanced": 3}
+
+
+def document_id(github_url: str) -> str:
+    """Same id scheme as app.generate_document_id."""
+    return hashlib.md5(github_url.encode()).hexdigest()
+
+
+def sample_projects(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Deterministic approved projects shaped like the Cosmos catalog."""
+    rng = random.Random(seed)
+    projects = []
+    for n in range(count):
+        github_url = f"https://github.com/sample-org/project-{n:05d}"
+        projects.append({
+            "id": document_id(github_url),
+            "partitionKey": "project",
+            "review_status": "approved",
+            "projectName": f"Project {n:05d}",
+            "projectDescription": f"Sample project {n} using {rng.choice(AZURE_SERVICES)} for {rng.choice(DESIGN_PATTERNS)}.",
+            "githubUrl": github_url,
+            "owner": f"owner{n % 25}@example.com",
+            "programmingLanguages": rng.sample(LANGUAGES, 2),
+            "frameworks": rng.sample(FRAMEWORKS, 2),
+            "azureServices": rng.sample(AZURE_SERVICES, 3),
+            "designPatterns": rng.sample(DESIGN_PATTERNS, 2),
+            "projectType": rng.choice(PROJECT_TYPES),
+            "codeComplexity": rng.choice(COMPLEXITIES),
+            "industries": rng.sample(INDUSTRIES, 1),
+            "customers": [],
+            "businessValue": "Speeds up delivery of AI solutions on Azure.",
+            "targetAudience": "Developers and solution architects",
+            "approved_at": f"2024-01-{n % 28 + 1:02d}T00:00:00+00:00"
+        })
+    return projects
+
+
+def to_search_document(project: Dict[str, Any]) -> Dict[str, Any]:
+    document = {"id": project["id"]}
+    for source, target in SEARCH_FIELD_NAMES.items():
+        document[target] = project.get(source)
+    # Sort keys, as projects.build_search_document writes them
+    document["project_name_sort"] = (document["project_name"] or "").strip().lower()
+    document["code_complexity_rank"] = COMPLEXITY_RANK.get(document["code_complexity"])
+    return document
+
+
+def fake_embedding(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    """Deterministic unit-ish vector for a text."""
+    rng = random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+    return [round(rng.uniform(-1, 1), 6) for _ in range(dimensions)]
+
+
+# ----------------------------
+# Azure OpenAI + AI Search HTTP stand-in
+# ----------------------------
+
+def sample_value(schema: Dict[str, Any], definitions: Dict[str, Any]) -> Any:
+    """A placeholder value matching a JSON schema (for structured-output chat responses)."""
+    if "$ref" in schema:
+        return sample_value(definitions.get(schema["$ref"].split("/")[-1], {}), definitions)
+    if "anyOf" in schema:
+        return sample_value(schema["anyOf"][0], definitions)
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: sample_value(field, definitions) for name, field in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [sample_value(schema.get("items", {}), definitions)]
+    if "enum" in schema:
+        return schema["enum"][0]
+    return {"integer": 1, "number": 1.0, "boolean": True, "null": None}.get(kind, "sample")
+
+
+_ODATA_CONDITION = re.compile(r"^(?P<field>\w+)(?P<any>/any\(item: item)? eq '(?P<value>[^']*)'\)?$")
+
+
+class SearchRequestError(Exception):
+    """A query the real service would reject with HTTP 400."""
+
+
+def filter_fields(odata_filter: Optional[str]) -> List[str]:
+    return [match["field"] for match in (_ODATA_CONDITION.match(condition.strip())
+                                         for condition in (odata_filter or "").split(" and ") if odata_filter)
+            if match]
+
+
+def order_clauses(orderby: Optional[str]) -> List[Tuple[str, bool]]:
+    """Parse $orderby ("field [asc|desc], ...") into (field, descending) pairs."""
+    clauses = []
+    for clause in (orderby or "").split(","):
+        parts = clause.split()
+        if parts:
+            clauses.append((parts[0], len(parts) > 1 and parts[1].lower() == "desc"))
+    return clauses
+
+
+def sort_documents(documents: List[Dict[str, Any]], clauses: List[Tuple[str, bool]]) -> List[Dict[str, Any]]:
+    """Apply $orderby; nulls sort first ascending and last descending, like the service."""
+    ordered = list(documents)
+    for field, descending in reversed(clauses):
+        if field == "search.score()":
+            continue
+        ordered.sort(key=lambda document: (0, 0) if document.get(field) is None else (1, document[field]),
+                     reverse=descending)
+    return ordered
+
+
+def validate_fields(request: Dict[str, Any], index_fields: frozenset) -> None:
+    """Reject unknown $select, $orderby and $filter fields, as the service does."""
+    checks = [("$select", [field.strip() for field in (request.get("select") or "").split(",") if field.strip()]),
+              ("$orderby", [field for field, _ in order_clauses(request.get("orderby"))
+                            if field != "search.score()"]),
+              ("$filter", filter_fields(request.get("filter")))]
+    for parameter, fields in checks:
+        for field in fields:
+            if field != "*" and field not in index_fields:
+                raise SearchRequestError(f"Invalid expression: Could not find a property named '{field}' "
+                                         f"on type 'search.document'.\r\nParameter name: {parameter}")
+
+
+def matches_filter(document: Dict[str, Any], odata_filter: Optional[str]) -> bool:
+    """
+    Evaluate the OData filters projects.build_filter_string produces: conditions of the form
+    `field eq 'v'` or `field/any(item: item eq 'v')`, joined with `and`.
+    """
+    for condition in (odata_filter or "").split(" and ") if odata_filter else []:
+        match = _ODATA_CONDITION.match(condition.strip())
+        if not match:
+            raise ValueError(f"Unsupported filter: {condition}")
+        value = document.get(match["field"])
+        if match["any"]:
+            if match["value"] not in (value or []):
+                return False
+        elif value != match["value"]:
+            return False
+    return True
+
+
+class FakeAzureHandler(BaseHTTPRequestHandler):
+    documents: List[Dict[str, Any]] = []
+    documents_lock = threading.Lock()
+    latency_ms: Dict[str, float] = {}
+    index_fields: frozenset = INDEX_FIELDS
+    protocol_version = "HTTP/1.1"
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _embeddings(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        inputs = request.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return {
+            "object": "list",
+            "model": request.get("model", "text-embedding-ada-002"),
+            "data": [{"object": "embedding", "index": i, "embedding": fake_embedding(str(text))}
+                     for i, text in enumerate(inputs)],
+            "usage": {"prompt_tokens": 0, "total_tokens": 0}
+        }
+
+    def _chat(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured output is answered in kind: a tool call or JSON content matching the schema."""
+        message: Dict[str, Any] = {"role": "assistant", "content": "This is a sample response."}
+        response_format = request.get("response_format") or {}
+        tools = request.get("tools") or []
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"]["schema"]
+            message["content"] = json.dumps(sample_value(schema, schema.get("$defs", {})))
+        elif tools:
+            function = tools[0]["function"]
+            schema = function.get("parameters", {})
+            message["content"] = None
+            message["tool_calls"] = [{"id": "call_0", "type": "function", "function": {
+                "name": function["name"], "arguments": json.dumps(sample_value(schema, schema.get("$defs", {})))}}]
+        return {
+            "id": "chatcmpl-benchmark",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": message,
+                         "finish_reason": "tool_calls" if "tool_calls" in message else "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        }
+
+    def _index(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        results = []
+        with self.documents_lock:
+            positions = {document["id"]: n for n, document in enumerate(self.documents)}
+            for action in request.get("value", []):
+                kind = action.pop("@search.action", "upload")
+                key = action.get("id")
+                if kind == "delete":
+                    if key in positions:
+                        self.documents[positions[key]] = None
+                elif key in positions and self.documents[positions[key]] is not None:
+                    if kind in ("merge", "mergeOrUpload"):
+                        self.documents[positions[key]].update(action)
+                    else:
+                        self.documents[positions[key]] = action
+                else:
+                    positions[key] = len(self.documents)
+                    self.documents.append(action)
+                results.append({"key": key, "status": True, "errorMessage": None, "statusCode": 200})
+            self.documents[:] = [document for document in self.documents if document is not None]
+        return {"value": results}
+
+    def _search(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        validate_fields(request, self.index_fields)
+        skip, top = request.get("skip") or 0, request.get("top") or 50
+        matched = [document for document in self.documents if matches_filter(document, request.get("filter"))]
+        # Scores follow index order (the stand-in's relevance); $orderby then reorders
+        scored = [{"@search.score": 1.0 / (rank + 1), **document} for rank, document in enumerate(matched)]
+        scored = sort_documents(scored, order_clauses(request.get("orderby")))
+        select = [field.strip() for field in (request.get("select") or "").split(",") if field.strip()]
+        page = []
+        for document in scored[skip:skip + top]:
+            if select and "*" not in select:
+                page.append({"@search.score": document["@search.score"],
+                             **{field: document.get(field) for field in select}})
+            else:
+                # Vectors are not returned by queries, and are large enough to skew payload sizes
+                page.append({field: value for field, value in document.items() if not field.endswith("_vector")})
+        response = {"value": page}
+        if request.get("count"):
+            response["@odata.count"] = len(matched)
+        return response
+
+    def _delay(self, api: str) -> None:
+        if self.latency_ms.get(api):
+            time.sleep(self.latency_ms[api] / 1000)
+
+    def do_POST(self):
+        request = self._read_json()
+        routes = [("/embeddings", "embeddings", self._embeddings), ("/chat/completions", "chat", self._chat),
+                  ("search.post.search", "search", self._search), ("search.index", "index", self._index)]
+        for marker, api, handler in routes:
+            if marker in self.path:
+                self._delay(api)
+                try:
+                    self._send_json(200, handler(request))
+                except SearchRequestError as e:
+                    self._send_json(400, {"error": {"code": "", "message": str(e)}})
+                return
+        self._send_json(404, {"error": {"code": "NotFound", "message": self.path}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeAzureServer:
+    """
+    Azure OpenAI + AI Search stand-in on a background thread.
+
+    Args:
+        documents: Initial search index; queries return the documents matching their
+            filter, in index order or by $orderby, and index requests (upload, merge,
+            delete) modify it.
+        latency_ms: Added delay per API, keyed by AZURE_LATENCY_KEYS.
+        port: Port to listen on; 0 picks a free one.
+        index_fields: Fields the index defines; queries selecting, sorting or filtering on
+            any other field are rejected with HTTP 400 (LEGACY_INDEX_FIELDS models an index
+            created before the sort fields were added).
+    """
+
+    def __init__(self, documents: Optional[List[Dict[str, Any]]] = None,
+                 latency_ms: Optional[Dict[str, float]] = None, port: int = 0,
+                 index_fields: frozenset = INDEX_FIELDS):
+        handler = type("Handler", (FakeAzureHandler,), {"documents": list(documents or []),
+                                                        "documents_lock": threading.Lock(),
+                                                        "latency_ms": dict(latency_ms or {}),
+                                                        "index_fields": frozenset(index_fields)})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self) -> "FakeAzureServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ----------------------------
+# In-memory Cosmos DB
+# ----------------------------
+
+_SELECT = re.compile(r"^SELECT (?P<projection>.+?) FROM c(?: WHERE (?P<where>.+?))?(?: ORDER BY c\.(?P<order>\w+))?$",
+                     re.DOTALL)
+_CONDITION = re.compile(r"^c\.(?P<field>\w+) (?P<op><=|>=|=|<|>) @(?P<param>\w+)$")
+_OPERATORS = {
+    "=": lambda a, b: a == b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "<": lambda a, b: a is not None and a < b,
+    ">": lambda a, b: a is not None and a > b
+}
+
+
+def evaluate_query(query: str, parameters: Optional[List[Dict[str, Any]]],
+                   items: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Evaluate the subset of Cosmos SQL used by repository.NAMED_QUERIES: AND-ed comparisons
+    against parameters, ORDER BY one field, and a projection of *, field lists,
+    VALUE c.field, VALUE COUNT(1) or VALUE MIN(c.field).
+    """
+    match = _SELECT.match(" ".join(query.split()))
+    if not match:
+        raise ValueError(f"Unsupported query: {query}")
+    params = {p["name"].lstrip("@"): p["value"] for p in parameters or []}
+
+    conditions = []
+    for condition in (match["where"].split(" AND ") if match["where"] else []):
+        parsed = _CONDITION.match(condition.strip())
+        if not parsed:
+            raise ValueError(f"Unsupported condition: {condition}")
+        conditions.append((parsed["field"], _OPERATORS[parsed["op"]], params[parsed["param"]]))
+    rows = [item for item in items if all(op(item.get(field), value) for field, op, value in conditions)]
+    if match["order"]:
+        rows.sort(key=lambda item: (item.get(match["order"]) is None, item.get(match["order"])))
+
+    projection = match["projection"].strip()
+    if projection == "*":
+        return [dict(row) for row in rows]
+    if projection == "VALUE COUNT(1)":
+        return [len(rows)]
+    aggregate = re.match(r"^VALUE MIN\(c\.(\w+)\)$", projection)
+    if aggregate:
+        values = [row[aggregate[1]] for row in rows if row.get(aggregate[1]) is not None]
+        return [min(values)] if values else []
+    if projection.startswith("VALUE c."):
+        return [row.get(projection[len("VALUE c."):]) for row in rows]
+    fields = [field.strip()[len("c."):] for field in projection.split(",")]
+    return [{field: row[field] for field in fields if field in row} for row in rows]
+
+
+class InMemoryCosmosDBManager:
+    """
+    AsyncCosmosDBManager with the container held in memory.
+
+    Items are keyed on (partitionKey, id) and get a fresh _etag on every write, so the
+    etag-guarded read-modify-write paths (facets, outbox) behave as they do against Cosmos.
+    latency_ms adds a delay per operation kind ("read", "query" per page, "write").
+    """
+
+    def __init__(self, items: Optional[List[Dict[str, Any]]] = None,
+                 latency_ms: Optional[Dict[str, float]] = None):
+        self.items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.latency_ms = dict(latency_ms or {})
+        for item in items or []:
+            self._store(item)
+
+    async def _delay(self, kind: str) -> None:
+        if self.latency_ms.get(kind):
+            await asyncio.sleep(self.latency_ms[kind] / 1000)
+
+    def _store(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        stored = {**item, "_etag": uuid.uuid4().hex}
+        self.items[(item.get("partitionKey"), item["id"])] = stored
+        return dict(stored)
+
+    def _partition(self, partition_key: Optional[str]) -> List[Dict[str, Any]]:
+        return [item for (pk, _), item in self.items.items() if partition_key is None or pk == partition_key]
+
+    async def initialize(self) -> "InMemoryCosmosDBManager":
+        return self
+
+    async def close(self) -> None:
+        pass
+
+    async def upsert_item(self, item: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        await self._delay("write")
+        return self._store(item)
+
+    async def read_item(self, item_id: str, partition_key: str, **kwargs) -> Optional[Dict[str, Any]]:
+        await self._delay("read")
+        item = self.items.get((partition_key, item_id))
+        return dict(item) if item else None
+
+    async def replace_item_if_match(self, item: Dict[str, Any], etag: str, **kwargs) -> Optional[Dict[str, Any]]:
+        await self._delay("write")
+        current = self.items.get((item.get("partitionKey"), item["id"]))
+        if current is None or current["_etag"] != etag:
+            return None
+        return self._store(item)
+
+    async def query_items(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                          partition_key: Optional[str] = None, **kwargs) -> List[Any]:
+        await self._delay("query")
+        return evaluate_query(query, parameters, self._partition(partition_key))
+
+    async def query_page(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                         partition_key: Optional[str] = None, max_item_count: int = 100,
+                         continuation_token: Optional[str] = None, **kwargs) -> Tuple[List[Any], Optional[str]]:
+        await self._delay("query")
+        rows = evaluate_query(query, parameters, self._partition(partition_key))
+        start = int(continuation_token or 0)
+        end = start + max_item_count
+        return rows[start:end], (str(end) if end < len(rows) else None)
+
+    async def iter_query_pages(self, query: str, parameters: Optional[List[Dict[str, Any]]] = None,
+                               partition_key: Optional[str] = None, max_item_count: int = 100,
+                               **kwargs) -> AsyncIterator[List[Any]]:
+        rows = evaluate_query(query, parameters, self._partition(partition_key))
+        for start in range(0, len(rows), max_item_count):
+            await self._delay("query")
+            yield rows[start:start + max_item_count]
+
+    async def delete_item(self, item_id: str, partition_key: str, **kwargs) -> bool:
+        await self._delay("write")
+        return self.items.pop((partition_key, item_id), None) is not None
+
+    async def execute_item_batch(self, operations: List[Tuple], partition_key: str,
+                                 **kwargs) -> Optional[List[Dict[str, Any]]]:
+        await self._delay("write")
+        return [self._store(args[0]) for _, args, *_ in operations]
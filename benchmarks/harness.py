@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+### harness.py ###
+
+Shared plumbing for the benchmarks: start the backend in a subprocess wired to the local
+stand-ins in fakes.py, issue timed requests, and collect results.
+
+Run directly, this module is the backend child process: it imports app.py, swaps its
+Cosmos manager for fakes.InMemoryCosmosDBManager and serves with uvicorn.
+
+    python benchmarks/harness.py --port 8000 --projects 200 --cosmos-latency-ms '{"query": 10}'
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCHMARK_DIR.parent
+BACKEND_DIR = ROOT_DIR / "backend"
+
+
+def benchmark_env(fake_url: str, fast_start: bool = False, extra: Optional[Dict[str, str]] = None) -> dict:
+    """Environment for backend subprocesses: every outbound service points at a local stand-in."""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join([str(BACKEND_DIR), str(BENCHMARK_DIR)]),
+        "COSMOS_HOST": "https://localhost:8081",
+        "COSMOS_DATABASE_ID": "benchmark",
+        "COSMOS_CONTAINER_ID": "projects",
+        "COSMOS_CREATE_IF_MISSING": "false",
+        "AOAI_ENDPOINT": fake_url,
+        "AOAI_KEY": "benchmark",
+        "AOAI_DEPLOYMENT": "benchmark",
+        "AZURE_SEARCH_ENDPOINT": fake_url,
+        "AZURE_SEARCH_KEY": "benchmark",
+        "AZURE_SEARCH_INDEX": "projects",
+        "COMMUNICATION_SERVICES_CONNECTION_STRING": "endpoint=https://localhost/;accesskey=YmVuY2htYXJr",
+        "SEARCH_BACKEND": "azure",
+        "EMBEDDING_STORE_PATH": "",
+        "EMBEDDING_CACHE_PATH": "",
+        "EXTRACTION_CACHE_PATH": "",
+        "OUTBOX_POLL_SECONDS": "3600",
+        "FAST_START": "true" if fast_start else "false"
+    })
+    env.update(extra or {})
+    return env
+
+
+def make_workdir() -> str:
+    """app.py mounts dist/assets relative to the working directory."""
+    workdir = tempfile.mkdtemp(prefix="benchmark-")
+    os.makedirs(os.path.join(workdir, "dist", "assets"))
+    return workdir
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def request(port: int, method: str, path: str, body=None, timeout: float = 60):
+    """Issue one request; returns (status, time to first byte in seconds, parsed body)."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    payload = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if payload else {}
+    start = time.perf_counter()
+    connection.request(method, path, body=payload, headers=headers)
+    response = connection.getresponse()
+    ttfb = time.perf_counter() - start
+    data = response.read()
+    connection.close()
+    try:
+        data = json.loads(data)
+    except ValueError:
+        pass
+    return response.status, ttfb, data
+
+
+def rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc); None where unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def wait_until(predicate, timeout: float, interval: float = 0.01) -> bool:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return False
+
+
+def port_open(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def ready(port: int) -> bool:
+    try:
+        return request(port, "GET", "/api/ready", timeout=5)[0] == 200
+    except OSError:
+        return False
+
+
+def start_backend(env: dict, cwd: str, projects: int, port: Optional[int] = None,
+                  cosmos_latency_ms: Optional[Dict[str, float]] = None) -> subprocess.Popen:
+    """Launch the backend child process (this module's __main__); does not wait for it."""
+    command = [sys.executable, str(Path(__file__).resolve()), "--port", str(port or free_port()),
+               "--projects", str(projects), "--cosmos-latency-ms", json.dumps(cosmos_latency_ms or {})]
+    process = subprocess.Popen(command, env=env, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    process.port = int(command[3])
+    return process
+
+
+def wait_for_backend(process: subprocess.Popen, timeout: float) -> None:
+    """Block until the backend accepts connections; raises with its stderr if it exits first."""
+    started = wait_until(lambda: port_open(process.port) or process.poll() is not None, timeout)
+    if not started or process.poll() is not None:
+        raise RuntimeError(f"Backend did not start: {process.stderr.read().decode(errors='replace')[-2000:]}")
+
+
+def stop_backend(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def summarize(values: List[Optional[float]]) -> Optional[Dict[str, float]]:
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    return {"median": round(statistics.median(values), 4), "min": round(min(values), 4),
+            "max": round(max(values), 4)}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def serve(port: int, projects: int, cosmos_latency_ms: Dict[str, float]) -> None:
+    """Child process: import the app, swap Cosmos for the in-memory stand-in and serve."""
+    sys.path.insert(0, str(BACKEND_DIR))
+    import app
+    import uvicorn
+    from fakes import InMemoryCosmosDBManager, sample_projects
+
+    cosmos_db = InMemoryCosmosDBManager(sample_projects(projects), latency_ms=cosmos_latency_ms)
+    app.cosmos_db = cosmos_db
+    app.repository.cosmos_db = cosmos_db
+    uvicorn.run(app.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the backend against in-memory Cosmos DB.")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--cosmos-latency-ms", default="{}", help='JSON, e.g. {"read": 5, "query": 10, "write": 8}')
+    args = parser.parse_args()
+
+    serve(args.port, args.projects, json.loads(args.cosmos_latency_ms))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the search and catalog endpoints.
+
+The backend runs in a subprocess against the local stand-ins in fakes.py: Azure OpenAI
+and AI Search behind a local HTTP server, Cosmos DB in memory. Each stand-in adds the
+configured latency to every call, to model the round trips of the real services. Each
+scenario then drives one endpoint at a fixed concurrency for a fixed duration:
+
+    search           POST /api/search_projects (rotating queries, filters and sorts)
+    list             GET  /api/list_projects
+    filter_options   GET  /api/get_filter_options
+    approve          POST /api/admin/approve_project (Cosmos upsert, facets, embed + index)
+
+For each scenario the report gives p50/p95/p99/max latency, throughput and the error
+count, printed as a table and optionally written as JSON to compare runs.
+
+    python benchmarks/load_test.py --concurrency 16 --duration 20
+    python benchmarks/load_test.py --scenarios search,approve --search-latency-ms 120 --output load.json
+
+Search results and query embeddings are cached by the backend, so repeated queries are
+mostly cache hits, as in production; pass --no-cache to measure the uncached path.
+
+Requirements:
+    httpx
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent))
+
+from fakes import FakeAzureServer, sample_projects, to_search_document
+from harness import benchmark_env, make_workdir, start_backend, wait_for_backend, stop_backend, git_commit
+
+SEARCH_QUERIES = ["azure openai", "rag accelerator", "cosmos db", "multi-agent", "document intelligence",
+                  "chatbot", "semantic kernel", "fastapi", "", "search"]
+SEARCH_FILTERS = [{}, {"programmingLanguages": ["Python"]}, {"azureServices": ["Azure OpenAI"]},
+                  {"codeComplexities": ["Beginner"]}]
+SEARCH_SORTS = ["", "", "name", "recent"]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def build_scenarios(projects: List[Dict[str, Any]]) -> Dict[str, Callable[[random.Random], Dict[str, Any]]]:
+    """Scenario name -> function returning the next request (method, url, json)."""
+    pending = [{**project, "review_status": "pending"} for project in projects]
+
+    def search(rng):
+        return {"method": "POST", "url": "/api/search_projects",
+                "json": {"query": rng.choice(SEARCH_QUERIES), "filters": rng.choice(SEARCH_FILTERS),
+                         "sort": rng.choice(SEARCH_SORTS)}}
+
+    def approve(rng):
+        return {"method": "POST", "url": "/api/admin/approve_project", "json": dict(rng.choice(pending))}
+
+    return {
+        "search": search,
+        "list": lambda rng: {"method": "GET", "url": "/api/list_projects"},
+        "filter_options": lambda rng: {"method": "GET", "url": "/api/get_filter_options"},
+        "approve": approve
+    }
+
+
+def is_error(response: httpx.Response) -> bool:
+    if response.status_code >= 400:
+        return True
+    # search_projects reports failures in the body with HTTP 200
+    return response.headers.get("content-type", "").startswith("application/json") and \
+        isinstance(response.json(), dict) and "error" in response.json()
+
+
+async def run_scenario(base_url: str, make_request, concurrency: int, duration: float,
+                       warmup_requests: int, seed: int = 0) -> Dict[str, Any]:
+    """Drive one scenario with `concurrency` workers for `duration` seconds."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        rng = random.Random(seed)
+        for _ in range(warmup_requests):
+            await client.request(**make_request(rng))
+
+        latencies: List[float] = []
+        errors: Dict[str, int] = {}
+        deadline = time.perf_counter() + duration
+
+        async def worker(worker_id: int):
+            worker_rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(**make_request(worker_rng))
+                    failed = is_error(response)
+                    reason = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    failed, reason = True, type(e).__name__
+                latencies.append(time.perf_counter() - start)
+                if failed:
+                    errors[reason] = errors.get(reason, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_reasons": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0
+        }
+    }
+
+
+def print_report(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'scenario':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'max ms':>10}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        print(f"{name:<16}{result['requests']:>10}{result['errors']:>8}{result['throughput_rps']:>10}"
+              f"{latency['p50']:>10}{latency['p95']:>10}{latency['p99']:>10}{latency['max']:>10}")
+
+
+def run_load_test(args) -> Dict[str, Any]:
+    projects = sample_projects(args.projects)
+    azure_latency = {"embeddings": args.embeddings_latency_ms, "chat": args.chat_latency_ms,
+                     "search": args.search_latency_ms, "index": args.index_latency_ms}
+    cosmos_latency = {"read": args.cosmos_read_latency_ms, "query": args.cosmos_query_latency_ms,
+                      "write": args.cosmos_write_latency_ms}
+    extra_env = {"SEARCH_CACHE_SIZE": "0", "EMBEDDING_CACHE_SIZE": "0"} if args.no_cache else {}
+
+    fake_azure = FakeAzureServer([to_search_document(p) for p in projects], latency_ms=azure_latency).start()
+    process = start_backend(benchmark_env(fake_azure.url, extra=extra_env), make_workdir(), args.projects,
+                            cosmos_latency_ms=cosmos_latency)
+    try:
+        wait_for_backend(process, args.timeout)
+        base_url = f"http://127.0.0.1:{process.port}"
+        scenarios = build_scenarios(projects)
+        results = {}
+        for name in args.scenarios.split(","):
+            print(f"Running {name}: {args.concurrency} concurrent for {args.duration:.0f}s...")
+            results[name] = asyncio.run(run_scenario(base_url, scenarios[name], args.concurrency, args.duration,
+                                                     args.warmup_requests))
+        return {
+            "benchmark": "load_test",
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "config": {"concurrency": args.concurrency, "duration_s": args.duration, "projects": args.projects,
+                       "cache": not args.no_cache, "azure_latency_ms": azure_latency,
+                       "cosmos_latency_ms": cosmos_latency},
+            "scenarios": results
+        }
+    finally:
+        stop_backend(process)
+        fake_azure.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the backend against local Azure stand-ins.")
+    parser.add_argument("--scenarios", default="search,list,filter_options,approve",
+                        help="Comma-separated: search, list, filter_options, approve")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per scenario")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per scenario")
+    parser.add_argument("--warmup-requests", type=int, default=5, help="Untimed requests before each scenario")
+    parser.add_argument("--projects", type=int, default=200, help="Size of the synthetic catalog")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the search result and query embedding caches")
+    parser.add_argument("--embeddings-latency-ms", type=float, default=40)
+    parser.add_argument("--chat-latency-ms", type=float, default=1500)
+    parser.add_argument("--search-latency-ms", type=float, default=60)
+    parser.add_argument("--index-latency-ms", type=float, default=80)
+    parser.add_argument("--cosmos-read-latency-ms", type=float, default=5)
+    parser.add_argument("--cosmos-query-latency-ms", type=float, default=10)
+    parser.add_argument("--cosmos-write-latency-ms", type=float, default=8)
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the backend to start")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    report = run_load_test(args)
+    print_report(report["scenarios"])
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Replay captured search traffic (see backend/query_log.py) against a running backend.
+
+Each logged search is sent to POST /api/search_projects with its original query, filters,
+sort, page size and cursor, at its original offset from the first entry divided by
+--speedup, so bursts and idle periods keep their shape. Use it to load-test with real
+traffic, or to warm the search result and query embedding caches of a new replica.
+
+The report gives p50/p95/p99/max latency, errors, how far the replay fell behind its
+schedule (if it did, the backend or --max-in-flight was the bottleneck), and how many
+replayed searches returned the same result ids as when they were captured.
+
+    python benchmarks/replay_queries.py backend/.cache/search_queries.jsonl --base-url http://localhost:8000
+    python benchmarks/replay_queries.py search_queries.jsonl --speedup 10 --output replay.json
+    python benchmarks/replay_queries.py search_queries.jsonl --speedup 0 --limit 500   # cache warming, no pacing
+
+Requirements:
+    httpx
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "backend"))
+
+from harness import git_commit
+from load_test import percentile, is_error
+from query_log import read_query_log
+
+
+def load_entries(paths: List[str], include_failed: bool, limit: int) -> List[Dict[str, Any]]:
+    entries = [entry for entry in read_query_log(paths) if include_failed or entry.get("status", "ok") == "ok"]
+    entries.sort(key=lambda entry: entry["ts"])
+    return entries[:limit] if limit else entries
+
+
+def schedule(entries: List[Dict[str, Any]], speedup: float) -> List[float]:
+    """Send time of each entry in seconds from the start of the replay (all 0 if speedup is 0)."""
+    if not entries or speedup <= 0:
+        return [0.0] * len(entries)
+    start = datetime.fromisoformat(entries[0]["ts"])
+    return [(datetime.fromisoformat(entry["ts"]) - start).total_seconds() / speedup for entry in entries]
+
+
+def search_body(entry: Dict[str, Any]) -> Dict[str, Any]:
+    body = {"query": entry.get("query", ""), "filters": entry.get("filters") or {}, "sort": entry.get("sort", "")}
+    if entry.get("pageSize"):
+        body["pageSize"] = entry["pageSize"]
+    if entry.get("cursor"):
+        body["cursor"] = entry["cursor"]
+    return body
+
+
+async def replay(base_url: str, entries: List[Dict[str, Any]], speedup: float, max_in_flight: int) -> Dict[str, Any]:
+    offsets = schedule(entries, speedup)
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    latencies: List[float] = []
+    lags: List[float] = []
+    errors: Dict[str, int] = {}
+    matched = 0
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+
+        async def send(entry: Dict[str, Any], offset: float):
+            nonlocal matched
+            delay = started + offset - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with in_flight:
+                lags.append(max(0.0, time.perf_counter() - started - offset))
+                request_start = time.perf_counter()
+                try:
+                    response = await client.post("/api/search_projects", json=search_body(entry))
+                    failed = is_error(response)
+                    reason = f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    response, failed, reason = None, True, type(e).__name__
+                latencies.append(time.perf_counter() - request_start)
+            if failed:
+                errors[reason] = errors.get(reason, 0) + 1
+            elif [result["id"] for result in response.json().get("results", [])] == entry.get("resultIds"):
+                matched += 1
+
+        await asyncio.gather(*(send(entry, offset) for entry, offset in zip(entries, offsets)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    lags.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_reasons": errors,
+        "same_results": matched,
+        "captured_span_s": round(schedule(entries, 1.0)[-1], 3) if entries else 0.0,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0
+        },
+        "schedule_lag_ms": {
+            "p50": round(percentile(lags, 0.50) * 1000, 2),
+            "p99": round(percentile(lags, 0.99) * 1000, 2),
+            "max": round(lags[-1] * 1000, 2) if lags else 0.0
+        }
+    }
+
+
+def print_report(result: Dict[str, Any], paced: bool) -> None:
+    latency, lag = result["latency_ms"], result["schedule_lag_ms"]
+    print(f"requests: {result['requests']}  errors: {result['errors']}  same results: {result['same_results']}")
+    print(f"elapsed: {result['elapsed_s']}s (captured span: {result['captured_span_s']}s)  "
+          f"throughput: {result['throughput_rps']} rps")
+    print(f"latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    # Unpaced replays (--speedup 0) have no schedule to fall behind
+    if paced:
+        print(f"behind schedule ms: p50 {lag['p50']}  p99 {lag['p99']}  max {lag['max']}")
+    if result["error_reasons"]:
+        print(f"error reasons: {result['error_reasons']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a captured search query log against a backend.")
+    parser.add_argument("logs", nargs="+", help="Query log files (rotated .1, .2, ... files are included)")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Backend to replay against")
+    parser.add_argument("--speedup", type=float, default=1.0,
+                        help="Replay this many times faster than captured; 0 sends as fast as --max-in-flight allows")
+    parser.add_argument("--max-in-flight", type=int, default=32, help="Cap on concurrent requests")
+    parser.add_argument("--limit", type=int, default=0, help="Replay only the first N entries")
+    parser.add_argument("--include-failed", action="store_true", help="Also replay searches that failed when captured")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    entries = load_entries(args.logs, args.include_failed, args.limit)
+    if not entries:
+        sys.exit("No query log entries to replay")
+    print(f"Replaying {len(entries)} searches against {args.base_url} at {args.speedup}x...")
+    result = asyncio.run(replay(args.base_url, entries, args.speedup, args.max_in_flight))
+    print_report(result, args.speedup > 0)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "benchmark": "replay_queries",
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "git_commit": git_commit(),
+                "config": {"logs": args.logs, "base_url": args.base_url, "speedup": args.speedup,
+                           "max_in_flight": args.max_in_flight, "limit": args.limit},
+                "result": result
+            }, f, indent=2)
+        print(f"Results written to {args.output}")
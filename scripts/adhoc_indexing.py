@@ -11,6 +11,8 @@ from pathlib import Path
 # Add the parent directory to sys.path to import backend modules
 parent_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(parent_dir))
+# backend modules import each other as top-level modules (e.g. `from cache import ...`)
+sys.path.append(str(parent_dir / "backend"))
 
 # Change to the project root directory where .env file is located
 os.chdir(parent_dir)
@@ -18,11 +20,19 @@ os.chdir(parent_dir)
 # Now import after adding parent_dir to sys.path and changing directory
 from dotenv import load_dotenv
 from backend.cosmosdb import CosmosDBManager
-from backend.projects import add_project, generate_embeddings, generate_document_id
+from backend.repository import CosmosRepository
+from backend.projects import add_project, generate_embeddings_batch, generate_document_id
 
 # Load environment variables
 load_dotenv()
 
+# Cosmos vector field -> Cosmos text field it embeds
+PROJECT_EMBEDDING_FIELDS = {
+    'description_vector': 'projectDescription',
+    'business_value_vector': 'businessValue',
+    'target_audience_vector': 'targetAudience'
+}
+
 def index_project(project_id, force_reindex=False, debug=False):
     """
     Get a project from Cosmos DB and index it in Azure AI Search.
@@ -35,17 +45,15 @@ def index_project(project_id, force_reindex=False, debug=False):
     print(f"Fetching project with ID: {project_id}")
     
     # Initialize CosmosDB connection
-    cosmos_db = CosmosDBManager()
+    repository = CosmosRepository(CosmosDBManager())
     
-    # Fetch the project
-    query = f"SELECT * FROM c WHERE c.id = '{project_id}' AND c.partitionKey = 'project'"
-    projects = list(cosmos_db.query_items(query))
+    # Fetch the project with a point read
+    project = repository.get_project(project_id)
     
-    if not projects:
+    if not project:
         print(f"No project found with ID: {project_id}")
         return
     
-    project = projects[0]
     print(f"Found project: {project.get('projectName', 'Unknown')}")
     
     # Verify the document ID is consistent
@@ -78,23 +86,19 @@ def index_project(project_id, force_reindex=False, debug=False):
                 print(f"{key}: {value}")
         print("======================\n")
     
-    # Generate embeddings if needed
-    if 'description_vector' not in project and 'projectDescription' in project:
-        print("Generating description embeddings...")
-        project['description_vector'] = generate_embeddings(project['projectDescription'])
-    
-    if 'business_value_vector' not in project and 'businessValue' in project:
-        print("Generating business value embeddings...")
-        project['business_value_vector'] = generate_embeddings(project['businessValue'])
-    
-    if 'target_audience_vector' not in project and 'targetAudience' in project:
-        print("Generating target audience embeddings...")
-        project['target_audience_vector'] = generate_embeddings(project['targetAudience'])
+    # Generate missing embeddings with a single batched request
+    missing = [(vector_field, text_field) for vector_field, text_field in PROJECT_EMBEDDING_FIELDS.items()
+               if vector_field not in project and text_field in project]
+    if missing:
+        print(f"Generating embeddings for: {', '.join(text_field for _, text_field in missing)}...")
+        vectors = generate_embeddings_batch([project[text_field] for _, text_field in missing])
+        for (vector_field, _), vector in zip(missing, vectors):
+            project[vector_field] = vector
     
     # If we're forcing a reindex, update the project in Cosmos DB
     if force_reindex:
         print("Updating project in Cosmos DB...")
-        cosmos_db.upsert_item(project)
+        repository.upsert_project(project)
     
     # List required fields for search indexing
     required_fields = [
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Rebuild the Azure AI Search index from every approved project in Cosmos DB.
+
+Unlike adhoc_indexing.py, which indexes one project at a time, this pages through the
+catalog, embeds the text fields of a whole page with batched embedding requests, and
+uploads the documents in batches of up to 1000 with bounded concurrency.
+
+Progress is checkpointed after each Cosmos page (the continuation token of the next page
+plus counters), so an interrupted run resumes where it stopped:
+
+    python scripts/bulk_reindex.py
+    python scripts/bulk_reindex.py --restart          # ignore an existing checkpoint
+    python scripts/bulk_reindex.py --concurrency 8 --page-size 500
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to sys.path to import backend modules
+parent_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(parent_dir))
+# backend modules import each other as top-level modules (e.g. `from cache import ...`)
+sys.path.append(str(parent_dir / "backend"))
+
+# Change to the project root directory where .env file is located
+os.chdir(parent_dir)
+
+from dotenv import load_dotenv
+from backend.cosmosdb import CosmosDBManager
+from backend.repository import CosmosRepository
+from backend.projects import (get_search_client, build_search_document, embed_search_documents,
+                              get_embedding_store, EMBEDDING_BATCH_SIZE)
+from cache import resolve_cache_path
+
+# Load environment variables
+load_dotenv()
+
+# Azure AI Search accepts at most 1000 documents per indexing request
+MAX_UPLOAD_BATCH_SIZE = 1000
+DEFAULT_CHECKPOINT_PATH = resolve_cache_path("bulk_reindex_checkpoint.json")
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    return None if checkpoint.get("completed") else checkpoint
+
+
+def save_checkpoint(path, checkpoint):
+    """Write the checkpoint atomically so a crash mid-write cannot corrupt it."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def upload_batch(documents):
+    """Upload one batch; returns the ids of documents the service rejected."""
+    results = get_search_client().upload_documents(documents=documents)
+    return [result.key for result in results if not result.succeeded]
+
+
+def index_page(projects, executor, upload_batch_size, embedding_batch_size):
+    """Embed and upload one page of projects. Returns (indexed count, failed ids)."""
+    documents = [build_search_document(project) for project in projects]
+
+    # Embedding requests for the page run concurrently, embedding_batch_size projects each
+    embedded = executor.map(embed_search_documents, list(chunks(documents, embedding_batch_size)))
+    documents = [document for batch in embedded for document in batch]
+
+    failed = []
+    for rejected in executor.map(upload_batch, list(chunks(documents, upload_batch_size))):
+        failed.extend(rejected)
+    return len(documents) - len(failed), failed
+
+
+def bulk_reindex(page_size=500, upload_batch_size=MAX_UPLOAD_BATCH_SIZE, concurrency=4,
+                 checkpoint_path=DEFAULT_CHECKPOINT_PATH, restart=False):
+    repository = CosmosRepository(CosmosDBManager())
+
+    checkpoint = None if restart else load_checkpoint(checkpoint_path)
+    if checkpoint:
+        print(f"Resuming from checkpoint: {checkpoint['indexed']} documents indexed, "
+              f"{checkpoint['pages']} pages done")
+    else:
+        checkpoint = {"continuation_token": None, "pages": 0, "indexed": 0, "failed_ids": [],
+                      "elapsed_seconds": 0.0, "completed": False}
+
+    upload_batch_size = max(1, min(upload_batch_size, MAX_UPLOAD_BATCH_SIZE))
+    # Each embedding request covers three texts per project
+    embedding_batch_size = max(1, EMBEDDING_BATCH_SIZE // 3)
+    run_start = time.perf_counter()
+    run_indexed = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while True:
+            page_start = time.perf_counter()
+            projects, next_token = repository.query_page(
+                'approved_projects',
+                max_item_count=page_size,
+                continuation_token=checkpoint["continuation_token"],
+                review_status='approved'
+            )
+            if projects:
+                indexed, failed = index_page(projects, executor, upload_batch_size, embedding_batch_size)
+                run_indexed += indexed
+                checkpoint["indexed"] += indexed
+                checkpoint["failed_ids"].extend(failed)
+                page_seconds = time.perf_counter() - page_start
+                print(f"Page {checkpoint['pages'] + 1}: indexed {indexed}/{len(projects)} documents "
+                      f"in {page_seconds:.1f}s ({indexed / page_seconds:.1f} docs/sec)")
+
+            checkpoint["pages"] += 1
+            checkpoint["continuation_token"] = next_token
+            checkpoint["completed"] = next_token is None
+            checkpoint["elapsed_seconds"] += time.perf_counter() - page_start
+            save_checkpoint(checkpoint_path, checkpoint)
+            if next_token is None:
+                break
+
+    run_seconds = time.perf_counter() - run_start
+    print(f"Indexed {run_indexed} documents this run in {run_seconds:.1f}s "
+          f"({run_indexed / run_seconds if run_seconds else 0:.1f} docs/sec)")
+    print(f"Total indexed: {checkpoint['indexed']} documents in {checkpoint['elapsed_seconds']:.1f}s "
+          f"({checkpoint['indexed'] / checkpoint['elapsed_seconds'] if checkpoint['elapsed_seconds'] else 0:.1f} docs/sec)")
+    embedding_store = get_embedding_store()
+    if embedding_store is not None:
+        print(f"Embedding store: {embedding_store.hits} texts reused, {embedding_store.misses} embedded")
+    if checkpoint["failed_ids"]:
+        print(f"{len(checkpoint['failed_ids'])} documents failed to index: {', '.join(checkpoint['failed_ids'])}")
+    return checkpoint
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reindex every approved project into Azure AI Search.")
+    parser.add_argument("--page-size", type=int, default=500, help="Projects read from Cosmos DB per page")
+    parser.add_argument("--upload-batch-size", type=int, default=MAX_UPLOAD_BATCH_SIZE,
+                        help="Documents per upload request (max 1000)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Embedding and upload requests in flight at once")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file path")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start over")
+    args = parser.parse_args()
+
+    bulk_reindex(page_size=args.page_size, upload_batch_size=args.upload_batch_size,
+                 concurrency=args.concurrency, checkpoint_path=args.checkpoint, restart=args.restart)
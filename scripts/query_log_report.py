@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Summarize a captured search query log (see backend/query_log.py).
+
+Reports the most frequent queries and the most frequent filter + sort combinations, how
+many distinct ones there are and what share of the traffic the top N cover. These are
+the numbers for sizing SEARCH_CACHE_SIZE and EMBEDDING_CACHE_SIZE: if the top 500
+queries cover 90% of searches, a cache of ~500 entries answers ~90% of them once warm.
+Also reports the observed cache hit rate and per-stage latency percentiles.
+
+    python scripts/query_log_report.py backend/.cache/search_queries.jsonl
+    python scripts/query_log_report.py backend/.cache/search_queries.jsonl --top 50 --json
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add the backend directory to sys.path to import backend modules
+parent_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(parent_dir / "backend"))
+
+from query_log import read_query_log
+
+
+def normalize_query(query: str) -> str:
+    """Queries that differ only in case or spacing hit the same results."""
+    return " ".join((query or "").lower().split())
+
+
+def filter_key(filters: Dict[str, Any], sort: str) -> str:
+    """Canonical, order-independent form of a filter + sort combination."""
+    canonical = {field: sorted(value) if isinstance(value, list) else value
+                 for field, value in sorted((filters or {}).items()) if value not in (None, "", [])}
+    return json.dumps({"filters": canonical, "sort": sort or ""}, sort_keys=True)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def ranking(counter: Counter, total: int, top: int) -> Dict[str, Any]:
+    most_common = counter.most_common(top)
+    return {
+        "distinct": len(counter),
+        "top_coverage": round(sum(count for _, count in most_common) / total, 4) if total else 0.0,
+        "top": [{"value": value, "count": count, "share": round(count / total, 4)} for value, count in most_common]
+    }
+
+
+def build_report(entries: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    queries = Counter(normalize_query(entry.get("query", "")) for entry in entries)
+    combinations = Counter(filter_key(entry.get("filters"), entry.get("sort", "")) for entry in entries)
+    searches = Counter((normalize_query(entry.get("query", "")), filter_key(entry.get("filters"), entry.get("sort", "")))
+                       for entry in entries)
+    cache = Counter(entry.get("cache") or "none" for entry in entries)
+    statuses = Counter(entry.get("status", "ok") for entry in entries)
+
+    stages: Dict[str, List[float]] = {}
+    for entry in entries:
+        for stage, ms in (entry.get("timingsMs") or {}).items():
+            stages.setdefault(stage, []).append(ms)
+    latency = {}
+    for stage, values in sorted(stages.items()):
+        values.sort()
+        latency[stage] = {"count": len(values), "p50": percentile(values, 0.50), "p95": percentile(values, 0.95),
+                          "p99": percentile(values, 0.99), "max": values[-1]}
+
+    total = len(entries)
+    lookups = cache["hit"] + cache["miss"]
+    return {
+        "entries": total,
+        "first": entries[0]["ts"] if entries else None,
+        "last": entries[-1]["ts"] if entries else None,
+        "status": dict(statuses),
+        "cache_hit_rate": round(cache["hit"] / lookups, 4) if lookups else None,
+        "queries": ranking(queries, total, top),
+        "filter_combinations": ranking(combinations, total, top),
+        # Distinct (query, filters, sort) triples: the first-page search result cache key space
+        "distinct_searches": len(searches),
+        "latency_ms": latency
+    }
+
+
+def print_report(report: Dict[str, Any], top: int) -> None:
+    print(f"{report['entries']} searches from {report['first']} to {report['last']}")
+    print(f"status: {report['status']}  cache hit rate: {report['cache_hit_rate']}  "
+          f"distinct searches: {report['distinct_searches']}")
+    for title, key in [("queries", "queries"), ("filter + sort combinations", "filter_combinations")]:
+        section = report[key]
+        print(f"\nTop {top} {title} ({section['distinct']} distinct, top {top} cover "
+              f"{section['top_coverage'] * 100:.1f}%):")
+        for row in section["top"]:
+            print(f"{row['count']:>8}  {row['share'] * 100:5.1f}%  {row['value'] or '(empty)'}")
+    print("\nLatency (ms):")
+    print(f"{'stage':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, stats in report["latency_ms"].items():
+        print(f"{stage:<16}{stats['count']:>8}{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}{stats['max']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Top queries and filter combinations from a search query log.")
+    parser.add_argument("logs", nargs="+", help="Query log files (rotated .1, .2, ... files are included)")
+    parser.add_argument("--top", type=int, default=20, help="How many queries and combinations to list")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    entries = sorted(read_query_log(args.logs), key=lambda entry: entry.get("ts", ""))
+    report = build_report(entries, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
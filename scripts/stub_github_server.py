@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Stub of raw.githubusercontent.com for exercising the README fetcher locally.
+
+Serves files from a directory laid out as <root>/<owner>/<repo>/<branch>/<filename>,
+with ETag and Last-Modified validators (answering 304 to conditional requests) and an
+optional artificial latency. With no --root, a single sample repo is served:
+demo/sample-repo on the master branch.
+
+    python scripts/stub_github_server.py --port 8001 --latency-ms 50
+    # then run the backend with GITHUB_RAW_BASE_URL=http://localhost:8001
+"""
+import argparse
+import hashlib
+import os
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_FILES = {
+    "/demo/sample-repo/master/README.md": (
+        "# Sample Repo\n\nA demo accelerator that uses Azure OpenAI and Azure AI Search "
+        "to answer questions over documents (RAG). Built with Python and FastAPI.\n"
+    )
+}
+
+
+class StubGitHubHandler(BaseHTTPRequestHandler):
+    root = None
+    latency_seconds = 0.0
+    started_at = formatdate(time.time(), usegmt=True)
+
+    def _load(self, path):
+        if self.root is None:
+            content = SAMPLE_FILES.get(path)
+            return content.encode("utf-8") if content is not None else None
+        file_path = os.path.normpath(os.path.join(self.root, path.lstrip("/")))
+        if not file_path.startswith(os.path.abspath(self.root)) or not os.path.isfile(file_path):
+            return None
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def do_GET(self):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        body = self._load(self.path)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "14")
+            self.end_headers()
+            self.wfile.write(b"404: Not Found")
+            return
+
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.started_at)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve README files the way raw.githubusercontent.com does.")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--root", help="Directory laid out as <owner>/<repo>/<branch>/<filename>")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    StubGitHubHandler.root = os.path.abspath(args.root) if args.root else None
+    StubGitHubHandler.latency_seconds = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubGitHubHandler)
+    print(f"Stub GitHub raw server listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Bring the Azure AI Search index in line with the approved projects in Cosmos DB,
+touching only what changed.
+
+Both sides are mapped to search documents and fingerprinted (see
+projects.document_fingerprints): a content fingerprint over the embedded text fields and
+a metadata fingerprint over everything else. Then:
+
+    - projects missing from the index, or whose text changed, are uploaded (embeddings
+      come from the embedding store, so only changed text is re-embedded)
+    - projects where only metadata (tags, name, owner, ...) changed are sent as merge
+      actions carrying just those fields, without re-embedding
+    - index documents with no approved project behind them are deleted
+
+    python scripts/sync_index.py --dry-run     # print the diff only
+    python scripts/sync_index.py
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the parent directory to sys.path to import backend modules
+parent_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(parent_dir))
+# backend modules import each other as top-level modules (e.g. `from cache import ...`)
+sys.path.append(str(parent_dir / "backend"))
+
+# Change to the project root directory where .env file is located
+os.chdir(parent_dir)
+
+from dotenv import load_dotenv
+from backend.cosmosdb import CosmosDBManager
+from backend.repository import CosmosRepository
+from backend.projects import (get_search_client, build_search_document, embed_search_documents,
+                              document_fingerprints, EMBEDDING_SOURCE_FIELDS, SEARCH_METADATA_FIELDS)
+
+# Load environment variables
+load_dotenv()
+
+# Azure AI Search accepts at most 1000 documents per indexing request
+BATCH_SIZE = 1000
+
+
+def load_catalog_documents(repository):
+    """Search documents for every approved project in Cosmos DB, keyed by id."""
+    documents = {}
+    for page in repository.iter_pages('approved_projects', max_item_count=500, review_status='approved'):
+        for project in page:
+            document = build_search_document(project)
+            documents[document["id"]] = document
+    return documents
+
+
+def load_index_documents():
+    """Every document in the search index (without vectors), keyed by id."""
+    select = ["id", *EMBEDDING_SOURCE_FIELDS.values(), *SEARCH_METADATA_FIELDS]
+    results = get_search_client().search(search_text="*", select=select)
+    return {result["id"]: {field: result.get(field) for field in select} for result in results}
+
+
+def diff_documents(catalog, index):
+    """
+    Compare catalog and index documents.
+
+    Returns:
+        dict: Lists of ids under 'added', 'content_changed', 'metadata_changed',
+        'unchanged' and 'orphaned'.
+    """
+    diff = {"added": [], "content_changed": [], "metadata_changed": [], "unchanged": [],
+            "orphaned": sorted(set(index) - set(catalog))}
+    for document_id, document in catalog.items():
+        if document_id not in index:
+            diff["added"].append(document_id)
+            continue
+        content, metadata = document_fingerprints(document)
+        indexed_content, indexed_metadata = document_fingerprints(index[document_id])
+        if content != indexed_content:
+            diff["content_changed"].append(document_id)
+        elif metadata != indexed_metadata:
+            diff["metadata_changed"].append(document_id)
+        else:
+            diff["unchanged"].append(document_id)
+    return diff
+
+
+def run_in_batches(action, documents):
+    """Send documents to an indexing action in batches; returns the ids that failed."""
+    failed = []
+    for start in range(0, len(documents), BATCH_SIZE):
+        results = action(documents=documents[start:start + BATCH_SIZE])
+        failed.extend(result.key for result in results if not result.succeeded)
+    return failed
+
+
+def print_summary(diff):
+    print("=== Index sync diff ===")
+    for key, label in [("added", "New"), ("content_changed", "Text changed (re-upload)"),
+                       ("metadata_changed", "Metadata only (merge)"), ("orphaned", "Orphaned (delete)"),
+                       ("unchanged", "Unchanged")]:
+        print(f"{label}: {len(diff[key])}")
+        if key != "unchanged":
+            for document_id in diff[key]:
+                print(f"  - {document_id}")
+    print("=======================")
+
+
+def sync_index(dry_run=False):
+    start = time.perf_counter()
+    repository = CosmosRepository(CosmosDBManager())
+    catalog = load_catalog_documents(repository)
+    index = load_index_documents()
+    diff = diff_documents(catalog, index)
+    print_summary(diff)
+    if dry_run:
+        return diff
+
+    failed = []
+    uploads = [catalog[document_id] for document_id in diff["added"] + diff["content_changed"]]
+    if uploads:
+        print(f"Uploading {len(uploads)} documents...")
+        failed += run_in_batches(get_search_client().upload_documents, embed_search_documents(uploads))
+
+    merges = [{"id": document_id, **{field: catalog[document_id][field] for field in SEARCH_METADATA_FIELDS}}
+              for document_id in diff["metadata_changed"]]
+    if merges:
+        print(f"Merging metadata for {len(merges)} documents...")
+        failed += run_in_batches(get_search_client().merge_documents, merges)
+
+    deletes = [{"id": document_id} for document_id in diff["orphaned"]]
+    if deletes:
+        print(f"Deleting {len(deletes)} orphaned documents...")
+        failed += run_in_batches(get_search_client().delete_documents, deletes)
+
+    print(f"Sync finished in {time.perf_counter() - start:.1f}s: "
+          f"{len(uploads)} uploaded, {len(merges)} merged, {len(deletes)} deleted, {len(failed)} failed")
+    if failed:
+        print(f"Failed documents: {', '.join(failed)}")
+    return diff
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync the search index with approved projects in Cosmos DB.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the diff without changing the index")
+    args = parser.parse_args()
+
+    sync_index(dry_run=args.dry_run)